@@ -11,7 +11,9 @@
     .endPos    : 문자 단위 종료 인덱스 (inclusive)
 
 출력 포맷 (JSONL, 한 줄에 문장 하나):
-  {"text": "홍길동이 서울에 산다.", "entities": [[0, 3, "PER"], [5, 7, "LOC"]]}
+  {"id": "온라인/블로그/파일.json#3", "text": "홍길동이 서울에 산다.", "entities": [[0, 3, "PER"], [5, 7, "LOC"]]}
+
+  - id      : 문장 id = 입력 디렉토리 기준 상대 경로 + "#" + 파일 내 문장 번호 (0-based)
 
   - entities: [start, end, tag]
     - start : startPos (inclusive, 0-based)
@@ -19,51 +21,55 @@
     - tag   : TAG_MAP에 따라 변환된 태그 문자열 (None이면 해당 개체 제외)
   - entities가 비어있는 문장은 출력하지 않음
 
-태그 매핑 (TAG_MAP):
+태그 매핑 (TAG_MAP, tag_maps/094.json):
   O-PS → PER    O-LC → LOC    O-OG → ORG    O-DT → DAT
-  A-AD → ADD    A-PO → ADD    A-TE → PHN    A-TI → TIM    A-DA → DAT
+  A-AD → ADD    A-PO → ADD    A-TI → TIM    A-DA → DAT
   O-QT → QT
-  A-TM → URL (URL계열) / LOC (순수 지역명) / 제거 (garbage)
+  A-TE → PHN / ORG / LOC / 제거 (_ate_to_tag)
+  A-TM → URL (URL계열) / LOC (순수 지역명) / 제거 (garbage) (_atm_to_tag)
   E-*/O-AF/O-CV/O-AM/O-PT/O-TR/O-EV/A-ET/A-PR/A-TR/A-UN → 제거
 
 사용법:
   python3 convert_to_ner.py [--input INPUT_DIR] [--output OUTPUT_FILE]
 
+  # 재분류 모드: 원본 JSON을 다시 읽지 않고, 현재 _atm_to_tag/_ate_to_tag 규칙을
+  # _atm.jsonl/_ate.jsonl 로그에 재적용해 출력 JSONL 과 로그를 한 번의 스트리밍으로 패치
+  python3 convert_to_ner.py --reclassify [--output OUTPUT_FILE]
+
+  # 압축 부가 로그: 로그 행은 문장 id·오프셋 참조만, 표층형 건수 표와 태그별 예시 표본 별도 저장
+  python3 convert_to_ner.py --compact-logs [--examples 20]
+
+  # 규칙 반복 모드: 수집방법/출처 폴더별 층화 표본 N개 파일만 변환하고,
+  # 현재 출력 JSONL 의 같은 문장 id 들과 태그별 건수·변경 스팬 비교 (결과는 samples/094_sample.jsonl)
+  python3 convert_to_ner.py --sample 300 [--seed 42]
+
 기본값:
   --input  : 094.관광_특화_말뭉치_데이터/.../Training/02.라벨링데이터
   --output : data_prepare/094_ner_dataset.jsonl
 """
 
-import json
+import csv
+import random
 import re
-import argparse
+import heapq
+import itertools
+from collections import Counter, defaultdict
 from pathlib import Path
 
+from converter import Converter
+from fast_json import decode_094, dumps_line, loads
+from fs_walk import DEFAULT_PREFETCH_MB, DEFAULT_WORKERS, Prefetcher, walk_files
+from jsonl_writer import JsonlWriter
+from label_vocab import load_tag_map
+from ner_utils import normalize_text, remap_spans
+
 
 DEFAULT_INPUT = Path(__file__).parent / (
     "094.관광_특화_말뭉치_데이터/3.개방데이터/1.데이터/Training/02.라벨링데이터"
 )
 DEFAULT_OUTPUT = Path(__file__).parent / "converted" / "094_ner_dataset.jsonl"
-
-# None: 해당 태그 제거, 값 있음: 해당 태그로 변환, 키 없음: 원본 유지
-TAG_MAP: dict[str, str | None] = {
-    "O-PS": "PER",
-    "O-LC": "LOC",
-    "O-OG": "ORG",
-    "O-DT": "DAT",
-    "O-QT": "QT",
-    "A-AD": "ADD",
-    "A-PO": "ADD",
-    # A-TE는 _ate_to_tag() 함수로 처리 (전화번호↔기관명 분리)
-    # A-TM은 _atm_to_tag() 함수로 처리
-    "A-TI": "TIM",
-    "A-DA": "DAT",
-    # 제거
-    "E-P":  None, "E-NA": None, "E-N":  None, "E-QT": None,
-    "O-AF": None, "O-CV": None, "O-AM": None,
-    "O-PT": None, "O-TR": None, "O-EV": None,
-    "A-ET": None, "A-PR": None, "A-TR": None, "A-UN": None,
-}
+# --sample 결과. converted/ 밖에 두어 prepare_hf_dataset 등이 본 출력과 함께 읽지 않게 함
+SAMPLE_OUTPUT = Path(__file__).parent / "samples" / "094_sample.jsonl"
 
 def _ate_to_tag(text: str) -> str | None:
     """A-TE 텍스트 분류:
@@ -106,19 +112,62 @@ def _atm_to_tag(text: str) -> str | None:
     return None
 
 
-def convert_file(json_path: Path) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+# tag_maps/094.json 을 컴파일한 원본 태그 → 레이블 id 테이블 (A-TE/A-TM은 위 분류 함수 사용)
+RULES = {"atm": _atm_to_tag, "ate": _ate_to_tag}
+TAG_MAP = load_tag_map("094", rules=RULES)
+VOCAB = TAG_MAP.vocab
+
+
+def sentence_id(doc_id: str, index: int) -> str:
+    """문장 id: 입력 디렉토리 기준 상대 경로 + "#" + 파일 내 문장 번호."""
+    return f"{doc_id}#{index}"
+
+
+def _sentence_sort_key(sid: str) -> tuple:
+    """convert_directory 처리 순서(sorted rglob = 경로 구성요소 순)와 같은 정렬 키."""
+    doc_id, _, index = sid.rpartition("#")
+    return tuple(doc_id.split("/")), int(index)
+
+
+def _normalize_sentence(text: str, entities: list, entries: list[dict],
+                        form: str | None, collapse_space: bool) -> tuple[str, list]:
+    """문장 텍스트를 정규화하고 엔티티·로그 항목 오프셋을 같은 맵으로 옮김."""
+    new_text, offset_map = normalize_text(text, form, collapse_space)
+    if offset_map is None:
+        return text, entities
+    for entry in entries:
+        start, end = offset_map[entry["start"]], offset_map[entry["end"]]
+        entry.update(text=new_text, entity=new_text[start:end], start=start, end=end)
+    return new_text, remap_spans(entities, offset_map)
+
+
+def convert_file(json_path: Path, doc_id: str | None = None, normalize: str | None = None,
+                 collapse_space: bool = False, raw: list | None = None, content: bytes | None = None
+                 ) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
     """JSON 라벨링 파일 하나를 NER 포맷 레코드 리스트로 변환.
 
+    Parameters
+    ----------
+    doc_id         : 문장 id 앞부분 (기본: 파일명). convert_directory 는 상대 경로를 넘김
+    normalize      : "NFC" / "NFKC" 면 문장 텍스트를 정규화하고 오프셋을 옮김 (ner_utils.normalize_text)
+    collapse_space : 연속 공백을 하나로 줄이고 앞뒤 공백 제거
+    raw            : 주면 매핑 전 스팬이 있는 문장마다 (원문, [[start, end, raw_tag], ...], id) 추가
+    content        : 미리 읽어 둔 파일 바이트 (fs_walk.Prefetcher). None 이면 json_path 를 직접 읽음
+
     Returns
     -------
     (records, dropped, atm_log, ate_log)
-        records : 변환된 레코드 리스트
+        records : 변환된 레코드 리스트 {"id", "text", "entities"}
+                  (entities 라벨은 VOCAB id, 저장 시 VOCAB.decode)
         dropped : 제거된 엔티티 리스트 (E-* 태그 제외)
-        atm_log : A-TM 변환 결과 로그 {"text", "entity", "mapped_tag", "start", "end"}
-        ate_log : A-TE 변환 결과 로그 {"text", "entity", "mapped_tag", "start", "end"}
+        atm_log : A-TM 변환 결과 로그 {"id", "text", "entity", "mapped_tag", "start", "end"}
+        ate_log : A-TE 변환 결과 로그 {"id", "text", "entity", "mapped_tag", "start", "end"}
     """
-    with open(json_path, encoding="utf-8") as f:
-        data = json.load(f)
+    doc_id = doc_id or json_path.name
+    if content is None:
+        with open(json_path, "rb") as f:
+            content = f.read()
+    data = decode_094(content)
 
     records = []
     dropped = []
@@ -126,9 +175,12 @@ def convert_file(json_path: Path) -> tuple[list[dict], list[dict], list[dict], l
     ate_log = []
     sentences = data.get("docu_info", {}).get("sentences") or []
 
-    for sent in sentences:
+    for sent_index, sent in enumerate(sentences):
         text = sent.get("sentence", "")
+        sid = sentence_id(doc_id, sent_index)
         entities = []
+        raw_spans = []
+        log_marks = (len(dropped), len(atm_log), len(ate_log))
 
         for ann in sent.get("annotations") or []:
             start = ann.get("startPos")
@@ -162,23 +214,19 @@ def convert_file(json_path: Path) -> tuple[list[dict], list[dict], list[dict], l
                 continue
 
             raw_tag = f"{tagclass}-{tagcode}"
-            if raw_tag == "A-TM":
-                tag = _atm_to_tag(extracted)
-                atm_log.append({"text": text, "entity": extracted, "mapped_tag": tag, "start": start, "end": end})
-            elif raw_tag == "A-TE":
-                tag = _ate_to_tag(extracted)
-                ate_log.append({"text": text, "entity": extracted, "mapped_tag": tag, "start": start, "end": end})
-            elif tagclass == "E":
-                tag = None  # E-* 전체 제거
-            else:
-                tag = TAG_MAP.get(raw_tag, None)  # 미등록 태그는 제거
-
-            if tag is None:
-                # 의도적 제거 태그는 기록하지 않음
-                if tagclass != "E" and raw_tag not in {
-                    "O-AF", "O-CV", "O-AM", "O-PT", "O-TR", "O-EV",
-                }:
+            raw_spans.append([start, end, raw_tag])
+            tag_id = TAG_MAP.lookup(raw_tag, extracted)
+            if raw_tag in ("A-TM", "A-TE"):
+                log = atm_log if raw_tag == "A-TM" else ate_log
+                tag = None if tag_id is None else VOCAB.labels[tag_id]
+                log.append({"id": sid, "text": text, "entity": extracted, "mapped_tag": tag,
+                            "start": start, "end": end})
+
+            if tag_id is None:
+                # 의도적 제거 태그(E-*, O-AF 등)는 기록하지 않음
+                if not TAG_MAP.is_unlogged(raw_tag):
                     dropped.append({
+                        "id": sid,
                         "text": text,
                         "entity": extracted,
                         "raw_tag": raw_tag,
@@ -187,72 +235,449 @@ def convert_file(json_path: Path) -> tuple[list[dict], list[dict], list[dict], l
                     })
                 continue
 
-            entities.append([start, end, tag])
+            entities.append([start, end, tag_id])
+
+        if raw is not None and raw_spans:
+            raw.append((text, raw_spans, sid))
+        if normalize or collapse_space:
+            entries = [entry for log, mark in zip((dropped, atm_log, ate_log), log_marks) for entry in log[mark:]]
+            text, entities = _normalize_sentence(text, entities, entries, normalize, collapse_space)
 
         if entities:
-            records.append({"text": text, "entities": entities})
+            records.append({"id": sid, "text": text, "entities": entities})
 
     return records, dropped, atm_log, ate_log
 
 
-def convert_directory(input_dir: Path, output_file: Path) -> None:
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    dropped_file = output_file.with_name(output_file.stem + "_dropped.jsonl")
-    atm_file     = output_file.with_name(output_file.stem + "_atm.jsonl")
-    ate_file     = output_file.with_name(output_file.stem + "_ate.jsonl")
-
-    total_files = total_records = total_dropped = skipped = 0
-
-    with open(output_file, "w", encoding="utf-8") as out, \
-         open(dropped_file, "w", encoding="utf-8") as drop_out, \
-         open(atm_file,     "w", encoding="utf-8") as atm_out, \
-         open(ate_file,     "w", encoding="utf-8") as ate_out:
-        for json_path in sorted(input_dir.rglob("*.json")):
-            try:
-                records, dropped, atm_log, ate_log = convert_file(json_path)
-            except Exception as e:
-                print(f"  [오류] {json_path.name}: {e}")
-                skipped += 1
-                continue
+# ── 압축 부가 로그 (--compact-logs) ──────────────────────────────────────────
+
+# 압축 모드에서 함께 쓰는 파일 (출력 파일 stem 뒤에 붙음)
+_COMPACT_SUFFIXES = ("_sentences.jsonl", "_surface_counts.tsv", "_examples.jsonl")
+
+
+def _compact_entry(entry: dict) -> dict:
+    """로그 항목에서 문장 text 를 뺀 참조 행 (id + 오프셋으로 _sentences/출력 JSONL 의 문장을 가리킴)."""
+    return {k: v for k, v in entry.items() if k != "text"}
+
+
+def _summarize_file(records: list[dict], dropped: list[dict], atm_log: list[dict], ate_log: list[dict],
+                    summary: "SideLogSummary") -> list[dict]:
+    """파일 하나의 로그 항목을 집계하고, 출력 JSONL 에 없는 로그 문장의 _sentences 행을 반환."""
+    in_output = {record["id"] for record in records}
+    texts: dict[str, str] = {}
+    for raw_tag, log in (("A-TM", atm_log), ("A-TE", ate_log), (None, dropped)):
+        for entry in log:
+            if raw_tag is None and entry["raw_tag"] in _RULE_TAGS:
+                continue   # A-TM/A-TE 제거 항목은 위 변환 로그로 이미 집계
+            summary.add(entry, entry["text"], raw_tag or entry["raw_tag"],
+                        entry["mapped_tag"] if raw_tag else None)
+            if entry["id"] not in in_output:
+                texts.setdefault(entry["id"], entry["text"])
+    return [{"id": sid, "text": texts[sid]} for sid in sorted(texts, key=_sentence_sort_key)]
+
+
+class SideLogSummary:
+    """부가 로그 집계: (표층형, raw_tag, mapped_tag) 건수와 (raw_tag, mapped_tag)별 예시 reservoir 표본."""
+
+    def __init__(self, examples: int = 20, seed: int = 42):
+        self.examples = examples
+        self.counts: Counter = Counter()
+        self.seen: Counter = Counter()
+        self.reservoirs: dict[tuple[str, str | None], list[dict]] = defaultdict(list)
+        self.rng = random.Random(seed)
+
+    def add(self, entry: dict, text: str, raw_tag: str, mapped_tag: str | None) -> None:
+        key = (raw_tag, mapped_tag)
+        self.counts[(entry["entity"], raw_tag, mapped_tag)] += 1
+        self.seen[key] += 1
+        reservoir = self.reservoirs[key]
+        if len(reservoir) < self.examples:
+            slot = len(reservoir)
+            reservoir.append(None)
+        else:
+            slot = self.rng.randrange(self.seen[key])
+            if slot >= self.examples:
+                return
+        reservoir[slot] = {"id": entry["id"], "text": text, "entity": entry["entity"], "raw_tag": raw_tag,
+                           "mapped_tag": mapped_tag, "start": entry["start"], "end": entry["end"]}
+
+    def write(self, counts_file: Path, examples_file: Path) -> None:
+        """건수 표는 TSV(건수 내림차순), 예시는 태그별 문장 id 순 JSONL 로 저장."""
+        rows = sorted(self.counts.items(), key=lambda x: (-x[1], x[0][0], x[0][1], x[0][2] or ""))
+        with open(counts_file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+            writer.writerow(["entity", "raw_tag", "mapped_tag", "count"])
+            for (entity, raw_tag, mapped_tag), cnt in rows:
+                writer.writerow([entity, raw_tag, mapped_tag or "-", cnt])
+        with open(examples_file, "w", encoding="utf-8") as f:
+            for raw_tag, mapped_tag in sorted(self.reservoirs, key=lambda k: (k[0], k[1] or "")):
+                sample = sorted(self.reservoirs[(raw_tag, mapped_tag)],
+                                key=lambda e: (_sentence_sort_key(e["id"]), e["start"]))
+                for entry in sample:
+                    f.write(dumps_line(entry))
+
+
+class SourceConverter(Converter):
+    """라벨링 JSON 디렉토리 → 문장당 한 줄 + _dropped/_atm/_ate 로그. 샤딩은 상대 경로 해시 기준.
+
+    compact_logs 면 _dropped/_atm/_ate 에 문장 text 를 반복하지 않고 id 로 참조하며,
+    엔티티가 없어 출력 JSONL 에 없는 문장만 _sentences.jsonl 에 한 번 저장.
+    표층형 건수 표(_surface_counts.tsv)와 태그별 예시 log_examples 개(_examples.jsonl)도 함께 씀.
+    """
+
+    source = "094"
+    description = "관광 말뭉치 JSON → NER JSONL 변환"
+    default_input = DEFAULT_INPUT
+    default_output = DEFAULT_OUTPUT
+    input_help = "라벨링 JSON 디렉토리"
+    uses_prefetch = True
+    raw_with_ids = True
+
+    def __init__(self, *args, compact_logs: bool = False, log_examples: int = 20, seed: int = 42, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compact_logs = compact_logs
+        self.summary = SideLogSummary(log_examples, seed) if compact_logs else None
+        self.log_row = _compact_entry if compact_logs else (lambda entry: entry)
+
+    def output_suffixes(self) -> list[str]:
+        suffixes = ["_dropped.jsonl", "_atm.jsonl", "_ate.jsonl"]
+        return suffixes + [_COMPACT_SUFFIXES[0]] if self.compact_logs else suffixes
+
+    def _compact_paths(self) -> list[Path]:
+        return [self.output_path(self.output_file.stem + suffix) for suffix in _COMPACT_SUFFIXES]
+
+    def prepare(self) -> None:
+        if not self.compact_logs:
+            # 이전 압축 실행의 파일이 남으면 --reclassify 가 압축 모드로 오인하므로 정리
+            for path in self._compact_paths():
+                path.unlink(missing_ok=True)
+
+    def units(self):
+        return self.walk(".json")
+
+    def unit_label(self, unit) -> str:
+        return unit[0].name
+
+    def convert_unit(self, unit, raw):
+        json_path, content = unit
+        doc_id = json_path.relative_to(self.input_path).as_posix()
+        records, dropped, atm_log, ate_log = convert_file(json_path, doc_id, self.normalize,
+                                                          self.collapse_space, raw, content)
+        for record in records:
+            record["entities"] = VOCAB.decode(record["entities"])
+        self.stats["dropped"] = self.stats.get("dropped", 0) + len(dropped)
+        rows = [records] + [list(map(self.log_row, log)) for log in (dropped, atm_log, ate_log)]
+        if self.compact_logs:
+            rows.append(_summarize_file(records, dropped, atm_log, ate_log, self.summary))
+        return rows
+
+    def finish(self) -> None:
+        if self.compact_logs:
+            _, counts_file, examples_file = self._compact_paths()
+            self.summary.write(counts_file, examples_file)
+
+    def report(self) -> list[str]:
+        dropped_file, atm_file, ate_file = (self.output_path(name) for name in self.outputs()[1:4])
+        lines = [f"제거된 엔티티: {self.stats.get('dropped', 0)}개 → {dropped_file}",
+                 f"A-TM 변환 로그: {atm_file}",
+                 f"A-TE 변환 로그: {ate_file}"]
+        if self.compact_logs:
+            sentences_file, counts_file, examples_file = self._compact_paths()
+            lines += [f"로그 문장: {sentences_file}",
+                      f"표층형 건수: {counts_file} ({len(self.summary.counts):,}행)",
+                      f"태그별 예시: {examples_file}"]
+        return lines
+
+    @classmethod
+    def check_args(cls, parser, args) -> None:
+        super().check_args(parser, args)
+        if args.compact_logs and args.num_shards > 1:
+            parser.error("--compact-logs 는 샤딩과 함께 쓸 수 없습니다. (건수 표·예시 표본은 병합 불가)")
+
+    @classmethod
+    def options(cls, args) -> dict:
+        return {**super().options(args), "compact_logs": args.compact_logs,
+                "log_examples": args.examples, "seed": args.seed}
+
+
+# ── 규칙 반복용 표본 모드 ─────────────────────────────────────────────────────
+
+def sample_files(files: list[Path], input_dir: Path, n: int, seed: int) -> list[Path]:
+    """상위 폴더(094_organize_files.py 의 수집방법/출처) 기준 층화 표본.
+
+    폴더별 파일 수에 비례해 배분하되 폴더마다 최소 1개를 뽑으며,
+    같은 파일 목록·n·seed 이면 항상 같은 표본을 돌려줍니다.
+    """
+    strata: dict[Path, list[Path]] = defaultdict(list)
+    for path in files:
+        strata[path.parent.relative_to(input_dir)].append(path)
+
+    total = len(files)
+    rng = random.Random(seed)
+    picked: list[Path] = []
+    for key in sorted(strata):
+        group = strata[key]
+        k = min(len(group), max(1, round(n * len(group) / total)))
+        picked.extend(rng.sample(group, k))
+    return sorted(picked)
+
+
+def _doc_of(sid: str) -> str:
+    return sid.rpartition("#")[0]
+
+
+def _load_sampled(output_file: Path, docs: set[str]) -> list[dict]:
+    """현재 출력 JSONL 에서 표본 파일(docs) 문장만."""
+    rows = []
+    with open(output_file, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = loads(line)
+                if _doc_of(row.get("id", "")) in docs:
+                    rows.append(row)
+    return rows
+
+
+def _print_sample_diff(before: list[dict], after: list[dict], max_examples: int) -> None:
+    def tag_counts(rows):
+        return Counter(e[2] for row in rows for e in row["entities"])
+
+    cb, ca = tag_counts(before), tag_counts(after)
+
+    print(f"\n  {'태그':<6} {'이전':>8} {'이후':>8} {'증감':>8}")
+    print(f"  {'-'*34}")
+    for tag in sorted(set(cb) | set(ca)):
+        delta = ca[tag] - cb[tag]
+        print(f"  {tag:<6} {cb[tag]:>8,} {ca[tag]:>8,} {delta:>+8,}")
+
+    kb = {row["id"]: row for row in before}
+    ka = {row["id"]: row for row in after}
+    changes = []
+    for sid in sorted(set(kb) | set(ka), key=_sentence_sort_key):
+        text = (ka.get(sid) or kb[sid])["text"]
+        eb = {(s, e): t for s, e, t in (kb[sid]["entities"] if sid in kb else [])}
+        ea = {(s, e): t for s, e, t in (ka[sid]["entities"] if sid in ka else [])}
+        for span in sorted(set(eb) | set(ea)):
+            tb, ta = eb.get(span), ea.get(span)
+            if tb != ta:
+                changes.append((sid, text[span[0]:span[1]], tb or "제거", ta or "제거"))
+
+    print(f"\n  변경 스팬: {len(changes):,}개")
+    transitions = Counter((tb, ta) for _, _, tb, ta in changes)
+    for (tb, ta), cnt in transitions.most_common():
+        print(f"    {tb:>4} → {ta:<4} {cnt:>6,}")
+    for sid, surface, tb, ta in changes[:max_examples]:
+        print(f"    [{sid}] '{surface}' {tb} → {ta}")
+
+
+def run_sample(input_dir: Path, output_file: Path, n: int, seed: int, max_examples: int = 20,
+               normalize: str | None = None, collapse_space: bool = False,
+               prefetch: int = DEFAULT_WORKERS, prefetch_mb: int = DEFAULT_PREFETCH_MB,
+               snapshot: Path = SAMPLE_OUTPUT) -> None:
+    """표본 파일만 변환해 snapshot 에 저장하고, 현재 출력(output_file)의 같은 문장들과 비교.
+
+    문장 id 는 실행마다 같으므로 N·seed 를 바꿔도 표본에 새로 들어온 파일까지 그대로 비교됩니다.
+    """
+    manifest = output_file.with_name(output_file.stem + "_files.json")
+    files = sample_files(list(walk_files(input_dir, ".json", manifest=manifest)), input_dir, n, seed)
+    docs = {path.relative_to(input_dir).as_posix() for path in files}
+    print(f"표본: {len(files)}개 파일 (seed={seed})")
+
+    after: list[dict] = []
+    for json_path, content in Prefetcher(files, prefetch, prefetch_mb << 20):
+        try:
+            records, _, _, _ = convert_file(json_path, json_path.relative_to(input_dir).as_posix(),
+                                            normalize, collapse_space, content=content)
+        except Exception as e:
+            print(f"  [오류] {json_path.name}: {e}")
+            continue
+        for record in records:
+            record["entities"] = VOCAB.decode(record["entities"])
+            after.append(record)
+
+    if output_file.exists():
+        print(f"비교 기준: {output_file} 의 표본 문장")
+        _print_sample_diff(_load_sampled(output_file, docs), after, max_examples)
+    else:
+        counts = Counter(e[2] for row in after for e in row["entities"])
+        print("\n  비교할 출력 없음 → 표본 태그 건수만 표시")
+        for tag, cnt in counts.most_common():
+            print(f"  {tag:<6} {cnt:>8,}")
+
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    with open(snapshot, "w", encoding="utf-8") as out:
+        for row in after:
+            out.write(dumps_line(row))
+    print(f"\n{len(after)}개 문장 → {snapshot}")
+
+
+# ── 로그 기반 A-TM / A-TE 재분류 ──────────────────────────────────────────────
+
+_RULE_TAGS = ("A-TM", "A-TE")
+
+
+def _iter_id_groups(path: Path):
+    """JSONL 을 읽어 같은 id 가 연속된 줄끼리 (정렬 키, id, [객체, ...]) 로 묶음."""
+    with open(path, encoding="utf-8") as f:
+        rows = (loads(line) for line in f if line.strip())
+        for sid, group in itertools.groupby(rows, key=lambda obj: obj.get("id")):
+            if sid is None:
+                raise ValueError(f"{path.name}: id 필드가 없습니다. 먼저 전체 변환을 다시 실행하세요.")
+            yield _sentence_sort_key(sid), sid, list(group)
+
+
+def _patch_sentence(record: dict | None, logs: list[tuple[str, dict]], dropped: list[dict],
+                    changes: Counter, text: str | None = None) -> tuple[dict | None, list[dict]]:
+    """한 문장의 로그 엔티티를 현재 규칙으로 재분류해 레코드·제거 로그를 갱신.
+
+    text 는 레코드가 없을 때 쓸 문장 text (압축 로그의 _sentences). 없으면 로그 항목의 text.
+    """
+    if record:
+        text = record["text"]
+    elif text is None:
+        text = logs[0][1]["text"]
+    sid = record["id"] if record else logs[0][1]["id"]
+    entities = [list(e) for e in record["entities"]] if record else []
+    new_dropped = [d for d in dropped if d["raw_tag"] not in _RULE_TAGS]
+
+    for raw_tag, entry in logs:
+        old, new = entry["mapped_tag"], TAG_MAP.label(raw_tag, entry["entity"])
+        start, end = entry["start"], entry["end"]
+        if old != new:
+            changes[(raw_tag, old, new)] += 1
+            if old is not None and [start, end, old] in entities:
+                entities.remove([start, end, old])
+            if new is not None:
+                pos = next((i for i, e in enumerate(entities) if e[0] > start), len(entities))
+                entities.insert(pos, [start, end, new])
+            entry["mapped_tag"] = new
+        if new is None and not TAG_MAP.is_unlogged(raw_tag):
+            new_dropped.append({"id": sid, "text": text, "entity": entry["entity"],
+                                "raw_tag": raw_tag, "start": start, "end": end})
+
+    new_record = {"id": sid, "text": text, "entities": entities} if entities else None
+    return new_record, new_dropped
+
+
+def reclassify(output_file: Path, log_examples: int = 20, seed: int = 42) -> None:
+    """현재 분류 규칙을 A-TM/A-TE 로그에 재적용해 출력 JSONL 과 로그를 패치.
+
+    출력 JSONL·_dropped·_atm·_ate 를 문장 id 정렬 키로 병합하며 한 번씩만 읽고,
+    임시 파일에 쓴 뒤 모두 성공하면 교체합니다.
+    _sentences.jsonl 이 있으면 압축 로그로 보고 문장 text 를 거기서 읽으며,
+    _sentences·_surface_counts·_examples 도 새 결과로 다시 씁니다.
+    """
+    paths = {
+        "main":    output_file,
+        "dropped": output_file.with_name(output_file.stem + "_dropped.jsonl"),
+        "A-TM":    output_file.with_name(output_file.stem + "_atm.jsonl"),
+        "A-TE":    output_file.with_name(output_file.stem + "_ate.jsonl"),
+    }
+    sentences_file, counts_file, examples_file = (output_file.with_name(output_file.stem + suffix)
+                                                  for suffix in _COMPACT_SUFFIXES)
+    compact = sentences_file.exists()
+    if compact:
+        paths["sentences"] = sentences_file
+    for path in paths.values():
+        if not path.exists():
+            print(f"[오류] 파일이 없습니다: {path}")
+            return
+
+    def tagged(name):
+        for key, sid, group in _iter_id_groups(paths[name]):
+            yield key, name, sid, group
+
+    merged = heapq.merge(*(tagged(name) for name in paths), key=lambda t: t[0])
+    outs = {name: JsonlWriter(path) for name, path in paths.items()}
+    changes: Counter = Counter()
+    summary = SideLogSummary(log_examples, seed) if compact else None
+    total_records = 0
+
+    def dump(name, obj):
+        outs[name].write(obj)
+
+    try:
+        for sid, items in itertools.groupby(merged, key=lambda t: t[2]):
+            parts: dict[str, list[dict]] = defaultdict(list)
+            for _, name, _, group in items:
+                parts[name].extend(group)
+            record = parts["main"][0] if parts["main"] else None
+            logs = [(raw_tag, entry) for raw_tag in _RULE_TAGS for entry in parts[raw_tag]]
+            if record is not None:
+                text = record["text"]
+            else:
+                text = parts["sentences"][0]["text"] if parts["sentences"] else None
+
+            if logs:
+                record, dropped = _patch_sentence(record, logs, parts["dropped"], changes, text)
+            else:
+                dropped = parts["dropped"]
 
-            for record in records:
-                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if record is not None:
+                dump("main", record)
+                total_records += 1
             for entry in dropped:
-                drop_out.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            for entry in atm_log:
-                atm_out.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            for entry in ate_log:
-                ate_out.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-            total_files += 1
-            total_records += len(records)
-            total_dropped += len(dropped)
-
-            if total_files % 1000 == 0:
-                print(f"  {total_files}개 파일 처리 완료 ({total_records}개 문장)...")
-
-    print(f"\n완료: {total_files}개 파일 → {total_records}개 문장 (건너뜀: {skipped}개)")
-    print(f"제거된 엔티티: {total_dropped}개 → {dropped_file}")
-    print(f"A-TM 변환 로그: {atm_file}")
-    print(f"A-TE 변환 로그: {ate_file}")
+                dump("dropped", _compact_entry(entry) if compact else entry)
+            for raw_tag, entry in logs:
+                dump(raw_tag, entry)
+
+            if compact:
+                if record is None and (logs or dropped):
+                    dump("sentences", {"id": sid, "text": text})
+                for raw_tag, entry in logs:
+                    summary.add(entry, text, raw_tag, entry["mapped_tag"])
+                for entry in dropped:
+                    if entry["raw_tag"] not in _RULE_TAGS:
+                        summary.add(entry, text, entry["raw_tag"], None)
+        for out in outs.values():
+            out.finish()
+    except BaseException:
+        for out in outs.values():
+            out.abort()
+        raise
+
+    for out in outs.values():
+        out.commit()
+    if compact:
+        summary.write(counts_file, examples_file)
+
+    print(f"\n재분류 완료: {sum(changes.values())}개 엔티티 변경 → {total_records}개 문장")
+    for (raw_tag, old, new), cnt in sorted(changes.items(), key=lambda x: -x[1]):
+        print(f"  {raw_tag}  {old or '제거':>4} → {new or '제거':<4} {cnt:>8,}")
     print(f"출력 파일: {output_file}")
 
 
 def main():
-    parser = argparse.ArgumentParser(description="관광 말뭉치 JSON → NER JSONL 변환")
-    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT,
-                        help="라벨링 JSON 디렉토리 (default: 기본 경로)")
-    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
-                        help="출력 JSONL 파일 경로 (default: ner_dataset.jsonl)")
+    parser = SourceConverter.make_parser()
+    parser.add_argument("--sample", type=int, default=None, metavar="N",
+                        help=f"층화 표본 N개 파일만 변환해 {SAMPLE_OUTPUT.parent.name}/{SAMPLE_OUTPUT.name} 에 저장하고 "
+                             "--output 의 같은 문장들과 비교 (출력 파일은 건드리지 않음)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="--sample 표본 / --compact-logs 예시 표본 시드 (default: 42)")
+    parser.add_argument("--examples", type=int, default=20,
+                        help="--sample 변경 스팬 예시 개수, --compact-logs 태그별 예시 개수 (default: 20)")
+    parser.add_argument("--reclassify", action="store_true",
+                        help="원본 JSON 없이 A-TM/A-TE 로그에 현재 규칙을 재적용해 --output 을 패치")
+    parser.add_argument("--compact-logs", action="store_true",
+                        help="_dropped/_atm/_ate 에 문장 text 대신 id 참조만 쓰고 표층형 건수 표·태그별 예시 저장")
     args = parser.parse_args()
+    SourceConverter.check_args(parser, args)
 
+    if args.reclassify:
+        print(f"재분류: {args.output}")
+        reclassify(args.output, args.examples, args.seed)
+        return
+
+    if not args.sample:
+        SourceConverter.main(args)
+        return
     if not args.input.exists():
         print(f"[오류] 입력 경로가 존재하지 않습니다: {args.input}")
         return
-
     print(f"입력: {args.input}")
     print(f"출력: {args.output}")
-    convert_directory(args.input, args.output)
+    run_sample(args.input, args.output, args.sample, args.seed, args.examples,
+               args.normalize, args.collapse_space, args.prefetch, args.prefetch_mb)
 
 
 if __name__ == "__main__":
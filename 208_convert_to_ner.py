@@ -7,7 +7,7 @@
     .Keyword : 개체 텍스트
     .Type    : 개체 유형 번호 (0~6)
 
-Type 번호 → 태그 매핑 (aihub_data.md 기준):
+Type 번호 → 태그 매핑 (aihub_data.md 기준, tag_maps/208.json):
   0: DAT (날짜)   1: LOC (장소)   2: ORG (기관)
   3: PER (인물)   4: QT  (수량)   5: TIM (시간)   6: DAT (기간→날짜 통합)
 
@@ -30,38 +30,30 @@ Type 번호 → 태그 매핑 (aihub_data.md 기준):
   --output : converted/208_ner_dataset.jsonl
 """
 
-import json
-import argparse
 from pathlib import Path
 
+from converter import Converter
+from fast_json import decode_208
+from label_vocab import load_tag_map
+from ner_utils import normalize_text, remap_spans
+
 
 DEFAULT_INPUT = Path(__file__).parent / (
     "208.전시_공연_도슨트_데이터/01-1.정식개방데이터/Training/02.라벨링데이터"
 )
 DEFAULT_OUTPUT = Path(__file__).parent / "converted" / "208_ner_dataset.jsonl"
 
-TYPE_LABELS = {0: "DAT", 1: "LOC", 2: "ORG", 3: "PER", 4: "QT", 5: "TIM", 6: "DAT"}
-
+# tag_maps/208.json 을 컴파일한 Type 번호 → 레이블 id 테이블
+TYPE_MAP = load_tag_map("208")
+VOCAB = TYPE_MAP.vocab
 
 
-def convert_file(json_path: Path) -> dict:
-    """JSON 파일 하나를 NER 포맷 레코드로 변환."""
-    with open(json_path, encoding="utf-8") as f:
-        data = json.load(f)
-
-    text = data.get("explain", "")
-    taglist = data.get("taglist") or []
-
-    entities = []
+def _place(text: str, items: list[tuple[str, object]]) -> list[list]:
+    """(Keyword, 태그) 목록을 순서대로 explain 의 첫 번째 미사용 위치에 배치. [[start, end, 태그], ...]"""
+    spans = []
     used: set[tuple[int, int]] = set()
 
-    for item in taglist:
-        keyword = item.get("Keyword", "")
-        type_id = item.get("Type")
-
-        if not keyword or type_id not in TYPE_LABELS:
-            continue
-
+    for keyword, tag in items:
         # 첫 번째 미사용 위치 탐색
         start = 0
         pos = -1
@@ -80,54 +72,79 @@ def convert_file(json_path: Path) -> dict:
 
         start = pos
         end = pos + len(keyword)
-        tag = TYPE_LABELS[type_id]
-        entities.append([start, end, tag])
+        spans.append([start, end, tag])
         used.add((start, end))
+    return spans
 
-    return {"text": text, "entities": entities}
 
+def convert_file(json_path: Path, normalize: str | None = None, collapse_space: bool = False,
+                 raw: list | None = None, content: bytes | None = None) -> dict:
+    """JSON 파일 하나를 NER 포맷 레코드로 변환. (entities 라벨은 VOCAB id)
+
+    normalize / collapse_space 를 주면 explain 텍스트를 정규화하고 엔티티 오프셋을 옮김.
+    raw 리스트를 주면 (정규화 전 explain, 원본 Type 스팬) 을 추가. 원본 스팬은 매핑되지 않는
+    Type 도 배치하므로, 그런 항목이 위치를 선점한 문서는 매핑 결과와 다를 수 있음.
+    content 는 미리 읽어 둔 파일 바이트 (fs_walk.Prefetcher). None 이면 json_path 를 직접 읽음.
+    """
+    if content is None:
+        with open(json_path, "rb") as f:
+            content = f.read()
+    data = decode_208(content)
+
+    text = data.get("explain", "")
+    taglist = data.get("taglist") or []
+
+    items = []
+    for item in taglist:
+        keyword = item.get("Keyword", "")
+        type_id = item.get("Type")
+
+        if not keyword or type_id not in TYPE_MAP:
+            continue
+        tag_id = TYPE_MAP.lookup(type_id)
+        if tag_id is None:
+            continue
+        items.append((keyword, tag_id))
+    entities = _place(text, items)
+
+    if raw is not None:
+        raw.append((text, _place(text, [(item.get("Keyword"), item.get("Type")) for item in taglist
+                                        if item.get("Keyword") and item.get("Type") is not None])))
+    if normalize or collapse_space:
+        text, offset_map = normalize_text(text, normalize, collapse_space)
+        entities = remap_spans(entities, offset_map)
+    return {"text": text, "entities": entities}
 
-def convert_directory(input_dir: Path, output_file: Path) -> None:
-    output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    total_files = skipped = 0
+class SourceConverter(Converter):
+    """라벨링 JSON 디렉토리 → 문서(파일)당 한 줄. 샤딩은 상대 경로 해시 기준."""
 
-    with open(output_file, "w", encoding="utf-8") as out:
-        for json_path in sorted(input_dir.rglob("*.json")):
-            try:
-                record = convert_file(json_path)
-            except Exception as e:
-                print(f"  [오류] {json_path.name}: {e}")
-                skipped += 1
-                continue
+    source = "208"
+    description = "전시 공연 도슨트 JSON → NER JSONL 변환"
+    default_input = DEFAULT_INPUT
+    default_output = DEFAULT_OUTPUT
+    input_help = "라벨링 JSON 디렉토리"
+    progress_every = 100
+    uses_prefetch = True
+    raw_key_type = "int"
 
-            if not record["entities"]:
-                continue
-            out.write(json.dumps(record, ensure_ascii=False) + "\n")
-            total_files += 1
+    def units(self):
+        return self.walk(".json")
 
-            if total_files % 100 == 0:
-                print(f"  {total_files}개 파일 처리 완료...")
+    def unit_label(self, unit) -> str:
+        return unit[0].name
 
-    print(f"\n완료: {total_files}개 파일 변환 (건너뜀: {skipped}개)")
-    print(f"출력 파일: {output_file}")
+    def convert_unit(self, unit, raw):
+        json_path, content = unit
+        record = convert_file(json_path, self.normalize, self.collapse_space, raw, content)
+        if not record["entities"]:
+            return [[]]
+        record["entities"] = VOCAB.decode(record["entities"])
+        return [[record]]
 
 
 def main():
-    parser = argparse.ArgumentParser(description="전시 공연 도슨트 JSON → NER JSONL 변환")
-    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT,
-                        help="라벨링 JSON 디렉토리 (default: 기본 경로)")
-    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
-                        help="출력 JSONL 파일 경로 (default: docent_ner_dataset.jsonl)")
-    args = parser.parse_args()
-
-    if not args.input.exists():
-        print(f"[오류] 입력 경로가 존재하지 않습니다: {args.input}")
-        return
-
-    print(f"입력: {args.input}")
-    print(f"출력: {args.output}")
-    convert_directory(args.input, args.output)
+    SourceConverter.main()
 
 
 if __name__ == "__main__":
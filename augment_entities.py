@@ -0,0 +1,224 @@
+"""엔티티 치환 증강: 적은 레이블(TIM, PHN, URL 등)을 같은 레이블의 다른 표층형으로 바꿔 끼운 변형 문장 생성
+
+1) 풀 구축 : converted/*_ner_dataset.jsonl 을 한 번 훑어 레이블별 표층형 풀과 레이블 건수 집계
+2) 증강    : 다시 스트리밍하며 목표 건수에 못 미친 레이블이 든 레코드마다 변형 --variants 개 생성
+             - 부족 레이블 스팬은 풀에서 뽑은 다른 표층형으로 치환 (다른 스팬은 그대로)
+             - 텍스트는 조각 리스트로 한 번에 다시 만들고, 뒤 엔티티 오프셋은 누적 shift 한 번으로 보정
+             - 레이블별 목표에 도달하면 그 레이블은 더 이상 치환하지 않음
+             - 같은 레코드에서 이미 쓴 변형은 다시 쓰지 않음 (풀이 작아 새 변형이 안 나오면 그 레코드는 중단)
+             - 부족 레이블 이름이 줄에 없으면 json 파싱 없이 건너뜀
+
+출력은 {"text", "entities"} JSONL 이며 학습 split 에만 섞어 쓰도록 converted/ 밖에 저장합니다.
+(converted/ 에 두면 prepare_hf_dataset.py 가 원본처럼 읽어 dev/test 로도 분할됨)
+
+목표 건수:
+  --targets TIM=30000,PHN=20000   레이블별 지정
+  --target N                      나머지 레이블 공통 (기본: 레이블 건수 중앙값)
+
+사용법:
+  python3 augment_entities.py                               # 중앙값 미만 레이블을 중앙값까지
+  python3 augment_entities.py --targets TIM=30000,URL=10000 --variants 5
+  python3 augment_entities.py --inputs converted/208_ner_dataset.jsonl --output augmented/208_aug.jsonl
+"""
+
+import argparse
+import random
+import statistics
+from collections import Counter
+from pathlib import Path
+
+from fast_json import dumps_line, loads
+
+BASE_DIR = Path(__file__).parent
+CONVERTED_DIR = BASE_DIR / "converted"
+DEFAULT_OUTPUT = BASE_DIR / "augmented" / "augmented_ner_dataset.jsonl"
+_DATASET_SUFFIX = "_ner_dataset.jsonl"
+_MAX_DRAWS = 4   # 원래 표층형과 다른 후보 / 이미 쓴 것과 다른 변형을 뽑기 위한 재시도 횟수
+
+
+def _iter_records(paths: list[Path]):
+    for path in paths:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def build_pools(paths: list[Path], max_per_label: int) -> tuple[dict[str, list[str]], Counter]:
+    """레이블별 표층형 풀(빈도 상위 max_per_label 개, 중복 없음)과 레이블별 엔티티 수."""
+    surfaces: dict[str, Counter] = {}
+    label_counts: Counter = Counter()
+    for line in _iter_records(paths):
+        obj = loads(line)
+        text = obj.get("text", "")
+        for start, end, label in obj.get("entities", []):
+            label_counts[label] += 1
+            surface = text[start:end]
+            if surface.strip():
+                surfaces.setdefault(label, Counter())[surface] += 1
+    pools = {label: [s for s, _ in counter.most_common(max_per_label)]
+             for label, counter in surfaces.items()}
+    return pools, label_counts
+
+
+def parse_targets(spec: str | None, label_counts: Counter, default: int | None) -> dict[str, int]:
+    """--targets / --target → 레이블별 목표 건수 (현재 건수 이상인 레이블은 제외)."""
+    if default is None:
+        default = int(statistics.median(label_counts.values())) if label_counts else 0
+    targets = {label: default for label in label_counts}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        label, _, value = item.partition("=")
+        targets[label.strip()] = int(value)
+    return {label: t for label, t in targets.items() if t > label_counts.get(label, 0)}
+
+
+class Substituter:
+    """레코드 하나에서 지정 레이블 스팬을 풀의 다른 표층형으로 치환한 변형 생성."""
+
+    def __init__(self, pools: dict[str, list[str]], seed: int = 42):
+        self.pools = pools
+        self.rng = random.Random(seed)
+
+    def _draw(self, label: str, current: str) -> str | None:
+        pool = self.pools.get(label)
+        if not pool or (len(pool) == 1 and pool[0] == current):
+            return None
+        choice = self.rng.choice
+        for _ in range(_MAX_DRAWS):
+            surface = choice(pool)
+            if surface != current:
+                return surface
+        return None
+
+    def variant(self, text: str, entities: list, swap: set[str]) -> tuple[str, list[list], Counter] | None:
+        """swap 레이블 스팬을 치환한 (text, entities, 치환 레이블 건수). 치환이 없으면 None.
+
+        entities 는 start 순으로 정렬돼 있고 겹치지 않아야 합니다.
+        조각을 모아 텍스트를 한 번에 만들고, 치환 길이 차이를 누적한 shift 로 뒤 오프셋을 옮깁니다.
+        """
+        pieces: list[str] = []
+        new_entities: list[list] = []
+        swapped: Counter = Counter()
+        cursor = shift = 0
+        for start, end, label in entities:
+            surface = text[start:end]
+            if label in swap:
+                replacement = self._draw(label, surface)
+                if replacement is not None:
+                    surface = replacement
+                    swapped[label] += 1
+            pieces.append(text[cursor:start])
+            pieces.append(surface)
+            new_start = start + shift
+            new_entities.append([new_start, new_start + len(surface), label])
+            shift += len(surface) - (end - start)
+            cursor = end
+        if not swapped:
+            return None
+        pieces.append(text[cursor:])
+        return "".join(pieces), new_entities, swapped
+
+
+def _sorted_disjoint(entities: list) -> list | None:
+    """start 순 정렬. 겹치는 스팬이 있으면 None (치환 시 오프셋이 모호해짐)."""
+    ordered = sorted(entities, key=lambda e: (e[0], e[1]))
+    for prev, cur in zip(ordered, ordered[1:]):
+        if cur[0] < prev[1]:
+            return None
+    return ordered
+
+
+def augment(paths: list[Path], output: Path, pools: dict[str, list[str]], label_counts: Counter,
+            targets: dict[str, int], variants: int, seed: int) -> Counter:
+    """목표에 못 미친 레이블이 든 레코드마다 변형을 만들어 저장. 레이블별 추가 건수 반환."""
+    deficit = {label: target - label_counts.get(label, 0) for label, target in targets.items()}
+    deficit = {label: d for label, d in deficit.items() if d > 0 and pools.get(label)}
+    needles = {label: f'"{label}"]'.encode("utf-8") for label in deficit}
+    sub = Substituter(pools, seed)
+    added: Counter = Counter()
+    written = 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as out:
+        for line in _iter_records(paths):
+            if not deficit:
+                break
+            if not any(needle in line for needle in needles.values()):
+                continue
+            obj = loads(line)
+            entities = _sorted_disjoint(obj.get("entities", []))
+            if entities is None:
+                continue
+            text = obj.get("text", "")
+            seen = {text}
+            repeats = 0
+            while len(seen) <= variants and repeats < _MAX_DRAWS:
+                swap = {e[2] for e in entities if e[2] in deficit}
+                if not swap:
+                    break
+                result = sub.variant(text, entities, swap)
+                if result is None:
+                    break
+                new_text, new_entities, swapped = result
+                if new_text in seen:
+                    repeats += 1      # 작은 풀(PHN/URL 등)에서 흔함. 연속으로 나오면 새 변형이 없다고 봄
+                    continue
+                seen.add(new_text)
+                repeats = 0
+                out.write(dumps_line({"text": new_text, "entities": new_entities}))
+                written += 1
+                for label, cnt in swapped.items():
+                    added[label] += cnt
+                    deficit[label] -= cnt
+                    if deficit[label] <= 0:
+                        del deficit[label]
+                        del needles[label]
+    added["_records"] = written
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔티티 치환 증강 (적은 레이블 보강)")
+    parser.add_argument("--inputs", nargs="+", type=Path, default=None,
+                        help=f"입력 JSONL (default: {CONVERTED_DIR}/*{_DATASET_SUFFIX})")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help=f"출력 JSONL (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--targets", default=None, metavar="L=N,...",
+                        help="레이블별 목표 엔티티 수 (예: TIM=30000,PHN=20000)")
+    parser.add_argument("--target", type=int, default=None, metavar="N",
+                        help="--targets 에 없는 레이블의 공통 목표 (default: 레이블 건수 중앙값)")
+    parser.add_argument("--variants", type=int, default=3,
+                        help="레코드당 최대 변형 수 (default: 3)")
+    parser.add_argument("--pool-size", type=int, default=100000,
+                        help="레이블별 표층형 풀 크기 (빈도 상위, default: 100000)")
+    parser.add_argument("--seed", type=int, default=42, help="표층형 추출 시드 (default: 42)")
+    args = parser.parse_args()
+
+    paths = args.inputs or sorted(CONVERTED_DIR.glob(f"*{_DATASET_SUFFIX}"))
+    if not paths:
+        print(f"[오류] 입력 JSONL 이 없습니다: {CONVERTED_DIR}")
+        return
+
+    pools, label_counts = build_pools(paths, args.pool_size)
+    print(f"[풀] {len(paths)}개 파일, 레이블 {len(label_counts)}종")
+    try:
+        targets = parse_targets(args.targets, label_counts, args.target)
+    except ValueError:
+        parser.error("--targets 는 LABEL=N 을 쉼표로 구분해야 합니다.")
+    if not targets:
+        print("목표 건수에 못 미친 레이블이 없습니다.")
+        return
+
+    added = augment(paths, args.output, pools, label_counts, targets, args.variants, args.seed)
+    print(f"\n  {'레이블':<6} {'원본':>10} {'추가':>10} {'목표':>10} {'풀':>8}")
+    print(f"  {'-'*48}")
+    for label in sorted(targets, key=lambda l: label_counts.get(l, 0)):
+        print(f"  {label:<6} {label_counts.get(label, 0):>10,} {added[label]:>10,} "
+              f"{targets[label]:>10,} {len(pools.get(label, [])):>8,}")
+    print(f"\n완료: 변형 {added['_records']:,}개 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""파이프라인 단계별 메모리 벤치마크 (예산 초과 시 종료 코드 1)
+
+고정 크기 합성 픽스처(시드 고정)를 만들고, 각 단계를 별도 프로세스에서 실행해
+  - heap : tracemalloc 최고치 (파이썬 객체 할당)
+  - rss  : 최고 RSS 증가분 (ru_maxrss − 시작 시점, 자식 프로세스는 가장 큰 것)
+을 측정합니다. 둘 다 레코드 10만 건당 MB 로 환산해 예산(BUDGETS)과 비교합니다.
+
+단계:
+  094 / 208 / naver / kmou    변환 스크립트 (픽스처 원본 → converted/*.jsonl)
+  prepare_hf                  converted/ → hf_dataset/
+  entity_stats                converted/ 통계
+  diff_datasets               094 출력 vs 일부 엔티티를 지운 사본
+
+사용법:
+  python3 bench_memory.py                       # 기본 2만 건, 전체 단계
+  python3 bench_memory.py --records 100000 --stages prepare_hf naver
+  python3 bench_memory.py --budgets my_budgets.json --json report.json
+
+예산 파일 형식 (일부 단계만 덮어써도 됨):
+  {"prepare_hf": {"heap": 120, "rss": 200}, ...}    # 단위: MB / 10만 건
+
+tracemalloc 은 할당마다 추적 비용이 들어 실행이 느려지고 rss 에도 일부 반영됩니다.
+같은 조건끼리 비교하는 회귀 감시용 수치로 보세요.
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# 단계별 예산 (MB / 10만 건). 기본 --records 20000 합성 픽스처 측정치의 약 2배
+# 스트리밍 단계는 고정 비용 비중이 커서 --records 를 바꾸면 환산값도 달라짐
+# 094/208/kmou 는 기본 JSON 백엔드(msgspec) 기준. msgspec import 만으로 heap 약 2.8 MB,
+# RSS 약 6.5 MB 가 고정으로 붙음 (json 백엔드는 1 MB / 1.5 MB)
+BUDGETS: dict[str, dict[str, float]] = {
+    "094":           {"heap": 75,  "rss": 175},
+    "208":           {"heap": 95,  "rss": 225},
+    "naver":         {"heap": 280, "rss": 700},
+    "kmou":          {"heap": 120, "rss": 330},
+    "prepare_hf":    {"heap": 50,  "rss": 60},
+    "entity_stats":  {"heap": 10,  "rss": 25},
+    "diff_datasets": {"heap": 40,  "rss": 90},
+}
+
+# 자식 프로세스: 스크립트를 __main__ 으로 실행하며 메모리 측정, 결과는 JSON 파일로 전달
+_CHILD = r"""
+import contextlib, json, os, resource, runpy, sys, tracemalloc
+result_path, script, *argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(script))
+base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+sys.argv = [script, *argv]
+with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+    runpy.run_path(script, run_name="__main__")
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+with open(result_path, "w") as f:
+    json.dump({"heap": peak,
+               "rss": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_kb) * 1024,
+               "rss_children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024}, f)
+"""
+
+
+# ── 픽스처 ───────────────────────────────────────────────────────────────────
+
+_WORDS = ["작품은", "그림이다.", "매우", "아름답다.", "이", "전시는", "오늘", "관광객이", "많았다."]
+_094_ENTS = [("서울", "O", "LC"), ("홍길동", "O", "PS"), ("관광공사", "O", "OG"), ("2020년", "O", "DT"),
+             ("www.visit.kr", "A", "TM"), ("부산", "A", "TM"), ("02-123-4567", "A", "TE"),
+             ("10시", "A", "TI"), ("좋은", "E", "P"), ("서울시 중구", "A", "AD")]
+_208_ENTS = [("조선", 0), ("경복궁", 1), ("박물관", 2), ("이순신", 3), ("세 점", 4), ("오후", 5)]
+_NAVER_TAGS = ["-", "-", "-", "PER_B", "PER_I", "LOC_B", "NUM_B", "ORG_B", "ORG_I", "DAT_B"]
+
+
+def _sentence_094(rng: random.Random) -> dict:
+    parts, anns, cur = [], [], 0
+    for _ in range(rng.randint(1, 4)):
+        pre = rng.choice(_WORDS) + " "
+        text, tagclass, code = rng.choice(_094_ENTS)
+        anns.append({"TagText": text, "Tagclass": tagclass, "TagCode": code,
+                     "startPos": cur + len(pre), "endPos": cur + len(pre) + len(text) - 1})
+        parts += [pre, text, "에 "]
+        cur += len(pre) + len(text) + 2
+    parts.append("갔다.")
+    return {"sentence": "".join(parts), "annotations": anns}
+
+
+def make_fixtures(root: Path, records: int, seed: int = 0) -> None:
+    """소스별로 약 records 건의 레코드가 나오는 원본 픽스처 생성."""
+    rng = random.Random(seed)
+
+    # 094: 파일당 10문장, 수집방법/출처 폴더 6개
+    per_file = 10
+    for k in range(records // per_file):
+        d = root / "094" / ("온라인", "오프라인")[k % 2] / ("블로그", "카페", "뉴스")[k % 3]
+        d.mkdir(parents=True, exist_ok=True)
+        doc = {"docu_info": {"sentences": [_sentence_094(rng) for _ in range(per_file)]}}
+        (d / f"doc{k:07d}.json").write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+
+    # 208: 파일 하나 = 문서 하나
+    d = root / "208"
+    d.mkdir(parents=True, exist_ok=True)
+    for k in range(records):
+        words, tags = [], []
+        for _ in range(rng.randint(10, 60)):
+            if rng.random() < 0.1:
+                keyword, type_id = rng.choice(_208_ENTS)
+                words.append(keyword)
+                tags.append({"Keyword": keyword, "Type": type_id})
+            else:
+                words.append(rng.choice(_WORDS))
+        if not tags:
+            keyword, type_id = rng.choice(_208_ENTS)
+            words.append(keyword)
+            tags.append({"Keyword": keyword, "Type": type_id})
+        (d / f"doc{k:07d}.json").write_text(
+            json.dumps({"explain": " ".join(words), "taglist": tags}, ensure_ascii=False), encoding="utf-8")
+
+    # naver: 단일 파일, 빈 줄로 문장 구분
+    with open(root / "naver.txt", "w", encoding="utf-8") as f:
+        for _ in range(records):
+            f.write("1\t서울\tLOC_B\n")
+            for i in range(rng.randint(2, 12)):
+                f.write(f"{i + 2}\t{rng.choice(_WORDS)}\t{rng.choice(_NAVER_TAGS)}\n")
+            f.write("\n")
+
+    # kmou: 파일 4개
+    d = root / "kmou"
+    d.mkdir(parents=True, exist_ok=True)
+    files = [open(d / f"f{k}_NER.txt", "w", encoding="utf-8") for k in range(4)]
+    try:
+        for i in range(records):
+            word = rng.choice(_WORDS)
+            files[i % 4].write(f"## {i}\n## {word} 서울에서 김철수가\n"
+                               f"## {word} <서울:LCP>에서 <김철수:PER>가\n서울\t서울\tNNP\tB_LC\n\n")
+    finally:
+        for f in files:
+            f.close()
+
+
+def _count_lines(*paths: Path) -> int:
+    total = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            total += sum(1 for _ in f)
+    return total
+
+
+def _perturb(src: Path, dst: Path) -> None:
+    """10건마다 마지막 엔티티를 지운 사본 (diff_datasets 입력)."""
+    with open(src, encoding="utf-8") as f, open(dst, "w", encoding="utf-8") as out:
+        for i, line in enumerate(f):
+            obj = json.loads(line)
+            if i % 10 == 0 and obj["entities"]:
+                obj["entities"] = obj["entities"][:-1]
+            out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+
+# ── 실행 ─────────────────────────────────────────────────────────────────────
+
+def _stages(fx: Path, out: Path) -> dict[str, tuple[str, list[str], list[Path]]]:
+    """단계명 → (스크립트, 인자, 레코드 수를 셀 파일)."""
+    conv = out / "converted"
+    outputs = {src: conv / f"{src}_ner_dataset.jsonl" for src in ("094", "208", "naver", "kmou")}
+    hf = out / "hf_dataset"
+    return {
+        "094": ("094_convert_to_ner.py",
+                ["--input", str(fx / "094"), "--output", str(outputs["094"])], [outputs["094"]]),
+        "208": ("208_convert_to_ner.py",
+                ["--input", str(fx / "208"), "--output", str(outputs["208"])], [outputs["208"]]),
+        "naver": ("naver_convert_to_ner.py",
+                  ["--input", str(fx / "naver.txt"), "--output", str(outputs["naver"])], [outputs["naver"]]),
+        "kmou": ("kmou_convert_to_ner.py",
+                 ["--input", str(fx / "kmou"), "--output", str(outputs["kmou"])], [outputs["kmou"]]),
+        "prepare_hf": ("prepare_hf_dataset.py",
+                       ["--input-dir", str(conv), "--output-dir", str(hf)],
+                       [hf / "train.jsonl", hf / "dev.jsonl", hf / "test.jsonl"]),
+        "entity_stats": ("entity_stats.py", ["--dir", str(conv)], list(outputs.values())),
+        "diff_datasets": ("diff_datasets.py",
+                          ["--original", str(outputs["094"]), "--cleaned", str(out / "094_perturbed.jsonl"),
+                           "--output", str(out / "diff.jsonl")], [outputs["094"]]),
+    }
+
+
+def run_stage(script: str, argv: list[str], work: Path) -> dict[str, int]:
+    """자식 프로세스에서 스크립트 실행 후 {"heap", "rss", "rss_children"} (바이트)."""
+    result_path = work / "result.json"
+    proc = subprocess.run([sys.executable, "-c", _CHILD, str(result_path), str(HERE / script), *argv],
+                          cwd=work, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} 실패 (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    with open(result_path) as f:
+        return json.load(f)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="파이프라인 단계별 메모리 벤치마크")
+    ap.add_argument("--records", type=int, default=20000, metavar="N",
+                    help="소스별 픽스처 레코드 수 (기본: 20000)")
+    ap.add_argument("--seed", type=int, default=0, help="픽스처 시드 (기본: 0)")
+    ap.add_argument("--stages", nargs="+", choices=list(BUDGETS), default=list(BUDGETS),
+                    help="실행할 단계 (기본: 전체, 뒤 단계는 변환 출력 필요)")
+    ap.add_argument("--budgets", type=Path, default=None, metavar="JSON",
+                    help="예산 덮어쓰기 파일 ({단계: {heap, rss}}, MB/10만 건)")
+    ap.add_argument("--json", type=Path, default=None, metavar="OUT",
+                    help="측정 결과 저장 경로")
+    ap.add_argument("--keep", type=Path, default=None, metavar="DIR",
+                    help="임시 디렉토리 대신 DIR 에 픽스처·출력 보관")
+    args = ap.parse_args()
+
+    budgets = {stage: dict(limits) for stage, limits in BUDGETS.items()}
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            for stage, limits in json.load(f).items():
+                budgets.setdefault(stage, {}).update(limits)
+
+    with tempfile.TemporaryDirectory(prefix="bench_memory_") as tmp:
+        work = args.keep or Path(tmp)
+        fx, out = work / "fixtures", work / "out"
+        work.mkdir(parents=True, exist_ok=True)
+        print(f"▶ 픽스처: 소스별 {args.records:,}건 → {fx}")
+        make_fixtures(fx, args.records, args.seed)
+
+        stages = _stages(fx, out)
+        needs_conv = any(s in args.stages for s in ("prepare_hf", "entity_stats", "diff_datasets"))
+        selected = [s for s in BUDGETS if s in args.stages
+                    or (needs_conv and s in ("094", "208", "naver", "kmou"))]
+
+        report, failed = {}, []
+        print(f"\n  {'단계':<14} {'레코드':>9} {'heap MB':>9} {'RSS MB':>9} "
+              f"{'heap/10만':>10} {'RSS/10만':>10}  판정")
+        print(f"  {'-' * 76}")
+        for stage in selected:
+            script, argv, count_paths = stages[stage]
+            if stage == "diff_datasets":
+                _perturb(count_paths[0], out / "094_perturbed.jsonl")
+            mem = run_stage(script, argv, work)
+            # 094 부가 로그·manifest 는 prepare_hf/entity_stats 입력에서 제외
+            (out / "side").mkdir(parents=True, exist_ok=True)
+            for side in (out / "converted").glob("*_ner_dataset_*"):
+                side.replace(out / "side" / side.name)
+            if stage not in args.stages:
+                continue  # 뒤 단계 입력용으로만 실행
+
+            records = max(_count_lines(*count_paths), 1)
+            heap_mb = mem["heap"] / 2**20
+            rss_mb = max(mem["rss"], mem["rss_children"]) / 2**20
+            per = {"heap": heap_mb * 100_000 / records, "rss": rss_mb * 100_000 / records}
+            over = [k for k, limit in budgets.get(stage, {}).items() if per[k] > limit]
+            if over:
+                failed.append(stage)
+            report[stage] = {"records": records, "heap_mb": round(heap_mb, 2), "rss_mb": round(rss_mb, 2),
+                             "heap_mb_per_100k": round(per["heap"], 2), "rss_mb_per_100k": round(per["rss"], 2),
+                             "budget": budgets.get(stage, {}), "over": over}
+            verdict = "초과: " + ", ".join(over) if over else "OK"
+            print(f"  {stage:<14} {records:>9,} {heap_mb:>9.1f} {rss_mb:>9.1f} "
+                  f"{per['heap']:>10.1f} {per['rss']:>10.1f}  {verdict}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[저장] {args.json}")
+
+    if failed:
+        print(f"\n✘ 예산 초과: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✔ 모든 단계가 예산 이내")
+
+
+if __name__ == "__main__":
+    main()
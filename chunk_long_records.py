@@ -0,0 +1,234 @@
+"""긴 문서 레코드를 엔티티를 자르지 않는 겹침 창(window)으로 분할하는 스크립트
+
+208 처럼 문서 전체가 한 레코드인 JSONL 은 모델 최대 길이를 훌쩍 넘어,
+학습 토크나이저가 뒷부분을 잘라내면서 그 안의 엔티티도 함께 사라집니다.
+prepare_hf_dataset.py 전에 돌려 긴 레코드를 창 단위 레코드로 바꿉니다.
+
+분할 규칙:
+  - 자르는 위치는 어절 시작(공백 뒤)만 허용하고, 엔티티 내부 위치는 미리 제외
+    → 모든 엔티티는 어느 창 하나에 온전히 들어감
+  - 창 끝은 길이 한도 안에서 가장 뒤의 문장 경계(. ! ? 뒤, 줄바꿈)를 우선,
+    창 절반 이후에 문장 경계가 없으면 가장 뒤의 어절 경계를 사용
+  - 다음 창은 이전 창 끝에서 --overlap 만큼 앞의 경계에서 시작 (겹침 구간 엔티티는 양쪽에 포함)
+  - 엔티티 오프셋은 창 시작 기준으로 다시 계산, 원문 기준 시작 위치는 "offset" 필드에 기록
+  - 한도 이하 레코드는 그대로 출력 → 같은 설정으로 다시 돌려도 결과가 같음
+
+경계 후보·허용 여부는 레코드마다 한 번만 정규식·병합 스윕으로 정수 배열에 계산하고,
+창 위치는 bisect 로 찾습니다. (레코드 길이에 대해 선형, 창마다 O(log n))
+
+사용법:
+  python3 chunk_long_records.py                                  # converted/208_ner_dataset.jsonl 제자리 분할
+  python3 chunk_long_records.py --max-len 256 --overlap 32
+  python3 chunk_long_records.py --unit word --max-len 128 --input A.jsonl --output B.jsonl
+"""
+
+import argparse
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from fast_json import dumps_line, loads
+
+DEFAULT_INPUT = Path(__file__).parent / "converted" / "208_ner_dataset.jsonl"
+
+_WORD_RE = re.compile(r"\S+")
+_SENT_RE = re.compile(r"(?<=[.!?。])\s+|\n\s*")
+
+
+def _boundaries(text: str, entities: list) -> tuple[array, array, array]:
+    """(허용 어절 경계, 허용 문장 경계, 어절 시작 위치) 정수 배열.
+
+    경계 p 는 text[:p] / text[p:] 로 자르는 위치이며, 엔티티 내부(s < p < e)는 제외됩니다.
+    """
+    word_starts = array("i", (m.start() for m in _WORD_RE.finditer(text)))
+    sent = {m.end() for m in _SENT_RE.finditer(text)}
+
+    # 엔티티 구간 병합 후 어절 시작 위치와 함께 한 번 스윕
+    spans: list[list[int]] = []
+    for s, e, _ in sorted(entities):
+        if spans and s < spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], e)
+        else:
+            spans.append([s, e])
+
+    words, sents = array("i"), array("i")
+    k = 0
+    for p in word_starts:
+        while k < len(spans) and spans[k][1] <= p:
+            k += 1
+        if k < len(spans) and spans[k][0] < p:
+            continue  # 엔티티 내부
+        words.append(p)
+        if p in sent:
+            sents.append(p)
+    return words, sents, word_starts
+
+
+class WindowSplitter:
+    """길이 단위(char/word)·최대 길이·겹침으로 레코드를 창으로 분할."""
+
+    def __init__(self, max_len: int, overlap: int = 0, unit: str = "char"):
+        if max_len < 1 or not 0 <= overlap < max_len:
+            raise ValueError("max_len >= 1, 0 <= overlap < max_len 이어야 합니다.")
+        self.max_len = max_len
+        self.overlap = overlap
+        self.unit = unit
+
+    def length(self, text: str) -> int:
+        return len(text) if self.unit == "char" else len(text.split())
+
+    def _advance(self, word_starts: array, pos: int, n: int, text_len: int) -> int:
+        """pos 에서 n 단위 뒤의 위치 (word 단위면 n 번째 뒤 어절 시작)."""
+        if self.unit == "char":
+            return min(pos + n, text_len)
+        i = bisect_left(word_starts, pos) + n
+        return word_starts[i] if i < len(word_starts) else text_len
+
+    def _back(self, word_starts: array, pos: int, n: int) -> int:
+        """pos 에서 n 단위 앞의 위치."""
+        if self.unit == "char":
+            return pos - n
+        i = bisect_left(word_starts, pos) - n
+        return word_starts[i] if i >= 0 else 0
+
+    def windows(self, text: str, entities: list) -> list[tuple[int, int]]:
+        """[(start, end), ...] 창 구간 (원문 문자 오프셋)."""
+        n = len(text)
+        if self.length(text) <= self.max_len:
+            return [(0, n)]
+        words, sents, word_starts = _boundaries(text, entities)
+
+        result = []
+        start = word_starts[0] if word_starts else 0
+        while True:
+            limit = self._advance(word_starts, start, self.max_len, n)
+            if limit >= n:
+                result.append((start, n))
+                break
+            half = self._advance(word_starts, start, self.max_len // 2, n)
+
+            i = bisect_right(sents, limit) - 1
+            if i >= 0 and sents[i] > half:
+                end = sents[i]
+            else:
+                i = bisect_right(words, limit) - 1
+                if i >= 0 and words[i] > start:
+                    end = words[i]
+                else:
+                    # 한도 안에 허용 경계가 없음 (한도보다 긴 엔티티) → 그 뒤 첫 경계까지 늘림
+                    i = bisect_right(words, limit)
+                    end = words[i] if i < len(words) else n
+            result.append((start, end))
+            if end >= n:
+                break
+
+            # 겹침: end 에서 overlap 만큼 앞 이후의 첫 허용 경계, 단 이전 시작보다 뒤
+            back = max(self._back(word_starts, end, self.overlap), start + 1)
+            start = words[bisect_left(words, back)]
+        return result
+
+    def split(self, record: dict) -> list[dict]:
+        text = record.get("text", "")
+        entities = record.get("entities", [])
+        spans = self.windows(text, entities)
+        if len(spans) == 1:
+            return [record]
+
+        chunks = []
+        for start, end in spans:
+            chunk_text = text[start:end].rstrip()
+            chunk_end = start + len(chunk_text)
+            chunk_ents = [[s - start, e - start, lbl] for s, e, lbl in entities
+                          if start <= s and e <= end]
+            if chunk_ents:
+                # 공백으로 끝나는 엔티티가 rstrip 에 잘리지 않도록
+                chunk_end = max(chunk_end, start + max(e for _, e, _ in chunk_ents))
+                chunk_text = text[start:chunk_end]
+            chunk = dict(record)
+            chunk["text"] = chunk_text
+            chunk["entities"] = chunk_ents
+            chunk["offset"] = start
+            chunks.append(chunk)
+        return chunks
+
+
+def chunk_file(input_path: Path, output_path: Path, splitter: WindowSplitter,
+               keep_empty: bool = False) -> None:
+    """JSONL 하나를 분할해 저장. output_path 가 input_path 와 같으면 임시 파일 후 교체."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+
+    total_in = total_out = split_records = 0
+    ents_in = ents_out = dropped_empty = over_limit = 0
+    max_out = 0
+
+    with open(input_path, encoding="utf-8") as f, open(tmp_path, "w", encoding="utf-8") as out:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = loads(line)
+            total_in += 1
+            ents_in += len(record.get("entities", []))
+
+            chunks = splitter.split(record)
+            if len(chunks) > 1:
+                split_records += 1
+            for chunk in chunks:
+                if len(chunks) > 1 and not chunk["entities"] and not keep_empty:
+                    dropped_empty += 1
+                    continue
+                length = splitter.length(chunk["text"])
+                max_out = max(max_out, length)
+                if length > splitter.max_len:
+                    over_limit += 1
+                ents_out += len(chunk["entities"])
+                out.write(dumps_line(chunk))
+                total_out += 1
+    os.replace(tmp_path, output_path)
+
+    unit = "자" if splitter.unit == "char" else "어절"
+    print(f"완료: {total_in:,}개 레코드 → {total_out:,}개 (분할 {split_records:,}건)")
+    print(f"  엔티티  : {ents_in:,} → {ents_out:,} (겹침 구간 중복 포함)")
+    print(f"  최대 길이: {max_out:,}{unit} (한도 {splitter.max_len:,}{unit})")
+    if dropped_empty:
+        print(f"  엔티티 없는 창 제외: {dropped_empty:,}개 (--keep-empty 로 유지)")
+    if over_limit:
+        print(f"  [경고] 한도보다 긴 엔티티 때문에 한도를 넘긴 창: {over_limit:,}개")
+    print(f"출력 파일: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="긴 NER 레코드를 엔티티 안전 겹침 창으로 분할")
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT,
+                        help=f"입력 JSONL (default: {DEFAULT_INPUT})")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="출력 JSONL (default: 입력 파일을 제자리에서 교체)")
+    parser.add_argument("--unit", choices=["char", "word"], default="char",
+                        help="길이 단위: char(문자) / word(공백 어절) (default: char)")
+    parser.add_argument("--max-len", type=int, default=400,
+                        help="창 최대 길이 (default: 400)")
+    parser.add_argument("--overlap", type=int, default=50,
+                        help="이웃 창 겹침 길이 (default: 50)")
+    parser.add_argument("--keep-empty", action="store_true",
+                        help="분할로 생긴 엔티티 없는 창도 출력 (기본: 제외, 변환기와 같은 기준)")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"[오류] 입력 파일이 존재하지 않습니다: {args.input}")
+        return
+    try:
+        splitter = WindowSplitter(args.max_len, args.overlap, args.unit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = args.output or args.input
+    print(f"입력: {args.input}")
+    print(f"출력: {output}")
+    chunk_file(args.input, output, splitter, args.keep_empty)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""메모리 절약형 인메모리 코퍼스 컨테이너
+
+{"text", "entities", "source"} dict 를 레코드마다 들고 있는 대신,
+모든 텍스트를 하나의 UTF-8 버퍼에, 엔티티를 병렬 int32 배열에 담습니다.
+
+  text_buf      : bytearray              모든 텍스트를 이어붙인 UTF-8 바이트
+  text_offsets  : array('Q')  [n+1]      레코드 i 텍스트 = text_buf[text_offsets[i]:text_offsets[i+1]]
+  span_offsets  : array('Q')  [n+1]      레코드 i 엔티티 = span_*[span_offsets[i]:span_offsets[i+1]]
+  span_start    : array('i')             엔티티 시작 (문자 단위, inclusive)
+  span_end      : array('i')             엔티티 끝   (문자 단위, exclusive)
+  span_label    : array('i')             엔티티 레이블 id (labels 인덱스)
+  source_codes  : array('B')  [n]        sources 인덱스
+
+레이블 id는 tag_maps/ 공통 어휘 순서를 따르고, 어휘에 없는 태그는 뒤에 추가합니다.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Iterator
+
+from label_vocab import LabelVocab, load_vocab
+
+
+class CompactCorpus:
+    """배열 기반 레코드 저장소. 레코드는 추가 순서 번호(0..n-1)로 접근합니다."""
+
+    __slots__ = (
+        "labels", "_label_ids", "sources", "_source_ids",
+        "text_buf", "text_offsets", "span_offsets",
+        "span_start", "span_end", "span_label", "source_codes",
+    )
+
+    def __init__(self, vocab: LabelVocab | None = None):
+        vocab = vocab or load_vocab()
+        self.labels: list[str] = list(vocab.labels)
+        self._label_ids: dict[str, int] = dict(vocab.label2id)
+        self.sources: list[str] = []
+        self._source_ids: dict[str, int] = {}
+
+        self.text_buf = bytearray()
+        self.text_offsets = array("Q", [0])
+        self.span_offsets = array("Q", [0])
+        self.span_start = array("i")
+        self.span_end = array("i")
+        self.span_label = array("i")
+        self.source_codes = array("B")
+
+    def __len__(self) -> int:
+        return len(self.source_codes)
+
+    # ── 추가 ────────────────────────────────────────────────────────────────
+
+    def label_id(self, label: str) -> int:
+        lid = self._label_ids.get(label)
+        if lid is None:
+            lid = self._label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        return lid
+
+    def source_id(self, source: str) -> int:
+        sid = self._source_ids.get(source)
+        if sid is None:
+            if len(self.sources) >= 256:
+                raise ValueError("source 는 최대 256개까지 지원합니다.")
+            sid = self._source_ids[source] = len(self.sources)
+            self.sources.append(source)
+        return sid
+
+    def append(self, text: str, entities: list, source: str) -> None:
+        """레코드 하나 추가. entities: [[start, end, label], ...]"""
+        self.text_buf += text.encode("utf-8")
+        self.text_offsets.append(len(self.text_buf))
+        for start, end, label in entities:
+            self.span_start.append(start)
+            self.span_end.append(end)
+            self.span_label.append(self.label_id(label))
+        self.span_offsets.append(len(self.span_start))
+        self.source_codes.append(self.source_id(source))
+
+    # ── 조회 ────────────────────────────────────────────────────────────────
+
+    def text(self, i: int) -> str:
+        return self.text_buf[self.text_offsets[i]:self.text_offsets[i + 1]].decode("utf-8")
+
+    def entity_ids(self, i: int) -> list[tuple[int, int, int]]:
+        """[(start, end, label_id), ...]"""
+        a, b = self.span_offsets[i], self.span_offsets[i + 1]
+        return list(zip(self.span_start[a:b], self.span_end[a:b], self.span_label[a:b]))
+
+    def entities(self, i: int) -> list[tuple[int, int, str]]:
+        """[(start, end, label), ...]"""
+        labels = self.labels
+        return [(s, e, labels[lid]) for s, e, lid in self.entity_ids(i)]
+
+    def source(self, i: int) -> str:
+        return self.sources[self.source_codes[i]]
+
+    def record(self, i: int) -> dict:
+        """기존 dict 포맷으로 복원 (디버깅·호환용)."""
+        return {
+            "text": self.text(i),
+            "entities": [list(e) for e in self.entities(i)],
+            "source": self.source(i),
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def used_labels(self) -> set[str]:
+        """실제 엔티티에 등장한 레이블."""
+        return {self.labels[lid] for lid in set(self.span_label)}
+
+    def nbytes(self) -> int:
+        """배열·버퍼가 차지하는 바이트 수 (대략적인 메모리 사용량)."""
+        arrays = (self.text_offsets, self.span_offsets, self.span_start,
+                  self.span_end, self.span_label, self.source_codes)
+        return len(self.text_buf) + sum(a.itemsize * len(a) for a in arrays)
+
+    # ── 셔플·분할 ────────────────────────────────────────────────────────────
+
+    def shuffled_order(self, seed: int) -> array:
+        """레코드 번호 순열. random.Random(seed).shuffle(list) 와 같은 순서."""
+        order = array("I", range(len(self)))
+        random.Random(seed).shuffle(order)
+        return order
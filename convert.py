@@ -0,0 +1,162 @@
+"""모든 소스 변환을 한 번에 실행 (<source>_convert_to_ner.py 의 SourceConverter 를 공유 프로세스 풀에서)
+
+소스를 하나씩 차례로 돌리면 전체 시간이 소스별 시간의 합이 되지만, 여기서는 모든 소스를
+--jobs 개 프로세스에 동시에 배정하므로 가장 오래 걸리는 소스 시간에 가까워집니다.
+큰 소스는 --shards 로 나눠 여러 워커에서 돌린 뒤 sharding.merge 로 합칩니다 (결과는 단일 실행과 같음).
+
+각 작업의 출력(진행·요약)은 모아 두었다가 작업이 끝나는 순서대로 출력하고, 마지막에 소스별 합계를 보여 줍니다.
+
+사용법:
+  python3 convert.py                                          # 094,208,naver,kmou 를 CPU 수만큼 동시에
+  python3 convert.py --sources 094,208 --jobs 4
+  python3 convert.py --jobs 8 --shards 094=4,208=2            # 큰 소스는 샤드로 나눠 병렬 후 병합
+  python3 convert.py --input 094=/data/094/02.라벨링데이터 --output-dir converted
+  python3 convert.py --raw-output-dir converted/raw           # converted/raw/<source> 중간 포맷도 저장
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from fs_walk import add_prefetch_args
+from ner_utils import add_normalize_args
+from sharding import merge, shard_root
+
+BASE_DIR = Path(__file__).parent
+SOURCES = ("094", "208", "naver", "kmou")
+CONVERTED_DIR = BASE_DIR / "converted"
+
+
+def load_converter(source: str):
+    """<source>_convert_to_ner.py 의 SourceConverter 클래스."""
+    sys.path.insert(0, str(BASE_DIR))
+    return importlib.import_module(f"{source}_convert_to_ner").SourceConverter
+
+
+def _parse_assignments(items: list[str] | None, cast) -> dict[str, object]:
+    """["094=4", "208=2,naver=1"] → {"094": 4, "208": 2, "naver": 1}"""
+    parsed = {}
+    for item in ",".join(items or []).split(","):
+        if not item.strip():
+            continue
+        source, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(item)
+        parsed[source.strip()] = cast(value.strip())
+    return parsed
+
+
+def _run_task(source: str, input_path: Path, output_file: Path, shard_index: int, num_shards: int,
+              options: dict) -> tuple[str, int, dict, str, float]:
+    """워커 프로세스: 소스 하나(의 샤드 하나)를 변환하고 (source, shard, stats, 출력 로그, 초) 반환."""
+    cls = load_converter(source)
+    if not cls.uses_prefetch:
+        options = {k: v for k, v in options.items() if k not in ("prefetch", "prefetch_mb")}
+    buf = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buf):
+        stats = cls(input_path, output_file, num_shards=num_shards, shard_index=shard_index, **options).run()
+    return source, shard_index, stats, buf.getvalue(), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모든 소스 NER 변환 동시 실행")
+    parser.add_argument("--sources", default=",".join(SOURCES),
+                        help=f"변환할 소스, 쉼표 구분 (default: {','.join(SOURCES)})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="동시 실행 워커 프로세스 수 (default: CPU 수)")
+    parser.add_argument("--shards", action="append", default=None, metavar="SRC=K",
+                        help="소스별 샤드 수 (예: 094=4,208=2). 샤드마다 워커 하나, 끝나면 병합")
+    parser.add_argument("--input", action="append", default=None, metavar="SRC=PATH",
+                        help="소스별 입력 경로 (default: 각 스크립트의 기본 경로)")
+    parser.add_argument("--output-dir", type=Path, default=CONVERTED_DIR,
+                        help=f"출력 디렉토리, <source>_ner_dataset.jsonl (default: {CONVERTED_DIR})")
+    parser.add_argument("--raw-output-dir", type=Path, default=None, metavar="DIR",
+                        help="원본 태그 중간 포맷도 DIR/<source> 에 저장 (샤딩한 소스에는 사용 불가)")
+    add_normalize_args(parser)
+    add_prefetch_args(parser)
+    args = parser.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in sources if s not in SOURCES]
+    if unknown:
+        parser.error(f"알 수 없는 소스: {unknown} (가능: {', '.join(SOURCES)})")
+    try:
+        shards = _parse_assignments(args.shards, int)
+        inputs = _parse_assignments(args.input, Path)
+    except ValueError as e:
+        parser.error(f"SRC=값 형식이어야 합니다: {e}")
+    if args.raw_output_dir and any(shards.get(s, 1) > 1 for s in sources):
+        parser.error("--raw-output-dir 은 --shards 로 나눈 소스와 함께 쓸 수 없습니다.")
+
+    options = {"normalize": args.normalize, "collapse_space": args.collapse_space,
+               "prefetch": args.prefetch, "prefetch_mb": args.prefetch_mb}
+    tasks = []
+    outputs: dict[str, Path] = {}
+    for source in sources:
+        cls = load_converter(source)
+        input_path = inputs.get(source, cls.default_input)
+        if not input_path.exists():
+            print(f"[건너뜀] {source}: 입력 경로가 존재하지 않습니다: {input_path}")
+            continue
+        output_file = args.output_dir / f"{source}_ner_dataset.jsonl"
+        outputs[source] = output_file
+        num_shards = shards.get(source, 1)
+        if num_shards > 1:
+            shutil.rmtree(shard_root(output_file), ignore_errors=True)   # 이전 실행의 다른 샤드 구성 정리
+        raw_output = args.raw_output_dir / source if args.raw_output_dir else None
+        for i in range(num_shards):
+            tasks.append((source, input_path, output_file, i, num_shards, {**options, "raw_output": raw_output}))
+    if not tasks:
+        return
+
+    print(f"작업 {len(tasks)}개 (소스 {len(outputs)}개), 워커 {args.jobs}개\n")
+    totals: dict[str, dict[str, int]] = {source: {} for source in outputs}
+    seconds: dict[str, float] = {source: 0.0 for source in outputs}
+    remaining = {source: shards.get(source, 1) for source in outputs}
+    failed = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(_run_task, *task): task for task in tasks}
+        for future in as_completed(futures):
+            source, _, _, shard_index, num_shards, _ = futures[future]
+            label = source if num_shards == 1 else f"{source} {shard_index + 1}/{num_shards}"
+            try:
+                _, _, stats, log, elapsed = future.result()
+            except Exception as e:
+                print(f"[{label}] 실패: {e}")
+                failed.append(label)
+                continue
+            print(f"── [{label}] {elapsed:.1f}s " + "─" * 40)
+            print(log.rstrip())
+            for name, value in stats.items():
+                totals[source][name] = totals[source].get(name, 0) + value
+            seconds[source] = max(seconds[source], elapsed)
+            remaining[source] -= 1
+            if remaining[source] == 0 and num_shards > 1:
+                merge(outputs[source])
+
+    wall = time.perf_counter() - start
+    print(f"\n  {'소스':<6} {'단위':>10} {'레코드':>12} {'건너뜀':>8} {'시간':>8}")
+    print(f"  {'-'*50}")
+    for source in outputs:
+        stats = totals[source]
+        units = stats.get("files", stats.get("sentences", 0))
+        print(f"  {source:<6} {units:>10,} {stats.get('records', 0):>12,} {stats.get('skipped', 0):>8,} "
+              f"{seconds[source]:>7.1f}s")
+    print(f"\n전체 {wall:.1f}s (소스별 시간 합 {sum(seconds.values()):.1f}s) → {args.output_dir}")
+    if failed:
+        print(f"[오류] 실패한 작업: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
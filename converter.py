@@ -0,0 +1,217 @@
+"""변환 스크립트 공통 틀 (`Converter`)
+
+소스별 스크립트(<source>_convert_to_ner.py)는 Converter 를 상속한 SourceConverter 에서
+처리 단위 목록(units)과 단위 하나의 변환(convert_unit)만 구현합니다.
+인자 파싱, 샤딩(ShardPlan), 출력 쓰기(JsonlWriter), 원본 태그 중간 포맷(--raw-output),
+오류 처리, 진행 표시, 완료 요약은 여기서 처리합니다.
+
+  class SourceConverter(Converter):
+      source = "208"
+      ...
+      def units(self):            # 이 샤드가 맡은 (정렬 키, 단위) 를 단일 노드 처리 순서로
+          ...
+      def convert_unit(self, unit, raw):
+          return [records]        # 출력 파일(outputs())마다 쓸 행 리스트
+
+  if __name__ == "__main__":
+      SourceConverter.main()
+
+모든 소스를 한 번에 돌릴 때는 convert.py 를 사용합니다.
+"""
+
+import argparse
+import contextlib
+from pathlib import Path
+from typing import Iterator
+
+from fs_walk import DEFAULT_PREFETCH_MB, DEFAULT_WORKERS, Prefetcher, add_prefetch_args, walk_files
+from jsonl_writer import JsonlWriter
+from ner_utils import add_normalize_args
+from raw_corpus import RawCorpusWriter, add_raw_output_arg
+from sharding import ShardPlan, add_shard_args
+
+
+class Converter:
+    """소스 하나의 변환 실행. 하위 클래스가 클래스 속성과 units / convert_unit 을 채움."""
+
+    source = ""                  # tag_maps 이름 겸 raw corpus source
+    description = ""             # argparse 설명
+    default_input: Path
+    default_output: Path
+    input_help = "입력 디렉토리"
+    unit_name = "파일"           # 진행·요약 출력의 단위 이름
+    unit_stat = "files"          # stats.json 의 단위 수 키
+    progress_every = 1000        # 단위 N개마다 진행 출력 (0 이면 안 함)
+    uses_prefetch = False        # 입력 파일을 fs_walk.Prefetcher 로 미리 읽는지 (--prefetch 인자)
+    raw_key_type = "str"
+    raw_with_ids = False
+
+    def __init__(self, input_path: Path, output_file: Path, num_shards: int = 1, shard_index: int = 0,
+                 normalize: str | None = None, collapse_space: bool = False,
+                 raw_output: Path | None = None,
+                 prefetch: int = DEFAULT_WORKERS, prefetch_mb: int = DEFAULT_PREFETCH_MB):
+        self.input_path = Path(input_path)
+        self.output_file = Path(output_file)
+        self.normalize = normalize
+        self.collapse_space = collapse_space
+        self.raw_output = raw_output
+        self.prefetch = prefetch
+        self.prefetch_mb = prefetch_mb
+        self.plan = ShardPlan(self.output_file, num_shards, shard_index)
+        self.reader: Prefetcher | None = None
+        self.stats: dict[str, int] = {}
+
+    # ── 하위 클래스 구현 ─────────────────────────────────────────────────────
+
+    def output_suffixes(self) -> list[str]:
+        """본 출력 외 함께 쓰는 JSONL (출력 stem 뒤에 붙는 이름). convert_unit 반환 순서와 같음."""
+        return []
+
+    def units(self) -> Iterator[tuple[list, object]]:
+        """이 샤드가 맡은 (정렬 키, 단위). 정렬 키는 단일 노드 처리 순서 (샤드 병합에 사용)."""
+        raise NotImplementedError
+
+    def convert_unit(self, unit, raw: list | None) -> list[list]:
+        """단위 하나 → 출력 파일별 행 리스트. raw 가 있으면 (text, 원본 스팬[, 문장 id]) 를 추가."""
+        raise NotImplementedError
+
+    def unit_label(self, unit) -> str:
+        """오류 메시지에 쓸 단위 이름."""
+        return str(unit)
+
+    def prepare(self) -> None:
+        """출력 파일을 열기 전 준비 (이전 실행 부산물 정리 등)."""
+
+    def finish(self) -> None:
+        """출력 파일을 닫은 뒤 마무리 (집계 파일 저장 등)."""
+
+    def report(self) -> list[str]:
+        """완료 요약 뒤에 덧붙일 줄."""
+        return []
+
+    # ── 공통 처리 ───────────────────────────────────────────────────────────
+
+    def outputs(self) -> list[str]:
+        stem = self.output_file.stem
+        return [self.output_file.name] + [stem + suffix for suffix in self.output_suffixes()]
+
+    def output_path(self, name: str | None = None) -> Path:
+        """본 출력(또는 같은 디렉토리의 name)의 이 샤드 경로."""
+        return self.plan.path(self.output_file.with_name(name or self.output_file.name))
+
+    def manifest(self) -> Path:
+        """입력 파일 목록 캐시: 디렉토리 mtime 이 그대로면 다음 실행은 탐색 생략."""
+        path = self.output_path()
+        return path.with_name(path.stem + "_files.json")
+
+    def walk(self, suffix: str) -> Iterator[tuple[list, tuple[Path, bytes | None]]]:
+        """입력 디렉토리의 이 샤드 몫 파일을 (상대 경로 구성요소, (경로, 미리 읽은 바이트)) 로.
+
+        상대 경로 해시로 샤드를 나누고, 파일은 prefetch 개 스레드로 prefetch_mb MB 까지 미리 읽음.
+        """
+        root = self.input_path
+        owned = (p for p in walk_files(root, suffix, manifest=self.manifest())
+                 if self.plan.owns(p.relative_to(root).as_posix()))
+        self.reader = Prefetcher(owned, self.prefetch, self.prefetch_mb << 20)
+        for path, content in self.reader:
+            yield path.relative_to(root).as_posix().split("/"), (path, content)
+
+    def run(self) -> dict[str, int]:
+        """변환 실행. 단위·레코드·건너뜀 수 등 stats 반환."""
+        plan = self.plan
+        names = self.outputs()
+        paths = [self.output_path(name) for name in names]
+        paths[0].parent.mkdir(parents=True, exist_ok=True)
+        self.prepare()
+        plan.begin()
+
+        raw_writer = (RawCorpusWriter(self.raw_output, self.source, self.raw_key_type, self.raw_with_ids)
+                      if self.raw_output else None)
+        raw: list | None = [] if raw_writer else None
+        units = records = skipped = 0
+
+        with contextlib.ExitStack() as stack:
+            writers = [stack.enter_context(JsonlWriter(path)) for path in paths]
+            for key, unit in self.units():
+                units += 1
+                try:
+                    rows = self.convert_unit(unit, raw)
+                except Exception as e:
+                    print(f"  [오류] {self.unit_label(unit)}: {e}")
+                    skipped += 1
+                    if raw:
+                        raw.clear()
+                    continue
+                if raw:
+                    for text, spans, *sid in raw:
+                        if spans:
+                            raw_writer.append(text, spans, *sid)
+                    raw.clear()
+
+                for writer, part in zip(writers, rows):
+                    writer.write_many(part)
+                if any(rows):
+                    plan.record(key, dict(zip(names, map(len, rows))))
+                records += len(rows[0])
+
+                if self.progress_every and units % self.progress_every == 0:
+                    print(f"  {units:,}개 {self.unit_name} 처리 완료 ({records:,}개 레코드)...")
+
+        self.stats = {self.unit_stat: units, "records": records, "skipped": skipped, **self.stats}
+        plan.finish(self.stats, names)
+        self.finish()
+        if self.reader is not None:
+            print(self.reader.summary())
+        print(f"\n완료: {units:,}개 {self.unit_name} → {records:,}개 레코드 (건너뜀: {skipped}개)")
+        for line in self.report():
+            print(line)
+        print(f"출력 파일: {paths[0]}")
+        if raw_writer:
+            raw_writer.close()
+            print(f"원본 태그 중간 포맷: {self.raw_output} ({raw_writer.records:,}개 레코드)")
+        return self.stats
+
+    # ── CLI ─────────────────────────────────────────────────────────────────
+
+    @classmethod
+    def make_parser(cls) -> argparse.ArgumentParser:
+        """--input / --output 과 공통 인자(정규화·샤딩·중간 포맷·미리 읽기)를 갖춘 parser."""
+        parser = argparse.ArgumentParser(description=cls.description)
+        parser.add_argument("--input", type=Path, default=cls.default_input,
+                            help=f"{cls.input_help} (default: {cls.default_input})")
+        parser.add_argument("--output", type=Path, default=cls.default_output,
+                            help=f"출력 JSONL 파일 (default: {cls.default_output})")
+        add_normalize_args(parser)
+        add_shard_args(parser)
+        add_raw_output_arg(parser)
+        if cls.uses_prefetch:
+            add_prefetch_args(parser)
+        return parser
+
+    @classmethod
+    def check_args(cls, parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+        if args.raw_output and args.num_shards > 1:
+            parser.error("--raw-output 은 샤딩(--num-shards > 1)과 함께 쓸 수 없습니다.")
+
+    @classmethod
+    def options(cls, args: argparse.Namespace) -> dict:
+        """parse 결과 → 생성자 키워드 인자. 하위 클래스가 전용 옵션을 덧붙임."""
+        options = {"num_shards": args.num_shards, "shard_index": args.shard_index,
+                   "normalize": args.normalize, "collapse_space": args.collapse_space,
+                   "raw_output": args.raw_output}
+        if cls.uses_prefetch:
+            options.update(prefetch=args.prefetch, prefetch_mb=args.prefetch_mb)
+        return options
+
+    @classmethod
+    def main(cls, args: argparse.Namespace | None = None) -> dict[str, int] | None:
+        if args is None:
+            parser = cls.make_parser()
+            args = parser.parse_args()
+            cls.check_args(parser, args)
+        if not args.input.exists():
+            print(f"[오류] 입력 경로가 존재하지 않습니다: {args.input}")
+            return None
+        print(f"입력: {args.input}")
+        print(f"출력: {args.output}")
+        return cls(args.input, args.output, **cls.options(args)).run()
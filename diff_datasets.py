@@ -9,18 +9,45 @@ diff_datasets.py
         --original data/ner_dataset.jsonl \
         --cleaned  data/ner_dataset_clean.jsonl \
         --output   data/diff_entities.jsonl
+
+    # 레코드 구간만 비교 (.idx 사이드카로 해당 위치부터 바로 읽음)
+    python data_prepare/diff_datasets.py --original A.jsonl --cleaned B.jsonl \
+        --start 500000 --stop 600000
 """
 
 import argparse
-import json
 from pathlib import Path
 
+from fast_json import dumps_line, loads
+from prepare_hf_dataset import JsonlIndex
+
+
+def _iter_pairs(orig_path: Path, clean_path: Path, start: int | None, stop: int | None):
+    """(line_no, orig_obj, clean_obj) 를 순서대로 생성."""
+    if start is None and stop is None:
+        with open(orig_path, encoding="utf-8") as fo, \
+             open(clean_path, encoding="utf-8") as fc:
+            for line_no, (lo, lc) in enumerate(zip(fo, fc), start=1):
+                lo, lc = lo.strip(), lc.strip()
+                if not lo or not lc:
+                    continue
+                yield line_no, loads(lo), loads(lc)
+        return
+
+    with JsonlIndex(orig_path) as idx_o, JsonlIndex(clean_path) as idx_c:
+        start = start or 0
+        pairs = zip(idx_o.iter_range(start, stop), idx_c.iter_range(start, stop))
+        for line_no, (orig_obj, clean_obj) in enumerate(pairs, start=start + 1):
+            yield line_no, orig_obj, clean_obj
+
 
 def main():
     parser = argparse.ArgumentParser(description="두 JSONL 엔티티 비교")
     parser.add_argument("--original", required=True, help="원본 JSONL")
     parser.add_argument("--cleaned",  required=True, help="클린 JSONL")
     parser.add_argument("--output",   help="차이 결과 저장 JSONL (생략 시 출력만)")
+    parser.add_argument("--start", type=int, default=None, help="비교 시작 레코드 번호 (0-based)")
+    parser.add_argument("--stop",  type=int, default=None, help="비교 종료 레코드 번호 (exclusive)")
     args = parser.parse_args()
 
     orig_path  = Path(args.original)
@@ -30,42 +57,32 @@ def main():
     total_changed = 0
     label_stats = {}
 
-    with open(orig_path, encoding="utf-8") as fo, \
-         open(clean_path, encoding="utf-8") as fc:
-
-        for line_no, (lo, lc) in enumerate(zip(fo, fc), start=1):
-            lo, lc = lo.strip(), lc.strip()
-            if not lo or not lc:
-                continue
-
-            orig_obj  = json.loads(lo)
-            clean_obj = json.loads(lc)
-
-            orig_ents  = orig_obj.get("entities", [])
-            clean_ents = clean_obj.get("entities", [])
-            text       = orig_obj.get("text", "")
-
-            changed = []
-            for oe, ce in zip(orig_ents, clean_ents):
-                if oe != ce:
-                    label = oe[2]
-                    before_text = text[oe[0]:oe[1]]
-                    after_text  = text[ce[0]:ce[1]]
-                    changed.append({
-                        "label":  label,
-                        "before": before_text,
-                        "after":  after_text,
-                    })
-                    label_stats.setdefault(label, 0)
-                    label_stats[label] += 1
-                    total_changed += 1
-
-            if changed:
-                diffs.append({
-                    "line":    line_no,
-                    "text":    text,
-                    "changes": changed,
+    for line_no, orig_obj, clean_obj in _iter_pairs(orig_path, clean_path, args.start, args.stop):
+        orig_ents  = orig_obj.get("entities", [])
+        clean_ents = clean_obj.get("entities", [])
+        text       = orig_obj.get("text", "")
+
+        changed = []
+        for oe, ce in zip(orig_ents, clean_ents):
+            if oe != ce:
+                label = oe[2]
+                before_text = text[oe[0]:oe[1]]
+                after_text  = text[ce[0]:ce[1]]
+                changed.append({
+                    "label":  label,
+                    "before": before_text,
+                    "after":  after_text,
                 })
+                label_stats.setdefault(label, 0)
+                label_stats[label] += 1
+                total_changed += 1
+
+        if changed:
+            diffs.append({
+                "line":    line_no,
+                "text":    text,
+                "changes": changed,
+            })
 
     # 출력
     print(f"\n{'='*60}")
@@ -94,7 +111,7 @@ def main():
         out_path = Path(args.output)
         with open(out_path, "w", encoding="utf-8") as fw:
             for d in diffs:
-                fw.write(json.dumps(d, ensure_ascii=False) + "\n")
+                fw.write(dumps_line(d))
         print(f"\n저장 완료: {out_path}  ({len(diffs):,} 줄)")
 
 
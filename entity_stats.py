@@ -1,28 +1,46 @@
-"""converted/ 폴더의 JSONL 파일에서 엔티티 타입 통계를 출력하는 스크립트"""
+"""converted/ 폴더의 JSONL 파일에서 엔티티 타입 통계를 출력하는 스크립트
 
-import json
+사용법:
+  python3 entity_stats.py                 # 전체 집계
+  python3 entity_stats.py --sample 10000  # 파일별 균등 표본 10,000건으로 빠르게 추정
+"""
+
+import argparse
 from collections import defaultdict
 from pathlib import Path
 
+from fast_json import loads
+from prepare_hf_dataset import JsonlIndex
+
 CONVERTED_DIR = Path(__file__).parent / "converted"
 
-def count_entities(jsonl_path: Path):
-    entity_counts = defaultdict(int)
-    sentence_count = 0
-    sentence_with_entity = 0
 
+def _iter_records(jsonl_path: Path, sample: int | None, seed: int):
+    if sample:
+        # .idx 사이드카로 전체를 읽지 않고 표본만 조회
+        with JsonlIndex(jsonl_path) as idx:
+            yield from idx.sample(sample, seed=seed)
+        return
     with open(jsonl_path, encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            data = json.loads(line)
-            sentence_count += 1
-            entities = data.get("entities", [])
-            if entities:
-                sentence_with_entity += 1
-            for ent in entities:
-                entity_counts[ent[2]] += 1
+            yield loads(line)
+
+
+def count_entities(jsonl_path: Path, sample: int | None = None, seed: int = 42):
+    entity_counts = defaultdict(int)
+    sentence_count = 0
+    sentence_with_entity = 0
+
+    for data in _iter_records(jsonl_path, sample, seed):
+        sentence_count += 1
+        entities = data.get("entities", [])
+        if entities:
+            sentence_with_entity += 1
+        for ent in entities:
+            entity_counts[ent[2]] += 1
 
     return sentence_count, sentence_with_entity, dict(entity_counts)
 
@@ -44,9 +62,17 @@ def print_stats(name, sentence_count, sentence_with_entity, entity_counts):
 
 
 def main():
-    files = sorted(CONVERTED_DIR.glob("*.jsonl"))
+    parser = argparse.ArgumentParser(description="converted JSONL 엔티티 통계")
+    parser.add_argument("--dir", type=Path, default=CONVERTED_DIR,
+                        help=f"JSONL 디렉토리 (default: {CONVERTED_DIR})")
+    parser.add_argument("--sample", type=int, default=None, metavar="N",
+                        help="파일별 균등 표본 N건만 집계 (.idx 사이드카 사용)")
+    parser.add_argument("--seed", type=int, default=42, help="표본 시드 (default: 42)")
+    args = parser.parse_args()
+
+    files = sorted(args.dir.glob("*.jsonl"))
     if not files:
-        print("converted/ 폴더에 JSONL 파일이 없습니다.")
+        print(f"{args.dir} 폴더에 JSONL 파일이 없습니다.")
         return
 
     all_entity_counts = defaultdict(int)
@@ -54,8 +80,9 @@ def main():
     all_with_entity = 0
 
     for path in files:
-        sc, swe, ec = count_entities(path)
-        print_stats(path.name, sc, swe, ec)
+        sc, swe, ec = count_entities(path, args.sample, args.seed)
+        name = path.name + (f" (표본 {sc:,}건)" if args.sample else "")
+        print_stats(name, sc, swe, ec)
         all_sentences += sc
         all_with_entity += swe
         for tag, cnt in ec.items():
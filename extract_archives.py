@@ -0,0 +1,205 @@
+"""
+AIHub 압축 파일(*.zip) 병렬·재개형 압축 해제 스크립트 (unzip.sh 대체)
+
+동작:
+  - ROOT 아래 모든 *.zip 을 찾아 `<zip 위치>/<zip 이름>/` 에 해제 (unzip.sh 와 같은 배치)
+  - 아카이브와 멤버를 스레드 풀에서 동시에 해제
+  - 파일명 디코딩: UTF-8 플래그가 있으면 UTF-8, 없으면 UTF-8 → CP949 순으로 시도
+  - 디스크에 같은 크기·CRC 파일이 이미 있으면 건너뜀
+    (manifest의 size/mtime이 일치하면 CRC 재계산도 생략)
+  - 아카이브별 `.extract_manifest.json` 에 해제 결과 기록
+  - 다운로드가 덜 된(손상된) 아카이브는 오류만 출력하고 넘어감 → 다시 실행하면 새 것만 해제
+
+사용법:
+  python3 extract_archives.py [ROOT] [--jobs N] [--force]
+
+기본값:
+  ROOT   : 이 스크립트가 있는 디렉토리
+  --jobs : 8
+"""
+
+import argparse
+import json
+import os
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+
+MANIFEST_NAME = ".extract_manifest.json"
+_UTF8_FLAG = 0x800
+_CHUNK = 1 << 20
+
+
+def decode_member_name(info: zipfile.ZipInfo) -> str:
+    """ZipInfo 파일명을 올바른 인코딩으로 복원.
+
+    zipfile은 UTF-8 플래그가 없는 이름을 CP437로 디코딩하므로,
+    원래 바이트로 되돌린 뒤 UTF-8 → CP949 순으로 다시 디코딩한다.
+    """
+    if info.flag_bits & _UTF8_FLAG:
+        return info.filename
+    try:
+        raw = info.filename.encode("cp437")
+    except UnicodeEncodeError:
+        return info.filename
+    for encoding in ("utf-8", "cp949"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return info.filename
+
+
+def _file_crc(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _load_manifest(dest_dir: Path) -> dict:
+    try:
+        with open(dest_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f).get("members", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(dest_dir: Path, zip_path: Path, members: dict) -> None:
+    st = zip_path.stat()
+    tmp = dest_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "archive": zip_path.name,
+            "archive_size": st.st_size,
+            "archive_mtime_ns": st.st_mtime_ns,
+            "members": members,
+        }, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, dest_dir / MANIFEST_NAME)
+
+
+def _is_up_to_date(dest: Path, info: zipfile.ZipInfo, entry: list | None) -> bool:
+    """디스크 파일이 멤버와 같은 크기·CRC인지 확인."""
+    try:
+        st = dest.stat()
+    except FileNotFoundError:
+        return False
+    if st.st_size != info.file_size:
+        return False
+    # manifest 기록과 크기·mtime이 같으면 CRC 계산 생략
+    if entry and entry == [info.file_size, info.CRC, st.st_mtime_ns]:
+        return True
+    return _file_crc(dest) == info.CRC
+
+
+def _extract_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".part")
+    with zf.open(info) as src, open(tmp, "wb") as out:
+        while chunk := src.read(_CHUNK):
+            out.write(chunk)
+    os.replace(tmp, dest)
+
+
+def extract_archive(zip_path: Path, pool: ThreadPoolExecutor, force: bool = False) -> tuple[int, int]:
+    """아카이브 하나를 해제. (해제한 멤버 수, 건너뛴 멤버 수) 반환."""
+    dest_dir = zip_path.parent / zip_path.stem
+    dest_root = dest_dir.resolve()
+    manifest = {} if force else _load_manifest(dest_dir)
+    new_manifest: dict[str, list] = {}
+    lock = threading.Lock()
+    extracted = skipped = 0
+
+    with zipfile.ZipFile(zip_path) as zf:
+        jobs = []
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            name = decode_member_name(info)
+            dest = dest_dir / name
+            # zip slip 방어
+            if not dest.resolve().is_relative_to(dest_root):
+                print(f"  [경고] {zip_path.name}: 경로 이탈 멤버 무시 → {name}")
+                continue
+            jobs.append((info, name, dest))
+
+        def run(job):
+            nonlocal extracted, skipped
+            info, name, dest = job
+            if not force and _is_up_to_date(dest, info, manifest.get(name)):
+                done = False
+            else:
+                _extract_member(zf, info, dest)
+                done = True
+            entry = [info.file_size, info.CRC, dest.stat().st_mtime_ns]
+            with lock:
+                new_manifest[name] = entry
+                if done:
+                    extracted += 1
+                else:
+                    skipped += 1
+
+        # 멤버 단위로 같은 풀에 제출 (ZipFile 읽기는 내부 잠금으로 스레드 안전)
+        for future in [pool.submit(run, job) for job in jobs]:
+            future.result()
+
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    _save_manifest(dest_dir, zip_path, new_manifest)
+    return extracted, skipped
+
+
+def extract_all(root: Path, jobs: int, force: bool = False) -> None:
+    zip_paths = sorted(root.rglob("*.zip"))
+    if not zip_paths:
+        print(f"[오류] *.zip 파일을 찾을 수 없습니다: {root}")
+        return
+
+    total_extracted = total_skipped = failed = 0
+
+    # 아카이브용 풀과 멤버용 풀을 분리해 아카이브 스레드가 멤버 작업을 기다리다 막히지 않게 함
+    with ThreadPoolExecutor(max_workers=jobs) as member_pool, \
+         ThreadPoolExecutor(max_workers=min(jobs, len(zip_paths))) as archive_pool:
+        futures = {
+            zip_path: archive_pool.submit(extract_archive, zip_path, member_pool, force)
+            for zip_path in zip_paths
+        }
+        for zip_path, future in futures.items():
+            try:
+                extracted, skipped = future.result()
+            except (zipfile.BadZipFile, OSError) as e:
+                print(f"  [오류] {zip_path.name}: {e}")
+                failed += 1
+                continue
+            total_extracted += extracted
+            total_skipped += skipped
+            print(f"  압축해제: {zip_path.stem} ({extracted}개 해제, {skipped}개 최신)")
+
+    print(f"\n완료: 아카이브 {len(zip_paths)}개 → {total_extracted}개 해제, "
+          f"{total_skipped}개 건너뜀 (실패: {failed}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIHub zip 병렬·재개형 압축 해제")
+    parser.add_argument("root", nargs="?", type=Path, default=BASE_DIR,
+                        help=f"*.zip 탐색 루트 (default: {BASE_DIR})")
+    parser.add_argument("--jobs", type=int, default=8,
+                        help="동시 작업 스레드 수 (default: 8)")
+    parser.add_argument("--force", action="store_true",
+                        help="기존 파일·manifest 무시하고 전부 다시 해제")
+    args = parser.parse_args()
+
+    if not args.root.exists():
+        print(f"[오류] 입력 경로가 존재하지 않습니다: {args.root}")
+        return
+
+    print(f"루트: {args.root}")
+    extract_all(args.root, args.jobs, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""JSONL 직렬화 공통 계층: msgspec / orjson 이 있으면 사용하고 없으면 표준 json
+
+- loads / dumps / dumps_line : 레코드 한 줄 읽기·쓰기. 출력은 어느 백엔드든 같은 바이트
+                               (공백 없는 구분자, 비ASCII 그대로, 키 순서 유지)
+                               파싱 오류는 DecodeError (ValueError 하위)
+- decode_094 / decode_208    : AIHub 입력 JSON 디코딩. msgspec 이면 변환에 쓰는 필드만 담은
+                               스키마(TypedDict)로 디코딩해 docu_info 의 다른 필드 등은 만들지 않음.
+                               다른 백엔드는 전체를 dict 로 읽음 (반환 모양은 같음).
+                               스키마와 타입이 다른 파일(예상 밖 타입 등)은 스키마 없이 다시 읽어
+                               어느 백엔드든 같은 결과
+
+백엔드는 msgspec → orjson → json 순으로 고르며, 환경 변수 NER_JSON_BACKEND=json|orjson|msgspec 로 고정할 수 있습니다.
+meta.json·리포트처럼 들여쓰기한 JSON 은 표준 json 을 그대로 씁니다.
+
+백엔드 간 결과 확인 (설치된 백엔드마다 별도 프로세스에서 094/208 convert_file 을 돌려 비교):
+  python3 fast_json.py check                                 # null·float 등이 섞인 내장 샘플
+  python3 fast_json.py check 094:a.json 208:b.json           # 실제 입력 파일 추가
+"""
+
+import json
+import os
+from typing import Any, TypedDict
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+def _pick_backend() -> str:
+    wanted = os.environ.get("NER_JSON_BACKEND")
+    if wanted and wanted not in BACKENDS:
+        raise ValueError(f"NER_JSON_BACKEND 는 {BACKENDS} 중 하나: {wanted!r}")
+    for name in (wanted,) if wanted else BACKENDS:
+        if name == "json":
+            return name
+        try:
+            __import__(name)
+            return name
+        except ImportError:
+            if wanted:
+                raise
+    return "json"
+
+
+BACKEND = _pick_backend()
+
+
+# ── 입력 스키마 (변환에 쓰는 필드만) ─────────────────────────────────────────
+
+class Annotation094(TypedDict, total=False):
+    TagText: str | None
+    Tagclass: str | None
+    TagCode: str | None
+    startPos: int | None
+    endPos: int | None
+
+
+class Sentence094(TypedDict, total=False):
+    sentence: str | None
+    annotations: list[Annotation094] | None
+
+
+class DocuInfo094(TypedDict, total=False):
+    sentences: list[Sentence094] | None
+
+
+class Doc094(TypedDict, total=False):
+    docu_info: DocuInfo094 | None
+
+
+class Tag208(TypedDict, total=False):
+    Keyword: str | None
+    Type: int | float | str | None
+
+
+class Doc208(TypedDict, total=False):
+    explain: str | None
+    taglist: list[Tag208] | None
+
+
+# ── 백엔드별 구현 ───────────────────────────────────────────────────────────
+
+if BACKEND == "msgspec":
+    import msgspec
+
+    DecodeError = msgspec.DecodeError
+    _encode = msgspec.json.Encoder().encode
+    loads = msgspec.json.Decoder().decode
+
+    def _typed(schema):
+        decode = msgspec.json.Decoder(schema).decode
+
+        def typed(content: bytes) -> dict:
+            try:
+                return decode(content)
+            except msgspec.ValidationError:
+                # 스키마와 타입이 다른 파일은 다른 백엔드와 같은 dict 로 (파일 전체를 오류로 만들지 않음)
+                return loads(content)
+        return typed
+
+    _decode_094 = _typed(Doc094)
+    _decode_208 = _typed(Doc208)
+
+    def dumps(obj: Any) -> str:
+        return _encode(obj).decode("utf-8")
+
+elif BACKEND == "orjson":
+    import orjson
+
+    DecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+    _decode_094 = _decode_208 = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+else:
+    DecodeError = json.JSONDecodeError
+    loads = json.loads
+    _decode_094 = _decode_208 = json.loads
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj: Any) -> str:
+        return _encoder.encode(obj)
+
+
+def dumps_line(obj: Any) -> str:
+    """JSONL 한 줄 (줄바꿈 포함)."""
+    return dumps(obj) + "\n"
+
+
+def decode_094(content: bytes) -> dict:
+    """AIHub 094 파일 → {"docu_info": {"sentences": [{"sentence", "annotations": [...]}]}}"""
+    return _decode_094(content)
+
+
+def decode_208(content: bytes) -> dict:
+    """AIHub 208 파일 → {"explain", "taglist": [{"Keyword", "Type"}]}"""
+    return _decode_208(content)
+
+
+# ── 백엔드 간 결과 확인 ─────────────────────────────────────────────────────
+
+# 스키마와 타입이 다른 값(null, float Type 등)이 섞인 입력
+_CHECK_SAMPLES = {
+    "094": {"docu_info": {"title": None, "sentences": [
+        {"sentence": "서울에 갔다", "annotations": [
+            {"TagText": None, "Tagclass": "O", "TagCode": "LC", "startPos": 0, "endPos": 1},
+            {"TagText": "서울", "Tagclass": None, "TagCode": None, "startPos": 0, "endPos": 1},
+            {"TagText": "서울", "Tagclass": "O", "TagCode": "LC", "startPos": None, "endPos": 1}]},
+        {"sentence": None, "annotations": None},
+        {"sentence": "부산에서 홍길동을 만났다", "annotations": [
+            {"TagText": "부산", "Tagclass": "O", "TagCode": "LC", "startPos": 0, "endPos": 1},
+            {"TagText": "홍길동", "Tagclass": "O", "TagCode": "PS", "startPos": 4.0, "endPos": 6}]}]}},
+    "208": {"explain": "조선 경복궁 이순신", "taglist": [
+        {"Keyword": "조선", "Type": 0.0}, {"Keyword": None, "Type": 1},
+        {"Keyword": "경복궁", "Type": "1"}, {"Keyword": "이순신", "Type": None}, {"Keyword": "이순신", "Type": 3}]},
+}
+
+_CHECK_CHILD = r"""
+import importlib, sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from fast_json import dumps_line
+for item in sys.argv[2:]:
+    kind, _, path = item.partition(":")
+    try:
+        out = importlib.import_module(f"{kind}_convert_to_ner").convert_file(Path(path))
+    except Exception as e:
+        out = f"error: {type(e).__name__}"
+    sys.stdout.write(dumps_line([kind, out]))
+"""
+
+
+def check(files: list[str]) -> bool:
+    """설치된 백엔드마다 094/208 convert_file 결과를 만들어 모두 같은지 확인."""
+    import subprocess
+    import sys
+    import tempfile
+    from pathlib import Path
+
+    here = str(Path(__file__).resolve().parent)
+    with tempfile.TemporaryDirectory() as tmp:
+        items = []
+        for kind, doc in _CHECK_SAMPLES.items():
+            path = Path(tmp) / f"{kind}_sample.json"
+            path.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+            items.append(f"{kind}:{path}")
+        items += files
+        outputs = {}
+        for name in BACKENDS:
+            env = {**os.environ, "NER_JSON_BACKEND": name}
+            proc = subprocess.run([sys.executable, "-c", _CHECK_CHILD, here, *items],
+                                  env=env, capture_output=True, text=True)
+            if proc.returncode:
+                print(f"  {name:<8} 건너뜀 ({proc.stderr.strip().splitlines()[-1]})")
+                continue
+            outputs[name] = proc.stdout.splitlines()
+    ok = True
+    base_name, base = next(iter(outputs.items()))
+    for name, lines in outputs.items():
+        diff = [item for item, a, b in zip(items, base, lines) if a != b]
+        ok &= not diff and len(lines) == len(base)
+        print(f"  {name:<8} " + ("같음" if name == base_name or not diff else f"다름 (기준 {base_name}): {diff}"))
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    ap = argparse.ArgumentParser(description="JSON 백엔드 간 094/208 변환 결과 비교")
+    ap.add_argument("command", choices=["check"])
+    ap.add_argument("files", nargs="*", metavar="SRC:PATH", help="추가로 비교할 입력 (예: 094:a.json)")
+    args = ap.parse_args()
+    print(f"백엔드 비교 (현재 {BACKEND}):")
+    sys.exit(0 if check(args.files) else 1)
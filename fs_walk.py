@@ -0,0 +1,274 @@
+"""os.scandir 기반 병렬 디렉토리 워커 + 파일 목록 manifest
+
+`sorted(input_dir.rglob("*.json"))` 는 전체 트리를 훑고 정렬이 끝나야 첫 파일이 나오며,
+네트워크 파일시스템에서는 이 단계만 수 분이 걸립니다.
+
+walk_files():
+  - 디렉토리 목록 조회(os.scandir)를 스레드 풀에서 미리 진행 (하위 디렉토리를 찾는 즉시 예약)
+  - 이름순 깊이 우선으로 경로를 바로바로 내보냄
+    → sorted(rglob(...)) 과 같은 순서 (경로 구성요소 사전순)
+  - manifest 를 주면 탐색 결과(파일 목록 + 디렉토리 mtime)를 저장하고,
+    다음 실행에서 디렉토리 mtime 이 모두 같으면 탐색 없이 manifest 목록을 사용
+
+Prefetcher:
+  - 작은 파일이 많을 때 파일마다 open 지연이 파싱보다 길어지므로,
+    다음 파일들의 바이트를 스레드 풀에서 미리 읽어 두고 입력 순서대로 내보냄
+  - 경로 목록 소비·읽기 예약은 별도 스레드가 맡아 파서는 파일시스템을 기다리지 않음
+  - 미리 읽어 둔(아직 소비되지 않은) 바이트가 max_bytes 를 넘으면 예약을 멈춤
+  - stats 로 큐 깊이·소비자 대기 횟수/시간을 확인
+
+사용 예:
+    for path in walk_files(input_dir, ".json", manifest=out.with_name("094_files.json")):
+        ...
+
+    reader = Prefetcher(walk_files(input_dir, ".json"))
+    for path, content in reader:      # content: bytes, 읽기 실패 시 None
+        ...
+    print(reader.summary())
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_WORKERS = 16
+DEFAULT_PREFETCH_MB = 64
+_PREFETCH_DEPTH = 4   # 스레드당 예약해 둘 파일 수
+
+
+class _Scanner:
+    """디렉토리 하나를 읽고, 찾은 하위 디렉토리 조회를 즉시 풀에 예약."""
+
+    def __init__(self, pool: ThreadPoolExecutor):
+        self.pool = pool
+        self.futures: dict[str, Future] = {}
+
+    def submit(self, path: str) -> None:
+        try:
+            self.futures[path] = self.pool.submit(self._scan, path)
+        except RuntimeError:
+            pass  # 소비자가 중간에 멈춰 풀이 닫힌 경우
+
+    def _scan(self, path: str) -> tuple[int, list[tuple[str, bool]]]:
+        # 목록보다 mtime 을 먼저 읽어야 조회 중 변경이 다음 실행에서 감지됨
+        mtime_ns = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            entries = sorted((entry.name, entry.is_dir()) for entry in it)
+        # 부모 결과가 반환되기 전에 자식 future 를 등록 → 소비자가 항상 찾을 수 있음
+        for name, is_dir in entries:
+            if is_dir:
+                self.submit(os.path.join(path, name))
+        return mtime_ns, entries
+
+
+def _load_manifest(manifest: Path, root: Path, suffix: str, pool: ThreadPoolExecutor) -> list[str] | None:
+    """manifest 가 유효하면 상대 경로 목록, 아니면 None."""
+    try:
+        with open(manifest, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("root") != str(root) or data.get("suffix") != suffix:
+        return None
+
+    dirs: dict[str, int] = data.get("dirs", {})
+
+    def unchanged(item: tuple[str, int]) -> bool:
+        rel, mtime_ns = item
+        try:
+            return os.stat(root / rel).st_mtime_ns == mtime_ns
+        except OSError:
+            return False
+
+    if not dirs or not all(pool.map(unchanged, dirs.items())):
+        return None
+    return data.get("files", [])
+
+
+def _save_manifest(manifest: Path, root: Path, suffix: str,
+                   dirs: dict[str, int], files: list[str]) -> None:
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest.with_name(manifest.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"root": str(root), "suffix": suffix, "dirs": dirs, "files": files},
+                  f, ensure_ascii=False)
+    os.replace(tmp, manifest)
+
+
+def walk_files(
+    root: Path,
+    suffix: str = ".json",
+    manifest: Path | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[Path]:
+    """root 아래 suffix 로 끝나는 파일을 sorted(rglob) 순서로 스트리밍.
+
+    Parameters
+    ----------
+    root     : 탐색 루트
+    suffix   : 파일명 접미사 (예: ".json")
+    manifest : 파일 목록 캐시 경로. None이면 캐시하지 않음
+    workers  : 디렉토리 조회 스레드 수
+    """
+    root = Path(root)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        if manifest is not None:
+            cached = _load_manifest(manifest, root, suffix, pool)
+            if cached is not None:
+                print(f"  [manifest] 디렉토리 변경 없음 → 파일 {len(cached):,}개 목록 재사용")
+                for rel in cached:
+                    yield root / rel
+                return
+
+        scanner = _Scanner(pool)
+        scanner.submit(str(root))
+        dirs: dict[str, int] = {}
+        files: list[str] = []
+
+        def visit(path: str, rel: str) -> Iterator[Path]:
+            mtime_ns, entries = scanner.futures.pop(path).result()
+            dirs[rel or "."] = mtime_ns
+            for name, is_dir in entries:
+                child_rel = f"{rel}/{name}" if rel else name
+                if is_dir:
+                    yield from visit(os.path.join(path, name), child_rel)
+                elif name.endswith(suffix):
+                    files.append(child_rel)
+                    yield root / child_rel
+
+        yield from visit(str(root), "")
+
+        if manifest is not None:
+            _save_manifest(manifest, root, suffix, dirs, files)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ── 파일 내용 미리 읽기 ──────────────────────────────────────────────────────
+
+def add_prefetch_args(parser: argparse.ArgumentParser) -> None:
+    """변환 스크립트 공통 --prefetch / --prefetch-mb 인자 추가."""
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_WORKERS, metavar="N",
+                        help=f"입력 파일을 미리 읽는 스레드 수 (default: {DEFAULT_WORKERS}, 0 = 사용 안 함)")
+    parser.add_argument("--prefetch-mb", type=int, default=DEFAULT_PREFETCH_MB, metavar="MB",
+                        help=f"미리 읽어 둘 최대 바이트 (default: {DEFAULT_PREFETCH_MB} MB)")
+
+
+class Prefetcher:
+    """경로를 입력 순서대로 (path, bytes | None) 로 내보내며, 뒤따르는 파일은 스레드 풀에서 미리 읽음.
+
+    Parameters
+    ----------
+    paths     : 읽을 경로 (제너레이터 가능, 별도 스레드에서 소비)
+    workers   : 읽기 스레드 수. 0 이면 미리 읽지 않고 경로만 (path, None) 으로 전달
+    max_bytes : 읽었지만 소비되지 않은 바이트 상한. 넘으면 다음 읽기 예약을 멈춤
+    max_files : 예약된 파일 수 상한 (크기를 모르는 읽기 중 파일 포함, 기본: workers × 4)
+
+    읽기에 실패한 파일은 content=None 으로 내보내므로, 호출 측은 직접 열어 원래 오류를 받습니다.
+    """
+
+    def __init__(self, paths: Iterable[Path], workers: int = DEFAULT_WORKERS,
+                 max_bytes: int = DEFAULT_PREFETCH_MB << 20, max_files: int | None = None):
+        self.paths = paths
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_files = max_files or max(1, workers) * _PREFETCH_DEPTH
+        self.stats = {"files": 0, "bytes": 0, "errors": 0, "waits": 0, "wait_seconds": 0.0,
+                      "depth_sum": 0, "max_depth": 0, "peak_buffered": 0}
+        self._buffered = 0
+        self._cond = threading.Condition()
+        self._stop = False
+
+    def _read(self, path: Path) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        with self._cond:
+            self._buffered += len(content)
+            self.stats["peak_buffered"] = max(self.stats["peak_buffered"], self._buffered)
+        return content
+
+    def _feed(self, pool: ThreadPoolExecutor, slots: threading.Semaphore, out: queue.Queue) -> None:
+        try:
+            for path in self.paths:
+                slots.acquire()
+                with self._cond:
+                    self._cond.wait_for(lambda: self._stop or self._buffered < self.max_bytes)
+                    if self._stop:
+                        return
+                out.put((path, pool.submit(self._read, path)))
+        except BaseException as e:   # 경로 제너레이터 오류는 소비자 쪽에서 다시 발생
+            out.put((None, e))
+            return
+        out.put(None)
+
+    def __iter__(self) -> Iterator[tuple[Path, bytes | None]]:
+        if self.workers <= 0:
+            for path in self.paths:
+                self.stats["files"] += 1
+                yield path, None
+            return
+
+        stats = self.stats
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        slots = threading.Semaphore(self.max_files)
+        out: queue.Queue = queue.Queue()
+        feeder = threading.Thread(target=self._feed, args=(pool, slots, out), daemon=True)
+        feeder.start()
+        try:
+            while True:
+                depth = out.qsize()
+                stats["depth_sum"] += depth
+                stats["max_depth"] = max(stats["max_depth"], depth)
+                try:
+                    item = out.get_nowait()
+                except queue.Empty:
+                    item = self._wait(out.get)
+                if item is None:
+                    return
+                path, future = item
+                if path is None:
+                    raise future   # feeder 가 넘긴 경로 제너레이터 오류
+                content = future.result() if future.done() else self._wait(future.result)
+                slots.release()
+                stats["files"] += 1
+                if content is None:
+                    stats["errors"] += 1
+                else:
+                    stats["bytes"] += len(content)
+                    with self._cond:
+                        self._buffered -= len(content)
+                        self._cond.notify()
+                yield path, content
+        finally:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            slots.release()   # 슬롯을 기다리는 feeder 깨우기
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _wait(self, fn):
+        start = time.perf_counter()
+        result = fn()
+        self.stats["waits"] += 1
+        self.stats["wait_seconds"] += time.perf_counter() - start
+        return result
+
+    def summary(self) -> str:
+        s = self.stats
+        if self.workers <= 0:
+            return f"[prefetch] 사용 안 함 (파일 {s['files']:,}개)"
+        avg_depth = s["depth_sum"] / s["files"] if s["files"] else 0.0
+        return (f"[prefetch] 파일 {s['files']:,}개, {s['bytes'] / 2**20:,.1f} MB, 읽기 실패 {s['errors']:,}개 | "
+                f"큐 깊이 평균 {avg_depth:,.1f} / 최대 {s['max_depth']:,}, "
+                f"최대 버퍼 {s['peak_buffered'] / 2**20:,.1f} MB | "
+                f"파서 대기 {s['waits']:,}회 {s['wait_seconds']:,.2f}s")
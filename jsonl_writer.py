@@ -0,0 +1,120 @@
+"""변환 출력용 백그라운드 JSONL 쓰기 (`JsonlWriter`)
+
+파싱 스레드는 레코드를 모아 제한된 큐에 넘기기만 하고, 백그라운드 스레드가 배치 단위로
+직렬화(fast_json)해 한 번의 큰 write 로 임시 파일(<출력>.tmp)에 씁니다.
+close() 에서 남은 배치를 쓰고 원래 경로로 교체하므로, 중간에 실패한 실행이
+기존의 정상 출력을 덮어쓰지 않습니다 (예외로 빠져나가면 임시 파일만 지움).
+여러 파일을 모두 성공했을 때만 교체하려면 각각 finish() 한 뒤 commit() 합니다.
+
+  with JsonlWriter(path) as out:
+      out.write(record)           # 넘긴 객체는 이후 수정하지 말 것 (직렬화는 나중에 다른 스레드에서)
+      out.write_many(records)
+"""
+
+import os
+import queue
+import threading
+from pathlib import Path
+
+from fast_json import dumps_line
+
+DEFAULT_BATCH = 128      # 큐에 넘기는 레코드 묶음 크기
+DEFAULT_QUEUE = 4         # 큐에 쌓아 둘 최대 묶음 수 (넘으면 파싱 스레드가 대기)
+_BUFFER = 64 << 10        # 파일 버퍼: 배치 여러 개를 모아 한 번에 write
+
+_DONE = object()
+
+
+class JsonlWriter:
+    """레코드를 배치로 큐에 넣고 백그라운드 스레드가 직렬화·쓰기. close() 시 원자적 교체."""
+
+    def __init__(self, path: Path, batch: int = DEFAULT_BATCH, max_batches: int = DEFAULT_QUEUE):
+        self.path = Path(path)
+        self.batch = batch
+        self.records = 0
+        self.writes = 0
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp, "wb", buffering=_BUFFER)
+        self._pending: list = []
+        self._queue: queue.Queue = queue.Queue(max_batches)
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"writer-{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _run(self) -> None:
+        while True:
+            items = self._queue.get()
+            if items is _DONE:
+                return
+            if self._error is not None:
+                continue   # 실패 후에는 큐만 비워 파싱 스레드가 막히지 않게 함
+            try:
+                self._file.write("".join(map(dumps_line, items)).encode("utf-8"))
+                self.writes += 1
+            except BaseException as e:
+                self._error = e
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _put(self) -> None:
+        self._check()
+        self._queue.put(self._pending)
+        self._pending = []
+
+    def write(self, obj) -> None:
+        self._pending.append(obj)
+        self.records += 1
+        if len(self._pending) >= self.batch:
+            self._put()
+
+    def write_many(self, objs) -> None:
+        for obj in objs:
+            self.write(obj)
+
+    def _stop(self) -> None:
+        self._queue.put(_DONE)
+        self._thread.join()
+        self._file.close()
+
+    def finish(self) -> None:
+        """남은 레코드를 임시 파일에 모두 씀 (교체는 commit). 여러 파일을 함께 교체할 때 사용."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+        self._stop()
+        if self._error is not None:
+            self._tmp.unlink(missing_ok=True)
+            raise self._error
+
+    def commit(self) -> None:
+        os.replace(self._tmp, self.path)
+
+    def close(self) -> None:
+        """남은 레코드를 쓰고 임시 파일을 원래 경로로 교체."""
+        if not self._closed:
+            self.finish()
+            self.commit()
+
+    def abort(self) -> None:
+        """쓰던 임시 파일을 버림. 원래 경로의 파일은 그대로 둠."""
+        if not self._closed:
+            self._closed = True
+            self._pending = []
+            self._error = self._error or RuntimeError("aborted")
+            self._stop()
+        self._tmp.unlink(missing_ok=True)
@@ -13,7 +13,7 @@
   원문 문자열과 character offset 기반 엔티티 목록 생성.
   형태소 라인은 사용하지 않음.
 
-태그 매핑:
+태그 매핑 (TAG_MAP, tag_maps/kmou.json):
   PER → PER    ORG → ORG    LOC → LOC    DAT → DAT    TIM → TIM
   NOH → QT (수량)    MNY → QT (금액)    PNT → QT (퍼센트)
   DUR → DAT (기간)   POH → 제거 (기타 고유명사)
@@ -33,35 +33,27 @@
 """
 
 import re
-import json
-import argparse
 from pathlib import Path
 
+from converter import Converter
+from label_vocab import load_tag_map
+from ner_utils import normalize_text, remap_spans
+
 BASE_DIR = Path(__file__).parent
 
 DEFAULT_INPUT  = BASE_DIR / "NER/말뭉치 - 형태소_개체명"
 DEFAULT_OUTPUT = BASE_DIR / "converted" / "kmou_ner_dataset.jsonl"
 
-# None: 제거, 값 있음: 해당 레이블로 변환
-TAG_MAP: dict[str, str | None] = {
-    "PER": "PER",   # 인물
-    "ORG": "ORG",   # 기관
-    "LOC": "LOC",   # 장소
-    "DAT": "DAT",   # 날짜
-    "TIM": "TIM",   # 시간
-    "NOH": "QT",    # 수량 → QT
-    "MNY": "QT",    # 금액 → QT
-    "PNT": "QT",    # 퍼센트 → QT
-    "DUR": "DAT",   # 기간 → DAT
-    "POH": None,    # 기타 고유명사 → 제거
-}
+# tag_maps/kmou.json 을 컴파일한 원본 레이블 → 레이블 id 테이블
+TAG_MAP = load_tag_map("kmou")
+VOCAB = TAG_MAP.vocab
 
 # <entity_text:LABEL> 패턴 (LABEL = 2~4자리 대문자)
 _ENTITY_RE = re.compile(r"<(.+?):([A-Z]{2,4})>")
 
 
-def _parse_annotated(annotated: str) -> tuple[str, list[list]]:
-    """주석 텍스트에서 plain text와 character offset 기반 엔티티 목록 추출.
+def _parse_annotated_raw(annotated: str) -> tuple[str, list[list]]:
+    """주석 텍스트에서 plain text와 character offset 기반 스팬 목록 추출. (라벨은 원본 레이블)
 
     Parameters
     ----------
@@ -70,11 +62,11 @@ def _parse_annotated(annotated: str) -> tuple[str, list[list]]:
 
     Returns
     -------
-    (plain_text, entities)
-        entities : [[start, end, label], ...]  (매핑된 라벨만 포함)
+    (plain_text, spans)
+        spans : [[start, end, raw_label], ...]  (모든 주석 포함)
     """
     parts: list[str] = []
-    entities: list[list] = []
+    spans: list[list] = []
     cursor = 0
     last_end = 0
 
@@ -85,11 +77,7 @@ def _parse_annotated(annotated: str) -> tuple[str, list[list]]:
         cursor += len(prefix)
 
         entity_text = m.group(1)
-        raw_label   = m.group(2)
-        label       = TAG_MAP.get(raw_label)  # None이면 제거 대상
-
-        if label is not None:
-            entities.append([cursor, cursor + len(entity_text), label])
+        spans.append([cursor, cursor + len(entity_text), m.group(2)])
 
         parts.append(entity_text)
         cursor  += len(entity_text)
@@ -99,11 +87,36 @@ def _parse_annotated(annotated: str) -> tuple[str, list[list]]:
     parts.append(annotated[last_end:])
 
     plain_text = "".join(parts)
-    return plain_text, entities
+    return plain_text, spans
+
+
+def _parse_annotated(annotated: str) -> tuple[str, list[list]]:
+    """주석 텍스트에서 plain text와 엔티티 목록 추출.
+
+    Returns
+    -------
+    (plain_text, entities)
+        entities : [[start, end, label_id], ...]  (매핑된 라벨만 포함, VOCAB id)
+    """
+    plain_text, spans = _parse_annotated_raw(annotated)
+    return plain_text, _map_spans(spans)
 
 
-def _parse_file(file_path: Path) -> list[dict]:
-    """*_NER.txt 파일 하나를 파싱해 레코드 리스트 반환."""
+def _map_spans(spans: list[list]) -> list[list]:
+    """원본 레이블 스팬에 TAG_MAP 적용. 매핑되지 않는 레이블은 제거."""
+    entities = []
+    for start, end, raw_label in spans:
+        label = TAG_MAP.lookup(raw_label)  # None이면 제거 대상
+        if label is not None:
+            entities.append([start, end, label])
+    return entities
+
+
+def _parse_file(file_path: Path, raw: list | None = None) -> list[dict]:
+    """*_NER.txt 파일 하나를 파싱해 레코드 리스트 반환.
+
+    raw 리스트를 주면 주석이 있는 문장마다 (plain text, 원본 레이블 스팬) 을 추가.
+    """
     records: list[dict] = []
     header_buf: list[str] = []   # ## 줄 버퍼 (최대 3개)
 
@@ -117,7 +130,13 @@ def _parse_file(file_path: Path) -> list[dict]:
             # 3번째 ## 줄 = 주석 텍스트
             if len(header_buf) == 3:
                 annotated = header_buf[2]
-                plain_text, entities = _parse_annotated(annotated)
+                if raw is None:
+                    plain_text, entities = _parse_annotated(annotated)
+                else:
+                    plain_text, spans = _parse_annotated_raw(annotated)
+                    if spans:
+                        raw.append((plain_text, spans))
+                    entities = _map_spans(spans)
 
                 if entities:
                     records.append({"text": plain_text, "entities": entities})
@@ -129,49 +148,44 @@ def _parse_file(file_path: Path) -> list[dict]:
     return records
 
 
-def convert(input_dir: Path, output_file: Path) -> None:
-    txt_files = sorted(input_dir.glob("*_NER.txt"))
-    if not txt_files:
-        print(f"[오류] *_NER.txt 파일을 찾을 수 없습니다: {input_dir}")
-        return
+class SourceConverter(Converter):
+    """*_NER.txt 디렉토리 → 문장당 한 줄. 샤딩은 파일명 해시 기준."""
 
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    total_records = 0
+    source = "kmou"
+    description = "말뭉치 형태소_개체명 NER.txt → JSONL 변환"
+    default_input = DEFAULT_INPUT
+    default_output = DEFAULT_OUTPUT
+    progress_every = 200
 
-    with open(output_file, "w", encoding="utf-8") as out:
-        for i, txt_path in enumerate(txt_files, 1):
-            try:
-                records = _parse_file(txt_path)
-            except Exception as e:
-                print(f"  [오류] {txt_path.name}: {e}")
-                continue
+    def units(self):
+        for txt_path in sorted(self.input_path.glob("*_NER.txt")):
+            if self.plan.owns(txt_path.name):
+                yield [txt_path.name], txt_path
 
-            for record in records:
-                out.write(json.dumps(record, ensure_ascii=False) + "\n")
-            total_records += len(records)
+    def unit_label(self, unit) -> str:
+        return unit.name
 
-            if i % 200 == 0:
-                print(f"  {i}/{len(txt_files)}개 파일 처리 완료 ({total_records}개 레코드)...")
+    def convert_unit(self, unit, raw):
+        records = []
+        for record in _parse_file(unit, raw):
+            if self.normalize or self.collapse_space:
+                record["text"], offset_map = normalize_text(record["text"], self.normalize, self.collapse_space)
+                record["entities"] = remap_spans(record["entities"], offset_map)
+                if not record["entities"]:
+                    continue
+            record["entities"] = VOCAB.decode(record["entities"])
+            records.append(record)
+        return [records]
 
-    print(f"\n완료: {len(txt_files)}개 파일 → {total_records}개 레코드")
-    print(f"출력 파일: {output_file}")
+    def run(self):
+        if not any(self.input_path.glob("*_NER.txt")):
+            print(f"[오류] *_NER.txt 파일을 찾을 수 없습니다: {self.input_path}")
+            return {}
+        return super().run()
 
 
 def main():
-    parser = argparse.ArgumentParser(description="말뭉치 형태소_개체명 NER.txt → JSONL 변환")
-    parser.add_argument("--input",  type=Path, default=DEFAULT_INPUT,
-                        help=f"입력 디렉토리 (default: {DEFAULT_INPUT})")
-    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
-                        help=f"출력 JSONL 파일 (default: {DEFAULT_OUTPUT})")
-    args = parser.parse_args()
-
-    if not args.input.exists():
-        print(f"[오류] 입력 경로가 존재하지 않습니다: {args.input}")
-        return
-
-    print(f"입력: {args.input}")
-    print(f"출력: {args.output}\n")
-    convert(args.input, args.output)
+    SourceConverter.main()
 
 
 if __name__ == "__main__":
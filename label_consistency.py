@@ -0,0 +1,237 @@
+"""소스 간 레이블 일관성 리포트 (스트리밍, 메모리 상한 고정)
+
+같은 표층형(예: 도시 이름)이 094 에선 LOC, naver 에선 ORG 로 붙거나 094 제거 로그에 남는 식의
+충돌을 converted/ 전체를 한 번 읽어 찾아냅니다.
+
+메모리 구조 (코퍼스 크기와 무관하게 고정):
+  - count-min sketch : (표층형, 소스, 레이블) 출현 수 추정. depth × width uint32 배열
+  - heavy hitters    : 자주 나오는 표층형 상위 --capacity 개와 레이블별 예시 문장 id.
+                       표가 차면 빈도 하위 절반을 한 번에 비움 (space-saving 방식의 일괄 정리)
+리포트 시 표에 남은 표층형마다 모든 (소스, 레이블) 조합을 sketch 로 조회해 분포를 복원합니다.
+
+입력:
+  *_ner_dataset.jsonl          엔티티 레이블 그대로
+  *_ner_dataset_dropped.jsonl  094 제거 로그 → 레이블 "-" (raw_tag 로 제거된 표층형)
+  그 밖의 부가 로그(_atm/_ate/_sample, --compact-logs 의 _sentences/_examples)는 본 출력과 중복이라 제외
+문장 id 는 레코드의 "id" 필드, 없으면 "<파일명>:<줄 번호>".
+
+충돌 점수 = 전체 출현 수 − 최다 레이블 출현 수 (다수 레이블과 다르게 붙은 횟수)
+
+사용법:
+  python3 label_consistency.py                       # converted/ 전체, 상위 30개
+  python3 label_consistency.py --top 100 --json conflicts.json
+  python3 label_consistency.py --min-count 5 --cross-source
+"""
+
+import argparse
+import hashlib
+import json
+import unicodedata
+from array import array
+from pathlib import Path
+
+from fast_json import loads
+
+CONVERTED_DIR = Path(__file__).parent / "converted"
+DROPPED_LABEL = "-"
+_SIDE_SUFFIXES = ("_atm.jsonl", "_ate.jsonl", "_sample.jsonl", "_sentences.jsonl", "_examples.jsonl")
+
+
+class CountMinSketch:
+    """depth 개 해시 행 × width 열 카운터. 추정치는 항상 실제 이상 (과대 추정만 발생)."""
+
+    def __init__(self, width: int = 1 << 20, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("I", bytes(4 * width * depth))
+
+    def _cells(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> None:
+        table = self.table
+        for cell in self._cells(key):
+            table[cell] += count
+
+    def estimate(self, key: str) -> int:
+        table = self.table
+        return min(table[cell] for cell in self._cells(key))
+
+    def nbytes(self) -> int:
+        return self.table.itemsize * len(self.table)
+
+
+class HeavySurfaces:
+    """자주 나오는 표층형 상위 capacity 개와 (소스, 레이블)별 예시 문장 id."""
+
+    def __init__(self, capacity: int = 20000, examples: int = 2):
+        self.capacity = capacity
+        self.examples = examples
+        self.counts: dict[str, int] = {}
+        self.samples: dict[str, dict[tuple[str, str], list[str]]] = {}
+        self.floor = 0   # 정리로 버려진 최대 빈도 (새로 들어온 항목의 오차 상한)
+
+    def add(self, surface: str, source: str, label: str, sid: str) -> None:
+        count = self.counts.get(surface)
+        if count is None:
+            if len(self.counts) >= self.capacity:
+                self._prune()
+            count = self.floor
+            self.samples[surface] = {}
+        self.counts[surface] = count + 1
+
+        ex = self.samples[surface].setdefault((source, label), [])
+        if len(ex) < self.examples and sid not in ex:
+            ex.append(sid)
+
+    def _prune(self) -> None:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1])
+        drop = ranked[:len(ranked) // 2]
+        self.floor = max(self.floor, drop[-1][1])
+        for surface, _ in drop:
+            del self.counts[surface]
+            del self.samples[surface]
+
+
+def _surface_key(surface: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", surface).split())
+
+
+def _source_name(path: Path) -> str:
+    return path.name.split("_ner_dataset")[0]
+
+
+def _iter_mentions(path: Path):
+    """(문장 id, 표층형, 레이블) 를 순서대로 생성."""
+    dropped = path.name.endswith("_dropped.jsonl")
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            obj = loads(line)
+            sid = obj.get("id") or f"{path.name}:{line_no}"
+            if dropped:
+                yield sid, obj["entity"], DROPPED_LABEL
+                continue
+            text = obj.get("text", "")
+            for start, end, label in obj.get("entities", []):
+                yield sid, text[start:end], label
+
+
+def scan(files: list[Path], sketch: CountMinSketch, heavy: HeavySurfaces) -> tuple[set, set, int]:
+    """파일들을 한 번씩 스트리밍. (소스 집합, 레이블 집합, 엔티티 수) 반환."""
+    sources, labels = set(), set()
+    total = 0
+    for path in files:
+        source = _source_name(path)
+        sources.add(source)
+        before = total
+        for sid, surface, label in _iter_mentions(path):
+            key = _surface_key(surface)
+            if not key:
+                continue
+            labels.add(label)
+            sketch.add(f"{key}\t{source}\t{label}")
+            heavy.add(key, source, label, sid)
+            total += 1
+        print(f"[읽기] {path.name}: 엔티티 {total - before:,}개 (source={source})")
+    return sources, labels, total
+
+
+def build_report(sketch: CountMinSketch, heavy: HeavySurfaces, sources: set, labels: set,
+                 min_count: int, cross_source: bool) -> list[dict]:
+    """표층형별 레이블 분포를 복원해 충돌 점수 순으로 정렬."""
+    report = []
+    for surface in heavy.counts:
+        dist: dict[str, dict[str, int]] = {}
+        for source in sorted(sources):
+            for label in sorted(labels):
+                est = sketch.estimate(f"{surface}\t{source}\t{label}")
+                if est >= min_count:
+                    dist.setdefault(source, {})[label] = est
+        by_label: dict[str, int] = {}
+        for per_source in dist.values():
+            for label, cnt in per_source.items():
+                by_label[label] = by_label.get(label, 0) + cnt
+        if len(by_label) < 2:
+            continue
+        if cross_source:
+            # 소스마다 최다 레이블이 다를 때만 (소스 내부 흔들림은 제외)
+            majors = {max(per_source, key=per_source.get) for per_source in dist.values()}
+            if len(majors) < 2:
+                continue
+        total = sum(by_label.values())
+        report.append({
+            "surface": surface,
+            "total": total,
+            "conflict": total - max(by_label.values()),
+            "labels": dict(sorted(by_label.items(), key=lambda x: -x[1])),
+            "by_source": dist,
+            "examples": {f"{src}/{lbl}": sids for (src, lbl), sids in sorted(heavy.samples[surface].items())},
+        })
+    report.sort(key=lambda row: (-row["conflict"], -row["total"], row["surface"]))
+    return report
+
+
+def print_report(report: list[dict], top: int) -> None:
+    print(f"\n{'='*70}")
+    print(f"  레이블 충돌 표층형 상위 {min(top, len(report))}개 (전체 {len(report):,}개)")
+    print(f"{'='*70}")
+    for rank, row in enumerate(report[:top], 1):
+        labels = " / ".join(f"{lbl} {cnt:,}" for lbl, cnt in row["labels"].items())
+        print(f"\n  {rank:>3}. '{row['surface']}'  충돌 {row['conflict']:,} / 전체 {row['total']:,}  [{labels}]")
+        for source, per_source in row["by_source"].items():
+            dist = ", ".join(f"{lbl} {cnt:,}" for lbl, cnt in sorted(per_source.items(), key=lambda x: -x[1]))
+            print(f"       {source:<8} {dist}")
+        for combo, sids in row["examples"].items():
+            print(f"       예) {combo:<14} {', '.join(sids)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="소스 간 표층형 레이블 충돌 리포트")
+    parser.add_argument("--dir", type=Path, default=CONVERTED_DIR,
+                        help=f"JSONL 디렉토리 (default: {CONVERTED_DIR})")
+    parser.add_argument("--top", type=int, default=30, help="출력할 충돌 표층형 수 (default: 30)")
+    parser.add_argument("--min-count", type=int, default=2,
+                        help="분포에 포함할 (소스, 레이블) 최소 추정 출현 수 (default: 2)")
+    parser.add_argument("--cross-source", action="store_true",
+                        help="소스 간 최다 레이블이 다른 표층형만 보고")
+    parser.add_argument("--capacity", type=int, default=20000,
+                        help="추적할 빈출 표층형 수 (default: 20000)")
+    parser.add_argument("--width", type=int, default=1 << 20,
+                        help="count-min sketch 열 수 (default: 1048576)")
+    parser.add_argument("--depth", type=int, default=4,
+                        help="count-min sketch 행 수 (default: 4)")
+    parser.add_argument("--examples", type=int, default=2,
+                        help="(소스, 레이블)별 예시 문장 id 수 (default: 2)")
+    parser.add_argument("--json", type=Path, default=None, metavar="OUT",
+                        help="전체 리포트 저장 경로")
+    args = parser.parse_args()
+
+    files = sorted(p for p in args.dir.glob("*.jsonl") if not p.name.endswith(_SIDE_SUFFIXES))
+    if not files:
+        print(f"{args.dir} 폴더에 JSONL 파일이 없습니다.")
+        return
+
+    sketch = CountMinSketch(args.width, args.depth)
+    heavy = HeavySurfaces(args.capacity, args.examples)
+    print(f"[메모리] sketch {sketch.nbytes() / 2**20:,.1f} MB, 빈출 표층형 최대 {args.capacity:,}개")
+    sources, labels, total = scan(files, sketch, heavy)
+    print(f"[읽기] 합계: 엔티티 {total:,}개, 추적 표층형 {len(heavy.counts):,}개")
+
+    report = build_report(sketch, heavy, sources, labels, args.min_count, args.cross_source)
+    print_report(report, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[저장] {args.json}")
+
+
+if __name__ == "__main__":
+    main()
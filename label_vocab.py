@@ -0,0 +1,169 @@
+"""태그 매핑 설정(tag_maps/*.json) 로더 및 공통 레이블 어휘
+
+각 데이터셋의 원본 태그 → 출력 태그 매핑은 `tag_maps/<source>.json` 에 선언하고,
+실행 시 공통 레이블 어휘(LabelVocab)와 정수 id 조회 테이블(TagMap)로 컴파일합니다.
+
+설정 파일 포맷:
+  {
+    "source": "094",
+    "key_type": "str",                     # 원본 태그 타입 ("str" | "int", 기본 "str")
+    "map": {"O-PS": "PER", "E-P": null},   # null: 제거, 키 없음: 제거
+    "rules": {"A-TM": {"fn": "atm", "labels": ["URL", "LOC"]}},
+                                           # 텍스트로 판단하는 태그 (fn은 변환 스크립트가 제공)
+    "unlogged": ["E-*", "O-AF"]            # 제거 로그에 남기지 않을 태그 (glob 패턴)
+  }
+
+공통 어휘는 모든 설정 파일이 낼 수 있는 태그의 정렬된 합집합이며,
+HF 포맷 변환 시 코퍼스를 훑지 않고 label2id를 만드는 데 사용합니다.
+"""
+
+import fnmatch
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+TAG_MAPS_DIR = Path(__file__).parent / "tag_maps"
+
+_MISSING = object()
+
+
+class LabelVocab:
+    """출력 태그 ↔ 정수 id 어휘."""
+
+    def __init__(self, labels: list[str]):
+        self.labels: list[str] = list(labels)
+        self.label2id: dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.label2id
+
+    def id(self, label: str) -> int:
+        try:
+            return self.label2id[label]
+        except KeyError:
+            raise ValueError(f"어휘에 없는 태그: {label!r} (tag_maps/*.json 확인)") from None
+
+    def decode(self, entities: list[list]) -> list[list]:
+        """[[start, end, label_id], ...] → [[start, end, label], ...]"""
+        labels = self.labels
+        return [[s, e, labels[i]] for s, e, i in entities]
+
+    def bio_labels(self) -> list[str]:
+        """O, B-X, I-X, ... 순 BIO 레이블 목록."""
+        bio = ["O"]
+        for label in self.labels:
+            bio.append(f"B-{label}")
+            bio.append(f"I-{label}")
+        return bio
+
+    def bio_label2id(self) -> dict[str, int]:
+        return {label: i for i, label in enumerate(self.bio_labels())}
+
+
+class TagMap:
+    """컴파일된 원본 태그 → 레이블 id 조회 테이블.
+
+    `table[raw]` 이 None이면 제거 대상, 키가 없으면 `rules` 를 확인한 뒤 제거.
+    """
+
+    def __init__(self, source: str, table: dict, rules: dict[str, Callable[[str], str | None]],
+                 unlogged: list[str], vocab: LabelVocab):
+        self.source = source
+        self.table = table
+        self.rules = rules
+        self.vocab = vocab
+        self._unlogged_exact = {p for p in unlogged if not any(c in p for c in "*?[")}
+        self._unlogged_globs = [p for p in unlogged if p not in self._unlogged_exact]
+
+    def __contains__(self, raw) -> bool:
+        return raw in self.table or raw in self.rules
+
+    def lookup(self, raw, surface: str = "") -> int | None:
+        """원본 태그(와 개체 텍스트) → 레이블 id. 제거 대상이면 None."""
+        tag_id = self.table.get(raw, _MISSING)
+        if tag_id is not _MISSING:
+            return tag_id
+        rule = self.rules.get(raw)
+        if rule is not None:
+            label = rule(surface)
+            return None if label is None else self.vocab.id(label)
+        return None
+
+    def label(self, raw, surface: str = "") -> str | None:
+        """lookup() 의 문자열 버전."""
+        tag_id = self.lookup(raw, surface)
+        return None if tag_id is None else self.vocab.labels[tag_id]
+
+    def is_unlogged(self, raw: str) -> bool:
+        """제거 로그에 남기지 않는 (의도적으로 버리는) 태그인지."""
+        if raw in self._unlogged_exact:
+            return True
+        return any(fnmatch.fnmatchcase(raw, p) for p in self._unlogged_globs)
+
+
+def _read_config(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _config_labels(config: dict) -> set[str]:
+    labels = {v for v in config.get("map", {}).values() if v is not None}
+    for rule in config.get("rules", {}).values():
+        labels.update(rule.get("labels", []))
+    return labels
+
+
+@lru_cache(maxsize=None)
+def load_vocab(tag_maps_dir: Path = TAG_MAPS_DIR) -> LabelVocab:
+    """모든 매핑 설정이 낼 수 있는 태그의 정렬된 합집합으로 어휘 생성."""
+    labels: set[str] = set()
+    for path in sorted(Path(tag_maps_dir).glob("*.json")):
+        labels |= _config_labels(_read_config(path))
+    return LabelVocab(sorted(labels))
+
+
+def load_tag_map(
+    source: str,
+    rules: dict[str, Callable[[str], str | None]] | None = None,
+    tag_maps_dir: Path = TAG_MAPS_DIR,
+    path: Path | None = None,
+) -> TagMap:
+    """`tag_maps/<source>.json` 을 읽어 TagMap 으로 컴파일.
+
+    Parameters
+    ----------
+    source : str
+        설정 파일 이름 (확장자 제외)
+    rules : dict
+        설정의 `rules[].fn` 이름 → 분류 함수 (텍스트 → 태그 문자열 | None)
+    path : Path
+        다른 위치의 설정 파일을 쓸 때 지정 (실험용 매핑 등)
+    """
+    config_path = path or Path(tag_maps_dir) / f"{source}.json"
+    config = _read_config(config_path)
+    vocab = load_vocab(Path(tag_maps_dir))
+    missing = _config_labels(config) - set(vocab.labels)
+    if missing:
+        # 기본 디렉토리 밖의 설정은 공통 어휘에 없는 태그를 쓸 수 없음
+        raise ValueError(f"{config_path.name}: 공통 어휘에 없는 태그 {sorted(missing)}")
+
+    cast = int if config.get("key_type", "str") == "int" else str
+    table = {
+        cast(raw): (None if label is None else vocab.id(label))
+        for raw, label in config.get("map", {}).items()
+    }
+
+    rules = rules or {}
+    compiled_rules = {}
+    for raw, spec in config.get("rules", {}).items():
+        fn = rules.get(spec["fn"])
+        if fn is None:
+            raise ValueError(f"{config_path.name}: 분류 함수 '{spec['fn']}' 가 제공되지 않았습니다 ({raw})")
+        compiled_rules[cast(raw)] = fn
+
+    return TagMap(config.get("source", source), table, compiled_rules,
+                  config.get("unlogged", []), vocab)
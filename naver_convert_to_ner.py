@@ -18,7 +18,7 @@ naver_ner 학습 데이터 → NER JSONL 변환 스크립트
     - end   : exclusive (Python slice 기준)
   - 유효한 엔티티가 없는 문장은 출력하지 않음
 
-태그 매핑 (TAG_MAP):
+태그 매핑 (TAG_MAP, tag_maps/naver.json):
   PER → PER    ORG → ORG    LOC → LOC    DAT → DAT
   NUM → QT     TIM → TIM
   CVL / TRM / EVT / ANM / AFW / FLD / PLT / MAT → 제거
@@ -31,31 +31,18 @@ naver_ner 학습 데이터 → NER JSONL 변환 스크립트
   --output : data_prepare/converted/naver_ner_dataset.jsonl
 """
 
-import json
-import argparse
 from pathlib import Path
 
+from converter import Converter
+from label_vocab import load_tag_map
+from ner_utils import normalize_text, remap_spans
+
 DEFAULT_INPUT  = Path(__file__).parent / "naver_ner" / "data" / "train" / "train_data"
 DEFAULT_OUTPUT = Path(__file__).parent / "converted" / "naver_ner_dataset.jsonl"
 
-# None: 해당 태그 제거, 값 있음: 해당 레이블로 변환
-TAG_MAP: dict[str, str | None] = {
-    "PER": "PER",   # 인물
-    "ORG": "ORG",   # 기관
-    "LOC": "LOC",   # 장소
-    "DAT": "DAT",   # 날짜
-    "NUM": "QT",    # 수량/숫자 → QT
-    "TIM": "TIM",   # 시간
-    # 제거 태그
-    "CVL": None,    # 직위/직책
-    "TRM": None,    # 전문용어
-    "EVT": None,    # 사건/행사
-    "ANM": None,    # 동물
-    "AFW": None,    # 인공물
-    "FLD": None,    # 분야
-    "PLT": None,    # 식물
-    "MAT": None,    # 재료/물질
-}
+# tag_maps/naver.json 을 컴파일한 원본 레이블 → 레이블 id 테이블
+TAG_MAP = load_tag_map("naver")
+VOCAB = TAG_MAP.vocab
 
 
 def _parse_sentences(file_path: Path) -> list[tuple[list[str], list[str]]]:
@@ -88,8 +75,8 @@ def _parse_sentences(file_path: Path) -> list[tuple[list[str], list[str]]]:
     return sentences
 
 
-def _extract_entities(text: str, words: list[str], tags: list[str]) -> list[list]:
-    """B/I 태그에서 character offset 기반 엔티티 스팬 추출.
+def _extract_spans(words: list[str], tags: list[str]) -> list[list]:
+    """B/I 태그에서 character offset 기반 스팬 추출. (라벨은 원본 레이블 그대로)
 
     어절은 공백으로 구분되므로 각 어절의 시작 오프셋을 누적 계산.
     같은 레이블의 B → I 연속은 공백 포함한 하나의 스팬으로 병합.
@@ -101,7 +88,7 @@ def _extract_entities(text: str, words: list[str], tags: list[str]) -> list[list
         offsets.append(cursor)
         cursor += len(word) + 1  # +1: 어절 사이 공백
 
-    entities: list[list] = []
+    spans: list[list] = []
     cur_label: str | None = None
     cur_start: int = 0
     cur_end:   int = 0
@@ -109,9 +96,7 @@ def _extract_entities(text: str, words: list[str], tags: list[str]) -> list[list
     def _flush():
         nonlocal cur_label
         if cur_label is not None:
-            mapped = TAG_MAP.get(cur_label)
-            if mapped is not None:
-                entities.append([cur_start, cur_end, mapped])
+            spans.append([cur_start, cur_end, cur_label])
             cur_label = None
 
     for i, (word, tag) in enumerate(zip(words, tags)):
@@ -141,48 +126,57 @@ def _extract_entities(text: str, words: list[str], tags: list[str]) -> list[list
                 cur_end   = w_end
 
     _flush()
-    return entities
-
-
-def convert(input_path: Path, output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return spans
 
-    sentences = _parse_sentences(input_path)
-    total_records = 0
 
-    with open(output_path, "w", encoding="utf-8") as out:
-        for words, tags in sentences:
-            if not words:
-                continue
-
-            text = " ".join(words)
-            entities = _extract_entities(text, words, tags)
-
-            if not entities:
-                continue
+def _extract_entities(text: str, words: list[str], tags: list[str]) -> list[list]:
+    """B/I 스팬에 TAG_MAP 적용. 반환 엔티티의 라벨은 VOCAB id."""
+    entities = []
+    for start, end, label in _extract_spans(words, tags):
+        mapped = TAG_MAP.lookup(label)
+        if mapped is not None:
+            entities.append([start, end, mapped])
+    return entities
 
-            out.write(json.dumps({"text": text, "entities": entities}, ensure_ascii=False) + "\n")
-            total_records += 1
 
-    print(f"완료: {len(sentences)}개 문장 → {total_records}개 레코드 (엔티티 없는 문장 제외)")
-    print(f"출력 파일: {output_path}")
+class SourceConverter(Converter):
+    """학습 데이터 파일 → 문장당 한 줄. 샤딩은 문장 번호 해시 기준."""
+
+    source = "naver"
+    description = "naver_ner 학습 데이터 → NER JSONL 변환"
+    default_input = DEFAULT_INPUT
+    default_output = DEFAULT_OUTPUT
+    input_help = "입력 파일"
+    unit_name = "문장"
+    unit_stat = "sentences"
+    progress_every = 0
+
+    def units(self):
+        for index, (words, tags) in enumerate(_parse_sentences(self.input_path)):
+            if self.plan.owns(str(index)):
+                yield [index], (index, words, tags)
+
+    def unit_label(self, unit) -> str:
+        return f"{unit[0]}번 문장"
+
+    def convert_unit(self, unit, raw):
+        _, words, tags = unit
+        if not words:
+            return [[]]
+        text = " ".join(words)
+        if raw is not None:
+            raw.append((text, _extract_spans(words, tags)))
+        entities = _extract_entities(text, words, tags)
+        if self.normalize or self.collapse_space:
+            text, offset_map = normalize_text(text, self.normalize, self.collapse_space)
+            entities = remap_spans(entities, offset_map)
+        if not entities:
+            return [[]]
+        return [[{"text": text, "entities": VOCAB.decode(entities)}]]
 
 
 def main():
-    parser = argparse.ArgumentParser(description="naver_ner 학습 데이터 → NER JSONL 변환")
-    parser.add_argument("--input",  type=Path, default=DEFAULT_INPUT,
-                        help=f"입력 파일 (default: {DEFAULT_INPUT})")
-    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
-                        help=f"출력 JSONL 파일 (default: {DEFAULT_OUTPUT})")
-    args = parser.parse_args()
-
-    if not args.input.exists():
-        print(f"[오류] 입력 파일이 존재하지 않습니다: {args.input}")
-        return
-
-    print(f"입력: {args.input}")
-    print(f"출력: {args.output}")
-    convert(args.input, args.output)
+    SourceConverter.main()
 
 
 if __name__ == "__main__":
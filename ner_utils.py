@@ -1,5 +1,18 @@
 """data_prepare 공통 유틸리티"""
 
+import argparse
+import unicodedata
+from array import array
+
+# 앞 글자와 합성될 수 있는 결합 등급 0 문자 (NFC_Quick_Check=Maybe 중 starter)
+# 한글 중성·종성 자모, 일부 인도계 모음 기호, (NFKC) 반각 가타카나 탁점. 이 앞에서는 클러스터를 나누지 않음
+_COMPOSING_STARTERS = frozenset(
+    [chr(c) for c in range(0x1161, 0x1176)]
+    + [chr(c) for c in range(0x11A8, 0x11C3)]
+    + [chr(c) for c in (0x0B3E, 0x0B56, 0x0B57, 0x0BBE, 0x0BD7, 0x0C56, 0x0CC2, 0x0CD5, 0x0CD6,
+                        0x0D3E, 0x0D57, 0x0DCF, 0x0DDF, 0x102E, 0x1B35, 0xFF9E, 0xFF9F)]
+)
+
 
 def merge_adjacent(text: str, entities: list) -> list:
     """같은 라벨의 연속 엔티티 중 사이 갭이 공백만 있으면 하나로 병합.
@@ -31,3 +44,96 @@ def merge_adjacent(text: str, entities: list) -> list:
         else:
             merged.append([s, e, lbl])
     return merged
+
+
+def _is_boundary(ch: str, coarse: bool) -> bool:
+    """ch 앞에서 정규화 클러스터를 끊을 수 있는지."""
+    if coarse:
+        return ch < "\x80"
+    return unicodedata.combining(ch) == 0 and ch not in _COMPOSING_STARTERS
+
+
+def _normalize_slow(text: str, form: str | None, collapse_space: bool,
+                    coarse: bool) -> tuple[str, array]:
+    n = len(text)
+    offset_map = array("i", bytes(4 * (n + 1)))
+    pieces: list[str] = []
+    new_len = 0
+    i = 0
+    while i < n:
+        j = i + 1
+        if collapse_space and text[i].isspace():
+            while j < n and text[j].isspace():
+                j += 1
+            out = " " if new_len and j < n else ""   # 앞뒤 공백은 제거
+        else:
+            while j < n and not _is_boundary(text[j], coarse) \
+                    and not (collapse_space and text[j].isspace()):
+                j += 1
+            out = unicodedata.normalize(form, text[i:j]) if form else text[i:j]
+        offset_map[i] = new_len
+        new_len += len(out)
+        for k in range(i + 1, j):
+            offset_map[k] = new_len
+        pieces.append(out)
+        i = j
+    offset_map[n] = new_len
+    return "".join(pieces), offset_map
+
+
+def normalize_text(text: str, form: str | None = "NFC",
+                   collapse_space: bool = False) -> tuple[str, array | None]:
+    """유니코드 정규화(NFC/NFKC)와 선택적 공백 정리, 원문→결과 오프셋 맵 생성.
+
+    Parameters
+    ----------
+    text : str
+        원문 텍스트
+    form : str | None
+        "NFC" / "NFKC" / None(정규화 안 함)
+    collapse_space : bool
+        연속 공백(탭·NBSP·전각 공백 포함)을 공백 하나로 줄이고 앞뒤 공백 제거
+
+    Returns
+    -------
+    tuple[str, array | None]
+        (정규화 텍스트, offset_map). 바뀐 것이 없으면 offset_map 은 None.
+        offset_map 은 길이 len(text)+1 의 array('i') 로, 원문 위치 i 가 결과의 어느 위치인지 나타냄.
+        합성 클러스터(예: NFD 한글 초성+중성+종성) 내부 위치는 클러스터 끝으로 올림.
+    """
+    # 대부분의 텍스트는 이미 정규형 → C 구현 검사만 하고 그대로 반환
+    if (form is None or unicodedata.is_normalized(form, text)) \
+            and (not collapse_space or text == " ".join(text.split())):
+        return text, None
+
+    expected = unicodedata.normalize(form, text) if form else text
+    if collapse_space:
+        expected = " ".join(expected.split())
+    result, offset_map = _normalize_slow(text, form, collapse_space, coarse=False)
+    if result != expected:
+        # 클러스터 경계 추정이 틀린 드문 경우 → ASCII 경계로만 나눠 다시 계산
+        result, offset_map = _normalize_slow(text, form, collapse_space, coarse=True)
+        if result != expected:
+            raise ValueError(f"정규화 오프셋 계산 실패: {text[:50]!r}")
+    return result, offset_map
+
+
+def remap_spans(entities: list, offset_map: array | None) -> list:
+    """[[start, end, label], ...] 를 normalize_text 결과 기준으로 옮김. 비게 되는 스팬은 제외."""
+    if offset_map is None:
+        return entities
+    remapped = []
+    for s, e, lbl in entities:
+        ns, ne = offset_map[s], offset_map[e]
+        if ns < ne:
+            remapped.append([ns, ne, lbl])
+    return remapped
+
+
+def add_normalize_args(parser: argparse.ArgumentParser) -> None:
+    """변환 스크립트 공통 --normalize / --collapse-space 인자 추가."""
+    parser.add_argument("--normalize", nargs="?", const="NFC", default=None, choices=["NFC", "NFKC"],
+                        help="텍스트 유니코드 정규화 후 엔티티 오프셋 재계산 (값 생략 시 NFC, "
+                             "NFKC 는 전각 문자·호환 문자까지 변환)")
+    parser.add_argument("--collapse-space", action="store_true",
+                        help="연속 공백(탭·NBSP·전각 공백 포함)을 하나로 줄이고 앞뒤 공백 제거")
@@ -1,22 +1,43 @@
 #!/usr/bin/env python
 """JSONL → HuggingFace token classification 포맷 변환 스크립트.
 
-data_prepare/converted/ 의 JSONL 파일들을 HuggingFace Trainer 학습에 맞는
-포맷으로 변환합니다.
+data_prepare/converted/ 의 *_ner_dataset.jsonl 파일들을 HuggingFace Trainer 학습에 맞는
+포맷으로 변환합니다. (094 의 _dropped/_atm/_ate 등 부가 로그는 읽지 않음)
 
 사용법:
     python scripts/prepare_hf_dataset.py
     python scripts/prepare_hf_dataset.py --input-dir data_prepare/converted --output-dir data/hf_dataset
 
+split 은 레코드 키("id", 없으면 text) 해시로 정하고(sharding.split_of, stream_dataset 과 같은 규칙)
+split 안의 순서만 --seed 로 셔플합니다. 같은 레코드는 함께 읽는 다른 파일과 무관하게 항상 같은 split 입니다.
+
 출력 파일:
     data/hf_dataset/train.jsonl
     data/hf_dataset/dev.jsonl
     data/hf_dataset/test.jsonl
     data/hf_dataset/label2id.json
+    data/hf_dataset/build_options.json   (split·출력 옵션과 입력 파일별 건수, --append 검사용)
 
 출력 JSONL 포맷 (한 줄 = 한 문장):
     {"tokens": ["나는", "서울에", "산다"], "ner_tags": [0, 1, 0], "source": "AIHUB_094"}
 
+    --granularity char (음절 단위, 조사가 붙은 어절에서도 엔티티 경계 보존):
+    {"tokens": ["나", "는", " ", "서", "울", "에", ...], "ner_tags": [0, 0, 0, 1, 2, 0, ...], ...}
+    --drop-space 를 함께 주면 공백 문자는 토큰에서 제외
+
+    --with-length : 각 레코드에 "length" (토큰 수) 추가 (Trainer group_by_length 용)
+    --bucket-bounds 32,64,128 : {split}.jsonl 대신 길이 구간별 샤드로 저장
+        data/hf_dataset/train/len_0001-0032.jsonl, len_0033-0064.jsonl, ..., len_0129-inf.jsonl
+    --pack-max-len 512 : 짧은 문장 여러 개를 한 시퀀스로 묶음. 문장 경계는 segment_ids 로 표시
+        {"tokens": [...], "ner_tags": [...], "segment_ids": [0, 0, 1, 1, 1], "sources": ["kmou", "naver"]}
+
+새 소스만 추가 (기존 레코드·레이블 번호는 그대로):
+    python scripts/prepare_hf_dataset.py --output-dir data/hf_dataset --append kmou
+    label2id.json 은 새 레이블만 뒤에 덧붙이고, split 은 레코드 키 해시(stream_dataset 과 같은 규칙)로 정해
+    각 split 파일(또는 --bucket-bounds 샤드) 끝에 추가합니다. 기록은 append_log.jsonl.
+    --granularity/--drop-space/--with-length/--pack-max-len/--bucket-bounds 는 전체 생성 때
+    (build_options.json) 와 같아야 합니다.
+
 HuggingFace 로드 예:
     from datasets import load_dataset
     ds = load_dataset("json", data_files={"train": "data/hf_dataset/train.jsonl", ...})
@@ -25,12 +46,24 @@ HuggingFace 로드 예:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
+import multiprocessing
+import os
 import random
 import re
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterator
 
+from compact_corpus import CompactCorpus
+from fast_json import DecodeError, dumps_line, loads
+from label_vocab import load_vocab
+from sharding import ShardPlan, add_shard_args, split_of
+
 
 # ── BIO 태깅 ─────────────────────────────────────────────────────────────────
 
@@ -72,6 +105,77 @@ def _char_offsets_to_word_bio(
     return tokens, bio_tags
 
 
+def _char_offsets_to_char_bio(
+    text: str,
+    entities: list[tuple[int, int, int]],
+    b_ids: list[int],
+    i_ids: list[int],
+    drop_space: bool = False,
+) -> tuple[list[str], list[int]]:
+    """문자 오프셋 → 음절(문자) 단위 BIO 태그 id 변환.
+
+    스팬마다 레이블 배열에 슬라이스 대입 한 번으로 채웁니다.
+
+    Parameters
+    ----------
+    text       : 원문 텍스트
+    entities   : [(start_char, end_char, label_id), ...]  # end_char는 exclusive
+    b_ids      : label_id → B-태그 id
+    i_ids      : label_id → I-태그 id
+    drop_space : True면 공백 문자를 토큰에서 제외
+
+    Returns
+    -------
+    (tokens, tag_ids)
+    """
+    n = len(text)
+    tag_ids = [0] * n
+    for start, end, lid in entities:
+        if start < 0 or end > n or start >= end:
+            continue
+        if drop_space:
+            # 공백에 B가 떨어지면 사라지므로 첫 비공백 문자로 이동
+            while start < end and text[start].isspace():
+                start += 1
+            if start == end:
+                continue
+        tag_ids[start] = b_ids[lid]
+        tag_ids[start + 1:end] = [i_ids[lid]] * (end - start - 1)
+
+    tokens = list(text)
+    if drop_space:
+        keep = [not c.isspace() for c in tokens]
+        tokens = [c for c, k in zip(tokens, keep) if k]
+        tag_ids = [t for t, k in zip(tag_ids, keep) if k]
+    return tokens, tag_ids
+
+
+class BioConverter:
+    """CompactCorpus 레코드 → (tokens, ner_tags) 변환기.
+
+    granularity : "word" (공백 토큰) | "char" (음절)
+    """
+
+    def __init__(self, label2id: dict[str, int], labels: list[str],
+                 granularity: str = "word", drop_space: bool = False):
+        if granularity not in ("word", "char"):
+            raise ValueError(f"알 수 없는 granularity: {granularity}")
+        self.label2id = label2id
+        self.labels = labels
+        self.granularity = granularity
+        self.drop_space = drop_space
+        self.b_ids = [label2id.get(f"B-{label}", 0) for label in labels]
+        self.i_ids = [label2id.get(f"I-{label}", 0) for label in labels]
+
+    def __call__(self, text: str, entity_ids: list[tuple[int, int, int]]) -> tuple[list[str], list[int]]:
+        if self.granularity == "char":
+            return _char_offsets_to_char_bio(text, entity_ids, self.b_ids, self.i_ids, self.drop_space)
+        labels = self.labels
+        entities = [(s, e, labels[lid]) for s, e, lid in entity_ids]
+        tokens, bio_tags = _char_offsets_to_word_bio(text, entities)
+        return tokens, [self.label2id.get(tag, 0) for tag in bio_tags]
+
+
 # ── JSONL 로드 ───────────────────────────────────────────────────────────────
 
 _SOURCE_MAP: dict[str, str] = {
@@ -95,36 +199,202 @@ def _iter_jsonl(path: Path) -> Iterator[dict]:
             if not line:
                 continue
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError as e:
+                yield loads(line)
+            except DecodeError as e:
                 print(f"[경고] {path.name}:{lineno} 파싱 오류: {e}")
 
 
-def load_all_jsonl(input_dir: Path) -> list[dict]:
-    """디렉토리 내 모든 .jsonl 파일을 읽어 합칩니다."""
-    all_samples: list[dict] = []
-    jsonl_files = sorted(input_dir.glob("*.jsonl"))
-    if not jsonl_files:
-        raise FileNotFoundError(f"{input_dir} 에서 .jsonl 파일을 찾을 수 없습니다.")
-    for jsonl_file in jsonl_files:
-        source = _source_from_filename(jsonl_file.name)
-        before = len(all_samples)
-        for sample in _iter_jsonl(jsonl_file):
-            sample["source"] = source
-            all_samples.append(sample)
-        print(f"[로드] {jsonl_file.name}: {len(all_samples) - before:,}건 (source={source})")
-    print(f"[로드] 합계: {len(all_samples):,}건")
-    return all_samples
+# ── JSONL 라인 인덱스 (.idx 사이드카) ─────────────────────────────────────────
+
+_INDEX_SUFFIX = ".idx"
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + _INDEX_SUFFIX)
+
+
+def build_line_index(path: Path) -> array:
+    """JSONL 각 레코드 줄의 바이트 오프셋을 `<파일명>.idx` 사이드카로 저장합니다.
+
+    빈 줄은 건너뛰므로 레코드 번호는 `_iter_jsonl` 순서와 같습니다.
+    사이드카는 little-endian uint64 배열이며, 마지막 원소는 파일 크기입니다.
+    (레코드 i = offsets[i] ~ offsets[i+1] 바이트)
+    """
+    offsets = array("Q")
+    pos = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                offsets.append(pos)
+            pos += len(line)
+    offsets.append(pos)
+
+    out = offsets
+    if sys.byteorder == "big":
+        out = array("Q", offsets)
+        out.byteswap()
+    with open(_index_path(path), "wb") as f:
+        out.tofile(f)
+    return offsets
+
+
+def _load_line_index(path: Path) -> array | None:
+    """사이드카를 읽습니다. 없거나 JSONL보다 오래됐으면 None."""
+    idx_path = _index_path(path)
+    if not idx_path.exists():
+        return None
+    st, idx_st = path.stat(), idx_path.stat()
+    if idx_st.st_mtime_ns < st.st_mtime_ns or idx_st.st_size % 8:
+        return None
+    offsets = array("Q")
+    with open(idx_path, "rb") as f:
+        offsets.fromfile(f, idx_st.st_size // 8)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    if not offsets or offsets[-1] != st.st_size:
+        return None
+    return offsets
+
+
+class JsonlIndex:
+    """`.idx` 사이드카 기반 JSONL 임의 접근 리더.
+
+    사용 예:
+        with JsonlIndex(Path("converted/094_ner_dataset.jsonl")) as idx:
+            obj = idx.get(12345)                       # O(1) 조회
+            picks = idx.sample(1000, seed=42)          # 균등 표본
+            start, stop = idx.shard_bounds(8, rank)    # 워커 분할
+            for obj in idx.iter_range(start, stop):
+                ...
+    """
+
+    def __init__(self, path: Path, rebuild: bool = False):
+        self.path = Path(path)
+        offsets = None if rebuild else _load_line_index(self.path)
+        if offsets is None:
+            offsets = build_line_index(self.path)
+        self._offsets = offsets
+        self._f = open(self.path, "rb")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __enter__(self) -> "JsonlIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def get_line(self, i: int) -> bytes:
+        """i번째 레코드 줄의 원본 바이트 (개행 제외)."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"{self.path.name}: 레코드 범위 초과 ({i})")
+        start = self._offsets[i]
+        self._f.seek(start)
+        return self._f.read(self._offsets[i + 1] - start).strip()
+
+    def get(self, i: int) -> dict:
+        """i번째 레코드를 파싱해 반환합니다."""
+        return loads(self.get_line(i))
+
+    def sample(self, k: int, seed: int | None = None) -> list[dict]:
+        """비복원 균등 표본 k건 (파일 순서로 정렬해 읽음)."""
+        picks = random.Random(seed).sample(range(len(self)), min(k, len(self)))
+        return [self.get(i) for i in sorted(picks)]
+
+    def shard_bounds(self, num_shards: int, shard_index: int) -> tuple[int, int]:
+        """레코드를 num_shards 개로 고르게 나눴을 때 shard_index 의 [start, stop)."""
+        n = len(self)
+        return n * shard_index // num_shards, n * (shard_index + 1) // num_shards
+
+    def iter_range(self, start: int, stop: int | None = None) -> Iterator[dict]:
+        """[start, stop) 범위 레코드를 순서대로 스트리밍합니다."""
+        n = len(self)
+        stop = n if stop is None else min(stop, n)
+        if start >= stop:
+            return
+        # 별도 핸들로 읽어 get()과 섞어 써도 위치가 꼬이지 않게 함
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start])
+            remaining = self._offsets[stop] - self._offsets[start]
+            for line in f:
+                remaining -= len(line)
+                line = line.strip()
+                if line:
+                    yield loads(line)
+                if remaining <= 0:
+                    break
+
+
+DATASET_SUFFIX = "_ner_dataset.jsonl"
+
+
+def dataset_files(input_dir: Path) -> list[Path]:
+    """변환 출력 <source>_ner_dataset.jsonl 목록.
+
+    094 의 _dropped/_atm/_ate, --compact-logs 의 _sentences/_examples 같은 부가 로그는
+    같은 디렉토리에 있어도 제외합니다.
+    """
+    paths = sorted(input_dir.glob(f"*{DATASET_SUFFIX}"))
+    if not paths:
+        raise FileNotFoundError(f"{input_dir} 에서 *{DATASET_SUFFIX} 파일을 찾을 수 없습니다.")
+    return paths
+
+
+SPLITS = ("train", "dev", "test")
+_SPLIT_CODE = {name: code for code, name in enumerate(SPLITS)}
+
+
+def load_jsonl(paths: list[Path], seed: int = 42, train_ratio: float = 0.8, dev_ratio: float = 0.1
+               ) -> tuple[CompactCorpus, array, dict[str, int]]:
+    """JSONL 파일들 → (CompactCorpus, 레코드별 split 번호(SPLITS 순), 파일별 건수).
+
+    split 은 레코드 키("id", 없으면 text) 해시로 정하므로(sharding.split_of) 함께 읽는 다른
+    파일과 무관하게 같은 레코드는 항상 같은 split 입니다. (--append, stream_dataset 과 같은 규칙)
+    """
+    corpus = CompactCorpus()
+    codes = array("B")
+    counts: dict[str, int] = {}
+    for path in paths:
+        source = _source_from_filename(path.name)
+        before = len(corpus)
+        for sample in _iter_jsonl(path):
+            text = sample.get("text", "")
+            corpus.append(text, sample.get("entities", []), source)
+            codes.append(_SPLIT_CODE[split_of(sample.get("id") or text, seed, train_ratio, dev_ratio)])
+        counts[path.name] = len(corpus) - before
+        print(f"[로드] {path.name}: {counts[path.name]:,}건 (source={source})")
+    return corpus, codes, counts
+
+
+def load_all_jsonl(input_dir: Path, seed: int = 42, train_ratio: float = 0.8, dev_ratio: float = 0.1
+                   ) -> tuple[CompactCorpus, array, dict[str, int]]:
+    """디렉토리의 변환 출력(dataset_files)을 읽어 하나의 CompactCorpus 로 합칩니다. 반환은 load_jsonl 과 같음."""
+    corpus, codes, counts = load_jsonl(dataset_files(input_dir), seed, train_ratio, dev_ratio)
+    print(f"[로드] 합계: {len(corpus):,}건 ({corpus.nbytes() / 2**20:,.1f} MB)")
+    return corpus, codes, counts
 
 
 # ── 레이블 수집 ───────────────────────────────────────────────────────────────
 
-def collect_label_list(samples: list[dict]) -> list[str]:
-    """전체 샘플에서 BIO 레이블 목록을 수집합니다. (O, B-X, I-X, ... 순)"""
-    raw_labels: set[str] = set()
-    for obj in samples:
-        for entity in obj.get("entities", []):
-            raw_labels.add(entity[2])
+def collect_label_list(samples: CompactCorpus | list[dict]) -> list[str]:
+    """전체 샘플에서 BIO 레이블 목록을 수집합니다. (O, B-X, I-X, ... 순)
+
+    기본 경로는 tag_maps/ 공통 어휘(`load_vocab().bio_labels()`)를 쓰며,
+    이 함수는 `--scan-labels` 로 코퍼스 기준 목록이 필요할 때만 사용합니다.
+    """
+    if isinstance(samples, CompactCorpus):
+        raw_labels = samples.used_labels()
+    else:
+        raw_labels = set()
+        for obj in samples:
+            for entity in obj.get("entities", []):
+                raw_labels.add(entity[2])
 
     bio_labels = ["O"]
     for label in sorted(raw_labels):
@@ -133,6 +403,13 @@ def collect_label_list(samples: list[dict]) -> list[str]:
     return bio_labels
 
 
+def unknown_labels(samples: CompactCorpus, label2id: dict[str, int]) -> Counter:
+    """label2id 에 B-X 가 없어 BioConverter 가 O 로 바꾸는 레이블별 엔티티 수."""
+    labels = samples.labels
+    return Counter({labels[lid]: n for lid, n in Counter(samples.span_label).items()
+                    if f"B-{labels[lid]}" not in label2id})
+
+
 # ── 변환 & 저장 ───────────────────────────────────────────────────────────────
 
 def convert_sample(obj: dict, label2id: dict[str, int]) -> dict | None:
@@ -150,48 +427,423 @@ def convert_sample(obj: dict, label2id: dict[str, int]) -> dict | None:
     }
 
 
+def convert_corpus_record(corpus: CompactCorpus, i: int, converter: BioConverter) -> dict | None:
+    """CompactCorpus 의 i번째 레코드를 변환. (레코드 dict 를 만들지 않는 convert_sample)"""
+    tokens, tag_ids = converter(corpus.text(i), corpus.entity_ids(i))
+    if not tokens:
+        return None
+
+    return {
+        "tokens": tokens,
+        "ner_tags": tag_ids,
+        "source": corpus.source(i),
+    }
+
+
+# ── 길이 버킷 & 패킹 ──────────────────────────────────────────────────────────
+
+def pack_records(records: Iterator[dict], max_len: int, window: int = 64) -> Iterator[dict]:
+    """짧은 레코드를 max_len 토큰 이하 시퀀스로 묶습니다.
+
+    최근 열린 묶음 window 개 중 처음으로 들어가는 곳에 넣는 first-fit 방식이며,
+    입력 순서에만 의존하므로 같은 입력이면 같은 결과가 나옵니다.
+    문장마다 BIO 태그가 따로 붙어 있으므로 라벨이 문장 경계를 넘지 않고,
+    segment_ids 로 경계를 표시합니다. max_len 보다 긴 레코드는 그대로 한 시퀀스가 됩니다.
+    """
+    open_packs: list[dict] = []
+
+    def new_pack() -> dict:
+        return {"tokens": [], "ner_tags": [], "segment_ids": [], "sources": []}
+
+    for rec in records:
+        size = len(rec["tokens"])
+        target = None
+        if size <= max_len:
+            for pack in open_packs:
+                if len(pack["tokens"]) + size <= max_len:
+                    target = pack
+                    break
+        if target is None:
+            target = new_pack()
+            open_packs.append(target)
+        seg = len(target["sources"])
+        target["tokens"].extend(rec["tokens"])
+        target["ner_tags"].extend(rec["ner_tags"])
+        target["segment_ids"].extend([seg] * size)
+        target["sources"].append(rec["source"])
+
+        # 가득 찼거나 창을 넘친 묶음은 내보냄
+        if len(target["tokens"]) >= max_len:
+            open_packs.remove(target)
+            yield target
+        elif len(open_packs) > window:
+            yield open_packs.pop(0)
+
+    yield from open_packs
+
+
+def _bucket_name(lo: int, hi: int | None) -> str:
+    return f"len_{lo:04d}-{'inf' if hi is None else f'{hi:04d}'}.jsonl"
+
+
+class _SplitWriter:
+    """split 하나를 단일 파일 또는 길이 버킷 샤드로 저장."""
+
+    def __init__(self, output_dir: Path, split_name: str,
+                 bucket_bounds: list[int] | None, with_length: bool, append: bool = False):
+        self.with_length = with_length
+        self.bounds = sorted(bucket_bounds or [])
+        self.counts: dict[str, int] = {}
+        self._mode = "a" if append else "w"
+        self._files: dict[int, tuple[str, object]] = {}
+        if self.bounds:
+            self.dir = output_dir / split_name
+            self.dir.mkdir(parents=True, exist_ok=True)
+            if not append:
+                for old in self.dir.glob("len_*.jsonl"):
+                    old.unlink()
+        else:
+            self.dir = output_dir
+            self._open(0, f"{split_name}.jsonl")
+
+    def _open(self, b: int, name: str) -> tuple[str, object]:
+        entry = self._files[b] = (name, open(self.dir / name, self._mode, encoding="utf-8"))
+        self.counts[name] = 0
+        return entry
+
+    def _bucket(self, length: int) -> int:
+        for b, hi in enumerate(self.bounds):
+            if length <= hi:
+                return b
+        return len(self.bounds)
+
+    def write(self, result: dict) -> None:
+        length = len(result["tokens"])
+        if self.with_length:
+            result["length"] = length
+        self.write_line(length, dumps_line(result))
+
+    def write_line(self, length: int, line: str) -> None:
+        """이미 직렬화된 줄 저장 (length 는 버킷 결정용)."""
+        b = self._bucket(length) if self.bounds else 0
+        entry = self._files.get(b)
+        if entry is None:
+            lo = self.bounds[b - 1] + 1 if b else 1
+            hi = self.bounds[b] if b < len(self.bounds) else None
+            entry = self._open(b, _bucket_name(lo, hi))
+        name, f = entry
+        f.write(line)
+        self.counts[name] += 1
+
+    def close(self) -> None:
+        for _, f in self._files.values():
+            f.close()
+
+
+# ── 청크 변환 (직렬 / 프로세스 풀 공용) ──────────────────────────────────────
+
+_WORKER: dict = {}
+
+
+def _init_worker(corpus: CompactCorpus, converter: BioConverter, with_length: bool, as_lines: bool) -> None:
+    _WORKER.update(corpus=corpus, converter=converter, with_length=with_length, as_lines=as_lines)
+
+
+def _convert_chunk(chunk: array) -> tuple[list, int]:
+    """레코드 번호 묶음 변환.
+
+    as_lines 이면 [(토큰 수, 직렬화된 줄), ...], 아니면 (패킹용) 결과 dict 목록과 스킵 수를 반환.
+    """
+    corpus, converter = _WORKER["corpus"], _WORKER["converter"]
+    with_length, as_lines = _WORKER["with_length"], _WORKER["as_lines"]
+    out: list = []
+    skipped = 0
+    for i in chunk:
+        result = convert_corpus_record(corpus, i, converter)
+        if result is None:
+            skipped += 1
+            continue
+        if not as_lines:
+            out.append(result)
+            continue
+        length = len(result["tokens"])
+        if with_length:
+            result["length"] = length
+        out.append((length, dumps_line(result)))
+    return out, skipped
+
+
+def _write_split(
+    output_dir: Path,
+    split_name: str,
+    chunk_results: Iterator[tuple[list, int]],
+    bucket_bounds: list[int] | None,
+    pack_max_len: int,
+    with_length: bool,
+    append: bool = False,
+) -> tuple[int, int, dict[str, int]]:
+    """청크 결과를 순서대로 저장 (append 면 기존 파일 뒤에 덧붙임). (변환 건수, 스킵 건수, 파일별 건수) 반환."""
+    stats = {"converted": 0, "skipped": 0}
+    writer = _SplitWriter(output_dir, split_name, bucket_bounds, with_length, append)
+    try:
+        if pack_max_len:
+            def _results() -> Iterator[dict]:
+                for items, skipped in chunk_results:
+                    stats["converted"] += len(items)
+                    stats["skipped"] += skipped
+                    yield from items
+
+            for result in pack_records(_results(), pack_max_len):
+                writer.write(result)
+        else:
+            for items, skipped in chunk_results:
+                stats["converted"] += len(items)
+                stats["skipped"] += skipped
+                for length, line in items:
+                    writer.write_line(length, line)
+    finally:
+        writer.close()
+    return stats["converted"], stats["skipped"], writer.counts
+
+
+def _print_results(results: dict[str, tuple[int, int, dict[str, int]]],
+                   bucket_bounds: list[int] | None, pack_max_len: int) -> None:
+    for split_name, (converted, skipped, counts) in results.items():
+        skip_note = f" (빈 샘플 스킵 {skipped}건)" if skipped else ""
+        if bucket_bounds or pack_max_len:
+            print(f"[저장] {split_name}: {converted:,}건{skip_note}")
+            for name, cnt in sorted(counts.items()):
+                print(f"         {name}: {cnt:,}" + (" 시퀀스" if pack_max_len else "건"))
+        else:
+            print(f"[저장] {split_name}.jsonl: {converted:,}건{skip_note}")
+
+
+def _save_label2id(label2id: dict[str, int], output_dir: Path) -> Path:
+    """label2id.json 저장 (임시 파일에 쓴 뒤 교체)."""
+    id2label = {str(v): k for k, v in label2id.items()}
+    label_path = output_dir / "label2id.json"
+    tmp = label_path.with_name(label_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"label2id": label2id, "id2label": id2label}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, label_path)
+    return label_path
+
+
+BUILD_OPTIONS = "build_options.json"
+APPEND_LOG = "append_log.jsonl"
+
+
+def build_options(seed: int, train_ratio: float, dev_ratio: float, granularity: str, drop_space: bool,
+                  bucket_bounds: list[int] | None, pack_max_len: int, with_length: bool) -> dict:
+    """split 규칙과 출력 레코드 모양을 정하는 옵션. 전체 생성 시 저장하고 --append 는 같아야 함."""
+    return {"seed": seed, "train_ratio": train_ratio, "dev_ratio": dev_ratio,
+            "granularity": granularity, "drop_space": drop_space, "with_length": with_length,
+            "pack_max_len": pack_max_len, "bucket_bounds": sorted(bucket_bounds or [])}
+
+
+def split_orders(samples: CompactCorpus, split_codes: array, seed: int) -> dict[str, array]:
+    """split 별 레코드 번호. split 안의 순서는 seed 셔플 순서."""
+    splits = {name: array("I") for name in SPLITS}
+    appends = [splits[name].append for name in SPLITS]
+    for i in samples.shuffled_order(seed):
+        appends[split_codes[i]](i)
+    return splits
+
+
 def split_convert_save(
-    samples: list[dict],
+    samples: CompactCorpus,
+    split_codes: array,
     label2id: dict[str, int],
     output_dir: Path,
     train_ratio: float,
     dev_ratio: float,
     seed: int,
+    granularity: str = "word",
+    drop_space: bool = False,
+    bucket_bounds: list[int] | None = None,
+    pack_max_len: int = 0,
+    with_length: bool = False,
+    workers: int = 1,
+    chunk_size: int = 2000,
+    plan: ShardPlan | None = None,
+    inputs: dict[str, int] | None = None,
 ) -> None:
-    rng = random.Random(seed)
-    rng.shuffle(samples)
+    """레코드별 split(split_codes, load_jsonl 참고)으로 나누고 split 안은 셔플해 변환·저장합니다.
 
-    n = len(samples)
-    train_end = int(n * train_ratio)
-    dev_end = train_end + int(n * dev_ratio)
+    inputs(파일별 건수)는 build_options.json 에 기록해 --append 가 같은 파일을 다시 넣지 않게 합니다.
 
-    splits = {
-        "train": samples[:train_end],
-        "dev": samples[train_end:dev_end],
-        "test": samples[dev_end:],
-    }
+    workers > 1 이면 청크를 프로세스 풀에서 순서 보존 imap 으로 변환하고
+    세 split 을 동시에 기록합니다. 결과 파일은 직렬 경로와 바이트 단위로 같습니다.
+
+    plan 이 활성이면 각 split 의 셔플 순서 중 이 샤드 몫의 연속 구간만 변환해
+    plan.dir 에 저장합니다. 샤드 순서대로 이어붙이면 단일 실행 결과와 같습니다.
+    """
+    splits = split_orders(samples, split_codes, seed)
+    final_dir = output_dir
+    if plan is not None and plan.active:
+        k, num = plan.shard_index, plan.num_shards
+        splits = {name: split_order[k * len(split_order) // num:(k + 1) * len(split_order) // num]
+                  for name, split_order in splits.items()}
+        output_dir = plan.dir
+        plan.begin()
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    converter = BioConverter(label2id, samples.labels, granularity, drop_space)
+    init_args = (samples, converter, with_length, not pack_max_len)
+
+    def chunks(split_order: array) -> list[array]:
+        return [split_order[k:k + chunk_size] for k in range(0, len(split_order), chunk_size)]
+
+    results: dict[str, tuple[int, int, dict[str, int]]] = {}
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args) as pool, \
+             ThreadPoolExecutor(max_workers=len(splits)) as writers:
+            futures = {
+                name: writers.submit(_write_split, output_dir, name,
+                                     pool.imap(_convert_chunk, chunks(split_order)),
+                                     bucket_bounds, pack_max_len, with_length)
+                for name, split_order in splits.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        _init_worker(*init_args)
+        for name, split_order in splits.items():
+            results[name] = _write_split(output_dir, name, map(_convert_chunk, chunks(split_order)),
+                                         bucket_bounds, pack_max_len, with_length)
+
+    _print_results(results, bucket_bounds, pack_max_len)
+
+    # 레이블 매핑·빌드 옵션 저장. 전체 재생성이므로 이전 --append 기록도 지움
+    label_path = _save_label2id(label2id, output_dir)
+    print(f"[저장] {label_path.name}: {len(label2id)}개 레이블 → {list(label2id.keys())}")
+    options = build_options(seed, train_ratio, dev_ratio, granularity, drop_space,
+                            bucket_bounds, pack_max_len, with_length)
+    with open(output_dir / BUILD_OPTIONS, "w", encoding="utf-8") as f:
+        json.dump({**options, "inputs": inputs or {}}, f, ensure_ascii=False, indent=2)
+    (final_dir / APPEND_LOG).unlink(missing_ok=True)
 
-    for split_name, split_samples in splits.items():
-        out_path = output_dir / f"{split_name}.jsonl"
-        converted = skipped = 0
-        with open(out_path, "w", encoding="utf-8") as f:
-            for obj in split_samples:
-                result = convert_sample(obj, label2id)
-                if result is None:
-                    skipped += 1
-                    continue
-                f.write(json.dumps(result, ensure_ascii=False) + "\n")
-                converted += 1
-        print(f"[저장] {out_path.name}: {converted:,}건" + (f" (빈 샘플 스킵 {skipped}건)" if skipped else ""))
-
-    # 레이블 매핑 저장
-    id2label = {str(v): k for k, v in label2id.items()}
+    if plan is not None:
+        outputs = [f"{split_name}/{name}" if bucket_bounds else name
+                   for split_name, (_, _, counts) in results.items() for name in counts]
+        stats = {f"{split_name}_{key}": value for split_name, (converted, skipped, _) in results.items()
+                 for key, value in (("converted", converted), ("skipped", skipped))}
+        plan.finish(stats, outputs, copies=[label_path.name, BUILD_OPTIONS])
+
+
+# ── 추가 모드 (--append) ─────────────────────────────────────────────────────
+
+
+def extend_label2id(label2id: dict[str, int], raw_labels: set[str]) -> list[str]:
+    """없는 레이블만 B-/I- 쌍으로 뒤 번호에 추가 (기존 번호는 그대로). 추가한 원 레이블 반환."""
+    next_id = max(label2id.values(), default=-1) + 1
+    added = []
+    for label in sorted(raw_labels):
+        if f"B-{label}" in label2id:
+            continue
+        label2id[f"B-{label}"] = next_id
+        label2id[f"I-{label}"] = next_id + 1
+        next_id += 2
+        added.append(label)
+    return added
+
+
+def _snapshot(output_dir: Path) -> dict[Path, int]:
+    """split 파일별 현재 크기 (실패 시 되돌리기용)."""
+    paths = [output_dir / f"{name}.jsonl" for name in SPLITS]
+    paths += [p for name in SPLITS for p in (output_dir / name).glob("len_*.jsonl")]
+    return {p: p.stat().st_size for p in paths if p.exists()}
+
+
+def _rollback(output_dir: Path, sizes: dict[Path, int]) -> None:
+    """_snapshot 이후 덧붙인 내용을 잘라내고 새로 생긴 파일은 지움."""
+    for path in set(_snapshot(output_dir)) - set(sizes):
+        path.unlink()
+    for path, size in sizes.items():
+        os.truncate(path, size)
+
+
+def append_save(
+    paths: list[Path],
+    output_dir: Path,
+    train_ratio: float,
+    dev_ratio: float,
+    seed: int,
+    granularity: str = "word",
+    drop_space: bool = False,
+    bucket_bounds: list[int] | None = None,
+    pack_max_len: int = 0,
+    with_length: bool = False,
+    workers: int = 1,
+    chunk_size: int = 2000,
+) -> None:
+    """기존 출력에 새 소스 JSONL 을 덧붙입니다 (기존 레코드는 읽지도 고치지도 않음).
+
+    - label2id : 기존 label2id.json 을 읽어 새 레이블만 뒤 번호로 추가
+    - split    : 전체 생성과 같은 레코드 키 해시 (load_jsonl). 나중에 전체를 다시 만들어도 같은 split
+    - 저장     : 각 split 파일(또는 길이 버킷 샤드) 끝에 새 레코드끼리 셔플한 순서로 추가
+    옵션(build_options)은 전체 생성 때 저장한 build_options.json 과 같아야 하고, 전체 생성이나
+    이전 --append 에 들어간 파일은 다시 넣을 수 없습니다.
+    도중에 실패하면 split 파일을 추가 전 크기로 되돌리고, label2id.json 은 모두 끝난 뒤에 교체합니다.
+    """
     label_path = output_dir / "label2id.json"
-    with open(label_path, "w", encoding="utf-8") as f:
-        json.dump({"label2id": label2id, "id2label": id2label}, f, ensure_ascii=False, indent=2)
-    print(f"[저장] {label_path.name}: {len(label2id)}개 레이블 → {list(label2id.keys())}")
+    options_path = output_dir / BUILD_OPTIONS
+    for path in (label_path, options_path):
+        if not path.exists():
+            raise FileNotFoundError(f"{path} 가 없습니다. 먼저 --append 없이 전체를 만드세요.")
+    with open(options_path, encoding="utf-8") as f:
+        built = json.load(f)
+    wanted = build_options(seed, train_ratio, dev_ratio, granularity, drop_space,
+                           bucket_bounds, pack_max_len, with_length)
+    diff = {key: (built.get(key), value) for key, value in wanted.items() if built.get(key) != value}
+    if diff:
+        detail = ", ".join(f"{key}: 기존 {old!r} / 지정 {new!r}" for key, (old, new) in diff.items())
+        raise ValueError(f"전체 생성 때와 옵션이 다릅니다 ({detail}). 같은 옵션으로 실행하세요.")
+    log_path = output_dir / APPEND_LOG
+    done = set(built.get("inputs", {}))
+    if log_path.exists():
+        with open(log_path, encoding="utf-8") as f:
+            done |= {name for line in f if line.strip() for name in loads(line)["files"]}
+    again = sorted(p.name for p in paths if p.name in done)
+    if again:
+        raise ValueError(f"이미 전체 생성이나 --append 로 들어간 파일입니다: {again} "
+                         "(다시 넣으려면 --append 없이 전체를 다시 만드세요)")
+
+    with open(label_path, encoding="utf-8") as f:
+        label2id: dict[str, int] = json.load(f)["label2id"]
+
+    samples, split_codes, per_file = load_jsonl(paths, seed, train_ratio, dev_ratio)
+
+    added = extend_label2id(label2id, samples.used_labels())
+    if added:
+        print(f"[레이블] 새 레이블 {added} → {len(label2id)}개 (기존 번호 유지)")
+
+    converter = BioConverter(label2id, samples.labels, granularity, drop_space)
+    init_args = (samples, converter, with_length, not pack_max_len)
+    sizes = _snapshot(output_dir)
+    results: dict[str, tuple[int, int, dict[str, int]]] = {}
+    try:
+        with contextlib.ExitStack() as stack:
+            if workers > 1:
+                imap = stack.enter_context(
+                    multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args)).imap
+            else:
+                _init_worker(*init_args)
+                imap = map
+            for name, split_order in split_orders(samples, split_codes, seed).items():
+                chunks = [split_order[k:k + chunk_size] for k in range(0, len(split_order), chunk_size)]
+                results[name] = _write_split(output_dir, name, imap(_convert_chunk, chunks),
+                                             bucket_bounds, pack_max_len, with_length, append=True)
+    except BaseException:
+        _rollback(output_dir, sizes)
+        raise
+    _print_results(results, bucket_bounds, pack_max_len)
+
+    if added:
+        _save_label2id(label2id, output_dir)
+        print(f"[저장] {label_path.name}: {len(label2id)}개 레이블")
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(dumps_line({"files": per_file, "seed": seed, "added_labels": added,
+                            "splits": {name: results[name][0] for name in SPLITS}}))
 
 
 # ── 메인 ─────────────────────────────────────────────────────────────────────
@@ -199,7 +851,7 @@ def split_convert_save(
 def main() -> None:
     ap = argparse.ArgumentParser(description="JSONL → HuggingFace token classification 포맷 변환")
     ap.add_argument("--input-dir",   default="data_prepare/converted", type=Path, metavar="DIR",
-                    help="JSONL 파일이 있는 디렉토리 (기본: data_prepare/converted)")
+                    help="*_ner_dataset.jsonl 파일이 있는 디렉토리 (기본: data_prepare/converted)")
     ap.add_argument("--output-dir",  default="data/hf_dataset", type=Path, metavar="DIR",
                     help="출력 디렉토리 (기본: data/hf_dataset)")
     ap.add_argument("--train-ratio", default=0.8, type=float, metavar="F",
@@ -207,33 +859,103 @@ def main() -> None:
     ap.add_argument("--dev-ratio",   default=0.1, type=float, metavar="F",
                     help="검증 비율 (기본: 0.1)")
     ap.add_argument("--seed",        default=42,  type=int,
-                    help="셔플 시드 (기본: 42)")
+                    help="split 해시·split 내 셔플 시드 (기본: 42)")
+    ap.add_argument("--granularity", default="word", choices=["word", "char"],
+                    help="토큰 단위: word(공백 어절) / char(음절) (기본: word)")
+    ap.add_argument("--drop-space",  action="store_true",
+                    help="--granularity char 에서 공백 문자를 토큰에서 제외")
+    ap.add_argument("--with-length", action="store_true",
+                    help='각 레코드에 "length" (토큰 수) 필드 추가')
+    ap.add_argument("--bucket-bounds", default=None, metavar="N,N,...",
+                    help="길이 구간 경계 (예: 32,64,128,256). 지정 시 split/len_*.jsonl 샤드로 저장")
+    ap.add_argument("--pack-max-len", default=0, type=int, metavar="N",
+                    help="짧은 문장을 N 토큰 이하 시퀀스로 패킹 (segment_ids 로 경계 표시)")
+    ap.add_argument("--workers",     default=1, type=int, metavar="N",
+                    help="변환 프로세스 수 (기본: 1, 결과는 직렬과 동일)")
+    ap.add_argument("--chunk-size",  default=2000, type=int, metavar="N",
+                    help="--workers 사용 시 프로세스에 넘기는 레코드 묶음 크기 (기본: 2000)")
+    ap.add_argument("--scan-labels", action="store_true",
+                    help="tag_maps/ 어휘 대신 코퍼스를 훑어 레이블 목록 생성")
+    ap.add_argument("--append", nargs="+", default=None, metavar="SRC",
+                    help="기존 --output-dir 에 새 소스만 추가 (소스 이름 또는 JSONL 경로). "
+                         "label2id 는 확장만, split 은 레코드 키 해시로 결정")
+    add_shard_args(ap)
     args = ap.parse_args()
 
     if args.train_ratio + args.dev_ratio >= 1.0:
         ap.error("train-ratio + dev-ratio 는 1.0 미만이어야 합니다.")
+    try:
+        plan = ShardPlan(args.output_dir, args.num_shards, args.shard_index, kind="concat")
+    except ValueError as e:
+        ap.error(str(e))
+    if plan.active and args.pack_max_len:
+        ap.error("--pack-max-len 은 샤딩과 함께 쓸 수 없습니다 (패킹 경계가 샤드마다 달라짐).")
+    if plan.active and args.append:
+        ap.error("--append 는 샤딩과 함께 쓸 수 없습니다 (병합한 출력에 추가하세요).")
+    bucket_bounds = None
+    if args.bucket_bounds:
+        try:
+            bucket_bounds = [int(b) for b in args.bucket_bounds.split(",") if b.strip()]
+        except ValueError:
+            ap.error("--bucket-bounds 는 쉼표로 구분한 정수여야 합니다.")
+
+    if args.append:
+        paths = []
+        for item in args.append:
+            path = Path(item)
+            if not path.exists():
+                path = args.input_dir / f"{item}_ner_dataset.jsonl"
+            if not path.exists():
+                ap.error(f"--append 입력을 찾을 수 없습니다: {item}")
+            paths.append(path)
+        print(f"▶ 추가: {', '.join(map(str, paths))} → {args.output_dir}")
+        print()
+        try:
+            append_save(paths, args.output_dir, args.train_ratio, args.dev_ratio, args.seed,
+                        args.granularity, args.drop_space, bucket_bounds, args.pack_max_len,
+                        args.with_length, args.workers, args.chunk_size)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"[오류] {e}")
+            sys.exit(1)
+        return
 
     print(f"▶ 입력: {args.input_dir}")
     print(f"▶ 출력: {args.output_dir}")
+    print(f"▶ 단위: {args.granularity}" + (" (공백 제외)" if args.drop_space else ""))
     print(f"▶ 분할: train {args.train_ratio*100:.0f}% / dev {args.dev_ratio*100:.0f}% / "
           f"test {(1-args.train_ratio-args.dev_ratio)*100:.0f}%")
     print()
 
-    samples = load_all_jsonl(args.input_dir)
+    samples, split_codes, inputs = load_all_jsonl(args.input_dir, args.seed, args.train_ratio, args.dev_ratio)
 
-    label_list = collect_label_list(samples)
+    if args.scan_labels:
+        label_list = collect_label_list(samples)
+    else:
+        label_list = load_vocab().bio_labels()
     label2id = {label: i for i, label in enumerate(label_list)}
     print(f"[레이블] {label_list}\n")
-
-    split_convert_save(samples, label2id, args.output_dir,
-                       args.train_ratio, args.dev_ratio, args.seed)
-
+    unknown = unknown_labels(samples, label2id)
+    if unknown:
+        detail = ", ".join(f"{label} {n:,}건" for label, n in unknown.most_common())
+        print(f"[경고] tag_maps/ 어휘에 없는 레이블은 O 로 처리됩니다: {detail}\n"
+              f"       코퍼스 레이블을 그대로 쓰려면 --scan-labels, 아니면 tag_maps/ 어휘에 추가하세요.\n")
+
+    split_convert_save(samples, split_codes, label2id, args.output_dir,
+                       args.train_ratio, args.dev_ratio, args.seed,
+                       args.granularity, args.drop_space,
+                       bucket_bounds, args.pack_max_len, args.with_length,
+                       args.workers, args.chunk_size, plan, inputs)
+    if plan.active:
+        print(f"\n▶ 모든 샤드 완료 후: python3 sharding.py merge {args.output_dir}")
+        return
+
+    pattern = "{}/*.jsonl" if bucket_bounds else "{}.jsonl"
     print(f"\n✔ 완료! HuggingFace 로드 예:")
     print(f"    from datasets import load_dataset")
     print(f"    ds = load_dataset('json', data_files={{")
-    print(f"        'train': '{args.output_dir}/train.jsonl',")
-    print(f"        'validation': '{args.output_dir}/dev.jsonl',")
-    print(f"        'test': '{args.output_dir}/test.jsonl',")
+    print(f"        'train': '{args.output_dir}/{pattern.format('train')}',")
+    print(f"        'validation': '{args.output_dir}/{pattern.format('dev')}',")
+    print(f"        'test': '{args.output_dir}/{pattern.format('test')}',")
     print(f"    }})")
 
 
@@ -0,0 +1,138 @@
+"""raw corpus(원본 태그 중간 포맷)에 태그 매핑을 적용해 NER JSONL 생성
+
+변환 스크립트를 `--raw-output DIR` 로 한 번 실행해 두면, 매핑을 바꿔 볼 때마다
+원본 JSON/텍스트를 다시 파싱하지 않고 중간 포맷을 한 번 훑어 JSONL 을 만듭니다.
+
+매핑은 변환 스크립트와 같은 tag_maps/<source>.json 을 쓰며, 텍스트로 판단하는 규칙
+(094 의 A-TM/A-TE)은 해당 변환 스크립트의 RULES 를 불러 적용합니다.
+원본 태그 번호마다 매핑 결과를 미리 계산해 두므로 스팬당 배열 조회 한 번이면 됩니다.
+
+사용법:
+  # 기본 매핑으로 재생성 (변환 스크립트 출력과 동일) → projected/094_ner_dataset.jsonl
+  python3 project_raw.py --raw converted/raw/094
+
+  # 실험 매핑: tag_maps/ 를 복사해 고친 디렉토리 사용
+  python3 project_raw.py --raw converted/raw/094 --tag-maps tag_maps_exp --output exp/094_ner_dataset.jsonl
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from jsonl_writer import JsonlWriter
+from label_vocab import TAG_MAPS_DIR, TagMap, load_tag_map
+from ner_utils import add_normalize_args, normalize_text, remap_spans
+from raw_corpus import RawCorpus
+
+BASE_DIR = Path(__file__).parent
+# 기본 출력. converted/ 의 변환 스크립트 출력(094 는 _dropped/_atm/_ate 포함)을 덮어쓰지 않게 따로 둠
+PROJECTED_DIR = BASE_DIR / "projected"
+
+
+def load_rules(source: str) -> dict:
+    """<source>_convert_to_ner.py 의 RULES (규칙 이름 → 분류 함수). 없으면 빈 dict."""
+    sys.path.insert(0, str(BASE_DIR))
+    try:
+        module = importlib.import_module(f"{source}_convert_to_ner")
+    except ImportError:
+        return {}
+    return getattr(module, "RULES", {})
+
+
+def _compile(corpus: RawCorpus, tag_map: TagMap) -> tuple[list, list]:
+    """원본 태그 번호별 (고정 레이블 | None, 규칙 원본 태그 | None)."""
+    fixed, ruled = [], []
+    for raw in corpus.tags:
+        if raw in tag_map.rules:
+            fixed.append(None)
+            ruled.append(raw)
+        else:
+            tag_id = tag_map.lookup(raw)
+            fixed.append(None if tag_id is None else tag_map.vocab.labels[tag_id])
+            ruled.append(None)
+    return fixed, ruled
+
+
+def iter_projected(corpus: RawCorpus, tag_map: TagMap, normalize: str | None = None,
+                   collapse_space: bool = False, indices: Iterable[int] | None = None
+                   ) -> Iterator[tuple[int, str | None, str, list[list]]]:
+    """매핑 후 엔티티가 남는 레코드만 (번호, 문장 id, text, [[start, end, label], ...]) 로 생성.
+
+    indices 를 주면 그 레코드 번호만 봄 (stream_dataset 의 샤딩용).
+    """
+    fixed, ruled = _compile(corpus, tag_map)
+    starts, ends, tag_idx = corpus.span_start, corpus.span_end, corpus.span_tag
+
+    for i in range(len(corpus)) if indices is None else indices:
+        text = None
+        entities = []
+        for k in corpus.span_range(i):
+            t = tag_idx[k]
+            label = fixed[t]
+            if label is None and ruled[t] is not None:
+                if text is None:
+                    text = corpus.text(i)
+                label = tag_map.label(ruled[t], text[starts[k]:ends[k]])
+            if label is not None:
+                entities.append([starts[k], ends[k], label])
+        if not entities:
+            continue
+
+        text = corpus.text(i) if text is None else text
+        if normalize or collapse_space:
+            text, offset_map = normalize_text(text, normalize, collapse_space)
+            entities = remap_spans(entities, offset_map)
+            if not entities:
+                continue
+        yield i, corpus.sid(i), text, entities
+
+
+def project(corpus: RawCorpus, tag_map: TagMap, output_path: Path,
+            normalize: str | None = None, collapse_space: bool = False) -> tuple[int, int]:
+    """매핑 적용 후 엔티티가 있는 레코드만 저장. (레코드 수, 엔티티 수) 반환."""
+    total_records = total_entities = 0
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with JsonlWriter(output_path) as out:
+        for _, sid, text, entities in iter_projected(corpus, tag_map, normalize, collapse_space):
+            record = {"id": sid, "text": text, "entities": entities} if sid is not None \
+                else {"text": text, "entities": entities}
+            out.write(record)
+            total_records += 1
+            total_entities += len(entities)
+    return total_records, total_entities
+
+
+def main():
+    parser = argparse.ArgumentParser(description="raw corpus → NER JSONL (태그 매핑 적용)")
+    parser.add_argument("--raw", type=Path, required=True,
+                        help="변환 스크립트 --raw-output 디렉토리")
+    parser.add_argument("--tag-maps", type=Path, default=TAG_MAPS_DIR,
+                        help=f"매핑 설정 디렉토리 (default: {TAG_MAPS_DIR})")
+    parser.add_argument("--map", type=Path, default=None,
+                        help="이 파일 하나만 다른 매핑 설정으로 사용 (태그는 --tag-maps 어휘 안에서)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"출력 JSONL (default: {PROJECTED_DIR.name}/<source>_ner_dataset.jsonl)")
+    add_normalize_args(parser)
+    args = parser.parse_args()
+
+    if not (args.raw / "meta.json").exists():
+        print(f"[오류] raw corpus 가 아닙니다 (meta.json 없음): {args.raw}")
+        return
+
+    corpus = RawCorpus(args.raw)
+    source = corpus.source
+    tag_map = load_tag_map(source, rules=load_rules(source), tag_maps_dir=args.tag_maps, path=args.map)
+    output = args.output or PROJECTED_DIR / f"{source}_ner_dataset.jsonl"
+
+    print(f"입력: {args.raw} ({source}, 레코드 {len(corpus):,}개, 원본 태그 {len(corpus.tags)}종)")
+    print(f"매핑: {args.map or Path(args.tag_maps) / f'{source}.json'}")
+    records, entities = project(corpus, tag_map, output, args.normalize, args.collapse_space)
+    print(f"완료: {records:,}개 레코드, 엔티티 {entities:,}개")
+    print(f"출력 파일: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""원본 태그를 보존하는 열 지향 중간 포맷 (raw corpus)
+
+변환 스크립트는 파싱 시점에 tag_maps/ 매핑을 적용해 원본 태그를 버립니다.
+`--raw-output DIR` 로 이 포맷을 함께 저장해 두면, 다른 태그 체계를 시험할 때
+원본을 다시 파싱하지 않고 `project_raw.py` 로 한 번 훑어 JSONL 을 만들 수 있습니다.
+
+디렉토리 구성 (<DIR>/):
+  meta.json          {"source", "key_type", "tags": [원본 태그...], "records", "spans", "has_ids"}
+  text.bin           모든 텍스트를 이어붙인 UTF-8 바이트
+  text_offsets.u64   [n+1] 레코드 i 텍스트 = text.bin[off[i]:off[i+1]]
+  ids.bin            (094 등 문장 id 가 있을 때) 문장 id UTF-8 바이트
+  id_offsets.u64     [n+1]
+  span_offsets.u64   [n+1] 레코드 i 스팬 = span_*[off[i]:off[i+1]]
+  span_start.i32     스팬 시작 (원문 문자 오프셋, inclusive)
+  span_end.i32       스팬 끝   (exclusive)
+  span_tag.u16       원본 태그 번호 (meta.tags 인덱스)
+
+정수 배열은 리틀 엔디언이며, 스팬 오프셋은 정규화 전 원문 기준입니다.
+쓰기는 <DIR>.tmp/ 에 한 뒤 close() 에서 교체합니다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+
+_FLUSH_RECORDS = 65536
+
+# 파일명 → array typecode
+_COLUMNS = {
+    "text_offsets.u64": "Q",
+    "id_offsets.u64": "Q",
+    "span_offsets.u64": "Q",
+    "span_start.i32": "i",
+    "span_end.i32": "i",
+    "span_tag.u16": "H",
+}
+
+
+def add_raw_output_arg(parser: argparse.ArgumentParser) -> None:
+    """변환 스크립트 공통 --raw-output 인자 추가."""
+    parser.add_argument("--raw-output", type=Path, default=None, metavar="DIR",
+                        help="원본 태그·원문 오프셋 중간 포맷도 저장 (예: converted/raw/<source>, "
+                             "project_raw.py 로 매핑 재적용)")
+
+
+def _to_le(arr: array) -> array:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+class RawCorpusWriter:
+    """레코드를 스트리밍으로 추가해 raw corpus 디렉토리를 만듦."""
+
+    def __init__(self, path: Path, source: str, key_type: str = "str", with_ids: bool = False):
+        self.path = Path(path)
+        self.source = source
+        self.key_type = key_type
+        self.with_ids = with_ids
+        self.tags: list[str] = []
+        self._tag_ids: dict[str, int] = {}
+
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        if self._tmp.exists():
+            shutil.rmtree(self._tmp)
+        self._tmp.mkdir(parents=True)
+        self._text = open(self._tmp / "text.bin", "wb")
+        self._ids = open(self._tmp / "ids.bin", "wb") if with_ids else None
+        self._files = {name: open(self._tmp / name, "wb") for name in _COLUMNS
+                       if with_ids or name != "id_offsets.u64"}
+        self._buf = {name: array(_COLUMNS[name]) for name in self._files}
+        self._text_pos = self._id_pos = self._span_pos = 0
+        self.records = 0
+        for name in ("text_offsets.u64", "span_offsets.u64") + (("id_offsets.u64",) if with_ids else ()):
+            self._buf[name].append(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _tag_id(self, raw) -> int:
+        key = str(raw)
+        tid = self._tag_ids.get(key)
+        if tid is None:
+            if len(self.tags) >= 0xFFFF:
+                raise ValueError("원본 태그 종류는 65535개까지 지원합니다.")
+            tid = self._tag_ids[key] = len(self.tags)
+            self.tags.append(key)
+        return tid
+
+    def append(self, text: str, spans: list, sid: str | None = None) -> None:
+        """레코드 하나 추가. spans: [[start, end, raw_tag], ...]"""
+        data = text.encode("utf-8")
+        self._text.write(data)
+        self._text_pos += len(data)
+        buf = self._buf
+        buf["text_offsets.u64"].append(self._text_pos)
+        if self._ids is not None:
+            data = (sid or "").encode("utf-8")
+            self._ids.write(data)
+            self._id_pos += len(data)
+            buf["id_offsets.u64"].append(self._id_pos)
+        for start, end, raw in spans:
+            buf["span_start.i32"].append(start)
+            buf["span_end.i32"].append(end)
+            buf["span_tag.u16"].append(self._tag_id(raw))
+        self._span_pos += len(spans)
+        buf["span_offsets.u64"].append(self._span_pos)
+        self.records += 1
+        if self.records % _FLUSH_RECORDS == 0:
+            self._flush()
+
+    def _flush(self) -> None:
+        for name, arr in self._buf.items():
+            _to_le(arr).tofile(self._files[name])
+            del arr[:]
+
+    def _close_files(self) -> None:
+        for f in [self._text, self._ids, *self._files.values()]:
+            if f is not None:
+                f.close()
+
+    def close(self) -> None:
+        self._flush()
+        self._close_files()
+        meta = {"source": self.source, "key_type": self.key_type, "tags": self.tags,
+                "records": self.records, "spans": self._span_pos, "has_ids": self.with_ids}
+        with open(self._tmp / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._close_files()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+class RawCorpus:
+    """raw corpus 디렉토리 읽기. 배열은 한 번에 올리고 레코드는 번호로 접근."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.source: str = self.meta["source"]
+        cast = int if self.meta.get("key_type", "str") == "int" else str
+        self.tags = [cast(t) for t in self.meta["tags"]]
+
+        self.text_buf = (self.path / "text.bin").read_bytes()
+        self.id_buf = (self.path / "ids.bin").read_bytes() if self.meta.get("has_ids") else None
+        cols = {}
+        for name, typecode in _COLUMNS.items():
+            if name == "id_offsets.u64" and self.id_buf is None:
+                continue
+            arr = array(typecode)
+            arr.frombytes((self.path / name).read_bytes())
+            if sys.byteorder != "little":
+                arr.byteswap()
+            cols[name] = arr
+        self.text_offsets = cols["text_offsets.u64"]
+        self.id_offsets = cols.get("id_offsets.u64")
+        self.span_offsets = cols["span_offsets.u64"]
+        self.span_start = cols["span_start.i32"]
+        self.span_end = cols["span_end.i32"]
+        self.span_tag = cols["span_tag.u16"]
+
+    def __len__(self) -> int:
+        return len(self.text_offsets) - 1
+
+    def text(self, i: int) -> str:
+        return self.text_buf[self.text_offsets[i]:self.text_offsets[i + 1]].decode("utf-8")
+
+    def sid(self, i: int) -> str | None:
+        if self.id_buf is None:
+            return None
+        return self.id_buf[self.id_offsets[i]:self.id_offsets[i + 1]].decode("utf-8")
+
+    def span_range(self, i: int) -> range:
+        return range(self.span_offsets[i], self.span_offsets[i + 1])
+
+    def spans(self, i: int) -> list[tuple[int, int, object]]:
+        """[(start, end, raw_tag), ...]"""
+        tags = self.tags
+        return [(self.span_start[k], self.span_end[k], tags[self.span_tag[k]]) for k in self.span_range(i)]
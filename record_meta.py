@@ -0,0 +1,295 @@
+"""JSONL 레코드별 메타데이터 열 사이드카 (`<파일명>.meta/`) — JSON 파싱 없는 필터·커리큘럼 정렬
+
+"PHN 과 ADD 가 모두 있는 문장", "64 토큰 이하" 같은 조건을 고를 때마다 모든 줄을 json.loads 하는 대신,
+한 번 훑어 레코드별 값을 열 배열로 저장해 두고 배열 조회만으로 레코드 번호를 고릅니다.
+레코드 번호는 `.idx` 사이드카(prepare_hf_dataset.JsonlIndex)와 같으므로 고른 줄만 바로 읽을 수 있습니다.
+
+사이드카 구성 (<파일명>.meta/):
+  meta.json        {"records", "labels": [비트 순서], "sources": [...], "jsonl_size", "jsonl_mtime_ns"}
+  char_len.u32     text 문자 수
+  tokens.u32       공백 토큰 수 (prepare_hf_dataset --granularity word 토큰 수)
+  entities.u16     엔티티 수
+  label_mask.u64   레이블 비트마스크 (비트 i = meta.labels[i] 가 하나 이상 있음)
+  source.u8        meta.sources 인덱스 (레코드 "source" 필드, 없으면 파일명 기준)
+
+정수 배열은 리틀 엔디언. JSONL 이 사이드카보다 새로우면 다시 만듭니다.
+
+사용법:
+  python3 record_meta.py build                          # converted/*_ner_dataset.jsonl 전체
+  python3 record_meta.py query converted/094_ner_dataset.jsonl --all PHN,ADD --max-tokens 64 --count
+  python3 record_meta.py query converted/094_ner_dataset.jsonl --any TIM --order tokens --output tim.jsonl
+
+  from record_meta import RecordMeta
+  meta = RecordMeta(Path("converted/094_ner_dataset.jsonl"))
+  picks = meta.select(all_labels=["PHN", "ADD"], max_tokens=64)
+  easy_first = meta.order("tokens", picks)              # 짧은 문장부터 (커리큘럼)
+  for obj in meta.read(easy_first[:1000]): ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from fast_json import loads
+from label_vocab import load_vocab
+from prepare_hf_dataset import JsonlIndex, _source_from_filename
+
+CONVERTED_DIR = Path(__file__).parent / "converted"
+_META_SUFFIX = ".meta"
+_DATASET_SUFFIX = "_ner_dataset.jsonl"
+
+# 열 이름 → (파일명, array typecode)
+_COLUMNS = {
+    "char_len":   ("char_len.u32", "I"),
+    "tokens":     ("tokens.u32", "I"),
+    "entities":   ("entities.u16", "H"),
+    "label_mask": ("label_mask.u64", "Q"),
+    "source":     ("source.u8", "B"),
+}
+
+
+def meta_path(path: Path) -> Path:
+    return path.with_name(path.name + _META_SUFFIX)
+
+
+def build_meta(path: Path) -> Path:
+    """JSONL 을 한 번 훑어 사이드카를 만듦. (빈 줄은 건너뛰어 레코드 번호는 .idx 와 같음)"""
+    path = Path(path)
+    labels = list(load_vocab().labels)
+    bits = {label: i for i, label in enumerate(labels)}
+    default_source = _source_from_filename(path.name)
+    sources: list[str] = []
+    source_ids: dict[str, int] = {}
+    cols = {name: array(typecode) for name, (_, typecode) in _COLUMNS.items()}
+    char_len, tokens, entities, label_mask, source = (cols[name] for name in _COLUMNS)
+
+    st = path.stat()
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = loads(line)
+            text = obj.get("text", "")
+            ents = obj.get("entities", [])
+            mask = 0
+            for ent in ents:
+                bit = bits.get(ent[2])
+                if bit is None:
+                    if len(labels) >= 64:
+                        raise ValueError(f"{path.name}: 레이블 종류가 64개를 넘습니다.")
+                    bit = bits[ent[2]] = len(labels)
+                    labels.append(ent[2])
+                mask |= 1 << bit
+            src = obj.get("source") or default_source
+            sid = source_ids.get(src)
+            if sid is None:
+                if len(sources) >= 256:
+                    raise ValueError(f"{path.name}: source 는 최대 256개까지 지원합니다.")
+                sid = source_ids[src] = len(sources)
+                sources.append(src)
+
+            char_len.append(len(text))
+            tokens.append(len(text.split()))
+            entities.append(min(len(ents), 0xFFFF))
+            label_mask.append(mask)
+            source.append(sid)
+
+    out = meta_path(path)
+    tmp = out.with_name(out.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for name, (filename, _) in _COLUMNS.items():
+        arr = cols[name]
+        if sys.byteorder != "little":
+            arr = array(arr.typecode, arr)
+            arr.byteswap()
+        with open(tmp / filename, "wb") as f:
+            arr.tofile(f)
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"records": len(source), "labels": labels, "sources": sources,
+                   "jsonl_size": st.st_size, "jsonl_mtime_ns": st.st_mtime_ns},
+                  f, ensure_ascii=False, indent=2)
+    if out.exists():
+        shutil.rmtree(out)
+    tmp.replace(out)
+    return out
+
+
+def _is_fresh(path: Path) -> bool:
+    try:
+        with open(meta_path(path) / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    st = path.stat()
+    return meta.get("jsonl_size") == st.st_size and meta.get("jsonl_mtime_ns") == st.st_mtime_ns
+
+
+class RecordMeta:
+    """사이드카 열 배열 + 레코드 번호 선택·정렬. 없거나 오래됐으면 만듦."""
+
+    def __init__(self, path: Path, rebuild: bool = False):
+        self.path = Path(path)
+        if rebuild or not _is_fresh(self.path):
+            build_meta(self.path)
+        root = meta_path(self.path)
+        with open(root / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.labels: list[str] = self.meta["labels"]
+        self.sources: list[str] = self.meta["sources"]
+        for name, (filename, typecode) in _COLUMNS.items():
+            arr = array(typecode)
+            arr.frombytes((root / filename).read_bytes())
+            if sys.byteorder != "little":
+                arr.byteswap()
+            setattr(self, name, arr)
+
+    def __len__(self) -> int:
+        return self.meta["records"]
+
+    def label_bits(self, labels: Iterable[str]) -> int:
+        """레이블 이름들 → 비트마스크. 이 파일에 없는 레이블은 -1 (어떤 레코드와도 안 맞음)."""
+        mask = 0
+        for label in labels:
+            if label not in self.labels:
+                return -1
+            mask |= 1 << self.labels.index(label)
+        return mask
+
+    def select(
+        self,
+        all_labels: Iterable[str] = (),
+        any_labels: Iterable[str] = (),
+        no_labels: Iterable[str] = (),
+        min_tokens: int | None = None,
+        max_tokens: int | None = None,
+        max_chars: int | None = None,
+        min_entities: int | None = None,
+        max_entities: int | None = None,
+        sources: Iterable[str] | None = None,
+        indices: Iterable[int] | None = None,
+    ) -> list[int]:
+        """조건을 모두 만족하는 레코드 번호 (오름차순). 조건마다 남은 후보만 열 배열로 거름."""
+        picks = list(range(len(self))) if indices is None else list(indices)
+        all_labels, any_labels, no_labels = list(all_labels), list(any_labels), list(no_labels)
+
+        if all_labels:
+            need = self.label_bits(all_labels)
+            if need < 0:
+                return []
+            mask = self.label_mask
+            picks = [i for i in picks if mask[i] & need == need]
+        if any_labels:
+            want = sum(1 << self.labels.index(l) for l in any_labels if l in self.labels)
+            mask = self.label_mask
+            picks = [i for i in picks if mask[i] & want]
+        if no_labels:
+            ban = sum(1 << self.labels.index(l) for l in no_labels if l in self.labels)
+            mask = self.label_mask
+            picks = [i for i in picks if not mask[i] & ban]
+        for col, lo, hi in ((self.tokens, min_tokens, max_tokens),
+                            (self.char_len, None, max_chars),
+                            (self.entities, min_entities, max_entities)):
+            if lo is not None:
+                picks = [i for i in picks if col[i] >= lo]
+            if hi is not None:
+                picks = [i for i in picks if col[i] <= hi]
+        if sources is not None:
+            wanted = {self.sources.index(s) for s in sources if s in self.sources}
+            source = self.source
+            picks = [i for i in picks if source[i] in wanted]
+        return picks
+
+    def order(self, key: str = "tokens", indices: Iterable[int] | None = None,
+              reverse: bool = False) -> list[int]:
+        """열 값 기준 정렬 (같은 값은 레코드 번호 순). 커리큘럼: order("tokens") = 짧은 문장부터."""
+        if key not in _COLUMNS:
+            raise ValueError(f"정렬 기준은 {list(_COLUMNS)} 중 하나: {key!r}")
+        col = getattr(self, key)
+        picks = range(len(self)) if indices is None else indices
+        return sorted(picks, key=lambda i: (-col[i], i) if reverse else (col[i], i))
+
+    def read_lines(self, indices: Iterable[int]) -> Iterator[bytes]:
+        """고른 레코드 줄의 원본 바이트 (.idx 로 바로 조회, 파싱 없음)."""
+        with JsonlIndex(self.path) as idx:
+            for i in indices:
+                yield idx.get_line(i)
+
+    def read(self, indices: Iterable[int]) -> Iterator[dict]:
+        for line in self.read_lines(indices):
+            yield loads(line)
+
+
+def _split_labels(spec: str | None) -> list[str]:
+    return [s.strip() for s in (spec or "").split(",") if s.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL 레코드 메타데이터 사이드카 생성·조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="사이드카 생성")
+    p_build.add_argument("files", nargs="*", type=Path,
+                         help=f"JSONL 파일 (default: {CONVERTED_DIR}/*{_DATASET_SUFFIX})")
+    p_build.add_argument("--force", action="store_true", help="최신이어도 다시 생성")
+
+    p_query = sub.add_parser("query", help="조건에 맞는 레코드 번호/줄 출력")
+    p_query.add_argument("file", type=Path, help="JSONL 파일")
+    p_query.add_argument("--all", default=None, metavar="L,L", help="모두 포함해야 하는 레이블")
+    p_query.add_argument("--any", default=None, metavar="L,L", help="하나 이상 포함해야 하는 레이블")
+    p_query.add_argument("--none", default=None, metavar="L,L", help="포함하면 안 되는 레이블")
+    p_query.add_argument("--min-tokens", type=int, default=None)
+    p_query.add_argument("--max-tokens", type=int, default=None)
+    p_query.add_argument("--max-chars", type=int, default=None)
+    p_query.add_argument("--min-entities", type=int, default=None)
+    p_query.add_argument("--max-entities", type=int, default=None)
+    p_query.add_argument("--order", default=None, choices=list(_COLUMNS),
+                         help="정렬 기준 열 (커리큘럼 순서)")
+    p_query.add_argument("--reverse", action="store_true", help="--order 내림차순")
+    p_query.add_argument("--limit", type=int, default=None, help="앞에서 N개만")
+    p_query.add_argument("--count", action="store_true", help="건수만 출력")
+    p_query.add_argument("--output", type=Path, default=None,
+                         help="고른 줄을 JSONL 로 저장 (없으면 레코드 번호 출력)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        files = args.files or sorted(CONVERTED_DIR.glob(f"*{_DATASET_SUFFIX}"))
+        for path in files:
+            if not args.force and _is_fresh(path):
+                print(f"[최신] {meta_path(path).name}")
+                continue
+            out = build_meta(path)
+            print(f"[생성] {out.name}: {RecordMeta(path).meta['records']:,}건")
+        return
+
+    meta = RecordMeta(args.file)
+    picks = meta.select(_split_labels(args.all), _split_labels(args.any), _split_labels(args.none),
+                        args.min_tokens, args.max_tokens, args.max_chars,
+                        args.min_entities, args.max_entities)
+    if args.order:
+        picks = meta.order(args.order, picks, args.reverse)
+    if args.limit is not None:
+        picks = picks[:args.limit]
+
+    if args.count:
+        print(f"{len(picks):,} / {len(meta):,}")
+    elif args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "wb") as out:
+            for line in meta.read_lines(picks):
+                out.write(line + b"\n")
+        print(f"[저장] {args.output}: {len(picks):,}건")
+    else:
+        for i in picks:
+            print(i)
+
+
+if __name__ == "__main__":
+    main()
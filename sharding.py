@@ -0,0 +1,232 @@
+"""여러 노드 분산 처리용 샤딩 헬퍼와 병합 명령
+
+변환 스크립트와 prepare_hf_dataset.py 는 `--num-shards K --shard-index i` 로 입력 일부만 처리합니다.
+공유 파일시스템에서 노드마다 다른 i 로 실행한 뒤 병합하면 단일 노드 실행과 같은 결과가 나옵니다.
+
+샤드 출력 위치:
+  <출력 경로>.shards/<i>-of-<K>/    예) converted/094_ner_dataset.jsonl.shards/000-of-004/
+    <출력 파일들>                    본 출력과 같은 이름 (094 는 _dropped/_atm/_ate 포함)
+    segments.jsonl                   처리 단위(파일/문장)별 정렬 키와 출력 파일별 줄 수 (kind=ordered)
+    stats.json                       카운터 합계·출력 목록 (완료 표시 겸용)
+
+병합 방식:
+  ordered : 변환 스크립트. 처리 단위를 안정 해시(blake2b)로 나누고, 병합 시 정렬 키로
+            k-way 병합해 단위별 줄을 원래 순서대로 복원
+  concat  : prepare_hf_dataset.py. 해시 분할·셔플 후 각 split 을 연속 구간으로 나누고, 병합 시 샤드 순서로 이어붙임
+
+사용법:
+  python3 sharding.py merge converted/094_ner_dataset.jsonl [data/hf_dataset ...]
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import shutil
+from pathlib import Path
+
+from fast_json import dumps_line, loads
+
+STATS_NAME = "stats.json"
+SEGMENTS_NAME = "segments.jsonl"
+
+
+def stable_hash(key: str) -> int:
+    """실행·머신과 무관한 64bit 해시 (내장 hash() 는 프로세스마다 달라 사용 불가)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def split_of(key: str, seed: int = 42, train_ratio: float = 0.8, dev_ratio: float = 0.1) -> str:
+    """레코드 키 → "train" / "dev" / "test". seed 가 같으면 항상 같은 결과."""
+    u = stable_hash(f"{seed}\t{key}") / 2**64
+    if u < train_ratio:
+        return "train"
+    if u < train_ratio + dev_ratio:
+        return "dev"
+    return "test"
+
+
+def add_shard_args(parser: argparse.ArgumentParser) -> None:
+    """--num-shards / --shard-index 인자 추가."""
+    parser.add_argument("--num-shards", type=int, default=1, metavar="K",
+                        help="전체 샤드 수 (default: 1 = 샤딩 안 함)")
+    parser.add_argument("--shard-index", type=int, default=0, metavar="I",
+                        help="이 실행이 처리할 샤드 번호 0..K-1 (default: 0)")
+
+
+def shard_root(output: Path) -> Path:
+    return output.with_name(output.name + ".shards")
+
+
+class ShardPlan:
+    """샤드 하나의 처리 범위와 출력 위치.
+
+    num_shards == 1 이면 비활성: owns() 는 항상 True, path() 는 원래 경로를 그대로 반환.
+    """
+
+    def __init__(self, output: Path, num_shards: int = 1, shard_index: int = 0, kind: str = "ordered"):
+        if num_shards < 1 or not 0 <= shard_index < num_shards:
+            raise ValueError(f"잘못된 샤드 지정: --shard-index {shard_index} / --num-shards {num_shards}")
+        self.output = Path(output)
+        self.num_shards = num_shards
+        self.shard_index = shard_index
+        self.kind = kind
+        self.active = num_shards > 1
+        self.dir = shard_root(self.output) / f"{shard_index:03d}-of-{num_shards:03d}"
+        self._segments = None
+
+    def __str__(self) -> str:
+        return f"{self.shard_index + 1}/{self.num_shards}"
+
+    def owns(self, key: str) -> bool:
+        """안정 해시 기준으로 이 샤드가 처리할 단위인지."""
+        return not self.active or stable_hash(key) % self.num_shards == self.shard_index
+
+    def path(self, path: Path) -> Path:
+        """본 출력 경로 → 이 샤드의 출력 경로."""
+        return self.dir / Path(path).name if self.active else Path(path)
+
+    def begin(self) -> None:
+        if not self.active:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        (self.dir / STATS_NAME).unlink(missing_ok=True)
+        if self.kind == "ordered":
+            self._segments = open(self.dir / SEGMENTS_NAME, "w", encoding="utf-8")
+
+    def record(self, key: list, counts: dict[str, int]) -> None:
+        """처리 단위 하나가 각 출력 파일에 쓴 줄 수 기록. key 는 단일 노드 처리 순서의 정렬 키."""
+        if self._segments is not None:
+            self._segments.write(dumps_line([key, counts]))
+
+    def finish(self, stats: dict[str, int], outputs: list[str], copies: list[str] | None = None) -> None:
+        """카운터·출력 목록 저장. stats.json 이 있어야 병합 대상 샤드로 인정됨."""
+        if not self.active:
+            return
+        if self._segments is not None:
+            self._segments.close()
+            self._segments = None
+        with open(self.dir / STATS_NAME, "w", encoding="utf-8") as f:
+            json.dump({"kind": self.kind, "num_shards": self.num_shards, "shard_index": self.shard_index,
+                       "stats": stats, "outputs": outputs, "copies": copies or []},
+                      f, ensure_ascii=False, indent=2)
+        print(f"[샤드 {self}] 출력: {self.dir}")
+
+
+# ── 병합 ─────────────────────────────────────────────────────────────────────
+
+def _load_shards(root: Path) -> list[tuple[Path, dict]]:
+    dirs = sorted(d for d in root.glob("*-of-*") if d.is_dir())
+    if not dirs:
+        raise FileNotFoundError(f"샤드 디렉토리가 없습니다: {root}")
+    shards = []
+    for d in dirs:
+        stats_path = d / STATS_NAME
+        if not stats_path.exists():
+            raise RuntimeError(f"완료되지 않은 샤드: {d}")
+        with open(stats_path, encoding="utf-8") as f:
+            shards.append((d, json.load(f)))
+    num_shards = shards[0][1]["num_shards"]
+    indices = sorted(info["shard_index"] for _, info in shards if info["num_shards"] == num_shards)
+    if indices != list(range(num_shards)) or len(shards) != num_shards:
+        raise RuntimeError(f"샤드 구성이 맞지 않습니다: {[d.name for d, _ in shards]}")
+    return shards
+
+
+def _iter_segments(shard_no: int, shard_dir: Path):
+    with open(shard_dir / SEGMENTS_NAME, encoding="utf-8") as f:
+        for line in f:
+            key, counts = loads(line)
+            yield key, shard_no, counts
+
+
+def _merge_ordered(shards: list[tuple[Path, dict]], out_dir: Path) -> list[Path]:
+    outputs = sorted({name for _, info in shards for name in info["outputs"]})
+    readers = [
+        {name: open(d / name, encoding="utf-8") for name in outputs if (d / name).exists()}
+        for d, _ in shards
+    ]
+    tmp = {name: out_dir / (name + ".tmp") for name in outputs}
+    outs = {name: open(path, "w", encoding="utf-8") for name, path in tmp.items()}
+    try:
+        merged = heapq.merge(*(_iter_segments(i, d) for i, (d, _) in enumerate(shards)),
+                             key=lambda t: t[0])
+        for _, shard_no, counts in merged:
+            for name, n in counts.items():
+                reader, out = readers[shard_no][name], outs[name]
+                for _ in range(n):
+                    out.write(reader.readline())
+    finally:
+        for f in outs.values():
+            f.close()
+        for files in readers:
+            for f in files.values():
+                f.close()
+    for name, path in tmp.items():
+        os.replace(path, out_dir / name)
+    return [out_dir / name for name in outputs]
+
+
+def _merge_concat(shards: list[tuple[Path, dict]], out_dir: Path) -> list[Path]:
+    outputs = sorted({rel for _, info in shards for rel in info["outputs"]})
+    written = []
+    for rel in outputs:
+        dest = out_dir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".tmp")
+        with open(tmp, "wb") as out:
+            for d, _ in shards:
+                if (d / rel).exists():
+                    with open(d / rel, "rb") as src:
+                        shutil.copyfileobj(src, out)
+        os.replace(tmp, dest)
+        written.append(dest)
+
+    for rel in shards[0][1].get("copies", []):
+        contents = {(d / rel).read_bytes() for d, _ in shards}
+        if len(contents) != 1:
+            raise RuntimeError(f"샤드마다 {rel} 내용이 다릅니다.")
+        shutil.copyfile(shards[0][0] / rel, out_dir / rel)
+        written.append(out_dir / rel)
+    return written
+
+
+def merge(output: Path) -> None:
+    """<output>.shards/ 의 샤드 결과를 output 으로 병합하고 카운터를 합산."""
+    output = Path(output)
+    shards = _load_shards(shard_root(output))
+    kind = shards[0][1]["kind"]
+    if kind == "ordered":
+        output.parent.mkdir(parents=True, exist_ok=True)
+        written = _merge_ordered(shards, output.parent)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+        written = _merge_concat(shards, output)
+
+    totals: dict[str, int] = {}
+    for _, info in shards:
+        for name, value in info["stats"].items():
+            totals[name] = totals.get(name, 0) + value
+
+    print(f"\n[병합] {output}: 샤드 {len(shards)}개 ({kind})")
+    for name, value in totals.items():
+        print(f"  {name:<16} {value:>12,}")
+    for path in written:
+        print(f"  → {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 출력 병합")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_merge = sub.add_parser("merge", help="<출력>.shards/ 를 <출력> 으로 병합")
+    p_merge.add_argument("outputs", nargs="+", type=Path,
+                         help="변환 스크립트의 --output 파일 또는 prepare_hf_dataset 의 --output-dir")
+    args = parser.parse_args()
+
+    for output in args.outputs:
+        merge(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""변환 결과를 train/dev/test 파일로 만들지 않고 학습 루프에 바로 흘려보내는 스트리밍 데이터셋
+
+prepare_hf_dataset.py 는 전체 코퍼스를 읽어 분할·셔플한 뒤 파일로 저장해야 학습을 시작할 수 있습니다.
+여기서는 같은 입력 파일(prepare_hf_dataset.dataset_files, converted/*_ner_dataset.jsonl)
+또는 --raw-output 중간 포맷을 순서대로 한 줄씩 읽으며
+  - split : 레코드 키 해시로 결정 (셔플 없이도 실행·머신과 무관하게 같은 분할)
+  - BIO   : prepare_hf_dataset.BioConverter 로 즉석 변환 (출력 포맷 동일)
+  - 샤딩  : 전체 줄 번호 k 를 k % num_shards 로 나눠, 자기 몫이 아닌 줄은 파싱도 하지 않음
+을 적용하므로 첫 배치가 수 초 안에 나옵니다.
+
+split 키 = 레코드 "id" (094), 없으면 text. 같은 문장은 항상 같은 split 으로 갑니다.
+prepare_hf_dataset.py 와 같은 규칙(sharding.split_of)이므로, 같은 seed·비율이면 각 split 의 레코드 구성은
+prepare_hf_dataset.py 의 split 파일과 같습니다 (순서만 다름).
+
+사용 예:
+    from stream_dataset import iter_records, NerStreamDataset
+
+    for rec in iter_records(["094", "naver"], split="train", seed=42):
+        rec  # {"tokens": [...], "ner_tags": [...], "source": "AIHUB_094"}
+
+    # PyTorch: DataLoader 워커·분산 rank 별로 겹치지 않게 자동 샤딩 (torch 없으면 일반 iterable)
+    ds = NerStreamDataset(split="train", shuffle_buffer=10000)
+    loader = DataLoader(ds, batch_size=32, num_workers=4, collate_fn=...)
+    for epoch in range(3):
+        ds.set_epoch(epoch)
+        ...
+
+    # 확인용 CLI
+    python3 stream_dataset.py --split dev --limit 3
+    python3 stream_dataset.py --sources 094 converted/raw/naver --count
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from fast_json import DecodeError, dumps, loads
+from label_vocab import TAG_MAPS_DIR, load_tag_map, load_vocab
+from prepare_hf_dataset import (DATASET_SUFFIX, SPLITS, BioConverter, _SOURCE_MAP, _source_from_filename,
+                                dataset_files)
+from project_raw import iter_projected, load_rules
+from raw_corpus import RawCorpus
+from sharding import split_of
+
+try:
+    from torch.utils.data import IterableDataset as _IterableBase, get_worker_info
+except ImportError:   # torch 없이도 일반 iterable 로 사용
+    _IterableBase = object
+
+    def get_worker_info():
+        return None
+
+CONVERTED_DIR = Path(__file__).parent / "converted"
+
+
+def _resolve_sources(sources: Iterable[str | Path] | None, input_dir: Path) -> list[tuple[str, Path]]:
+    """소스 목록 → [("jsonl" | "raw", 경로), ...]
+
+    항목은 소스 이름(094, naver ...), JSONL 경로, raw corpus 디렉토리 중 하나.
+    이름은 <input_dir>/<이름>_ner_dataset.jsonl, 없으면 <input_dir>/raw/<이름> 을 찾습니다.
+    None 이면 input_dir 의 *_ner_dataset.jsonl 전체 (부가 로그 제외).
+    """
+    if sources is None:
+        return [("jsonl", p) for p in dataset_files(input_dir)]
+
+    resolved = []
+    for src in sources:
+        path = Path(src)
+        candidates = [path, input_dir / f"{src}{DATASET_SUFFIX}", input_dir / "raw" / str(src)]
+        for cand in candidates:
+            if cand.is_file():
+                resolved.append(("jsonl", cand))
+                break
+            if (cand / "meta.json").is_file():
+                resolved.append(("raw", cand))
+                break
+        else:
+            raise FileNotFoundError(f"소스를 찾을 수 없습니다: {src} (JSONL, raw corpus 디렉토리 또는 소스 이름)")
+    return resolved
+
+
+class _Counter:
+    """소스를 이어 읽을 때 전체 줄 번호 k 를 공유하며 k % num_shards == shard_index 인지 판정."""
+
+    def __init__(self, num_shards: int, shard_index: int):
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(f"shard_index 는 0..{num_shards - 1} 이어야 합니다: {shard_index}")
+        self.num_shards = num_shards
+        self.shard_index = shard_index
+        self.k = -1
+
+    def owns_next(self) -> bool:
+        self.k += 1
+        return self.k % self.num_shards == self.shard_index
+
+
+def _iter_jsonl_owned(path: Path, counter: _Counter) -> Iterator[tuple[str | None, str, list]]:
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip() or not counter.owns_next():
+                continue
+            try:
+                obj = loads(line)
+            except DecodeError as e:
+                print(f"[경고] {path.name}:{counter.k} 파싱 오류: {e}")
+                continue
+            yield obj.get("id"), obj.get("text", ""), obj.get("entities", [])
+
+
+def _iter_raw_owned(path: Path, counter: _Counter, tag_maps_dir: Path,
+                    normalize: str | None, collapse_space: bool) -> tuple[str, Iterator]:
+    corpus = RawCorpus(path)
+    tag_map = load_tag_map(corpus.source, rules=load_rules(corpus.source), tag_maps_dir=tag_maps_dir)
+    owned = [i for i in range(len(corpus)) if counter.owns_next()]
+    records = ((sid, text, entities) for _, sid, text, entities in
+               iter_projected(corpus, tag_map, normalize, collapse_space, owned))
+    return _SOURCE_MAP.get(corpus.source, corpus.source), records
+
+
+def iter_records(
+    sources: Iterable[str | Path] | None = None,
+    split: str | None = "train",
+    seed: int = 42,
+    *,
+    input_dir: Path = CONVERTED_DIR,
+    train_ratio: float = 0.8,
+    dev_ratio: float = 0.1,
+    granularity: str = "word",
+    drop_space: bool = False,
+    label2id: dict[str, int] | None = None,
+    num_shards: int = 1,
+    shard_index: int = 0,
+    tag_maps_dir: Path = TAG_MAPS_DIR,
+    normalize: str | None = None,
+    collapse_space: bool = False,
+) -> Iterator[dict]:
+    """소스를 차례로 읽어 split 에 속한 레코드를 HF 포맷으로 생성.
+
+    Parameters
+    ----------
+    sources        : 소스 이름 / JSONL 경로 / raw corpus 디렉토리 목록 (None: converted/ 전체)
+    split          : "train" / "dev" / "test", None 이면 전체
+    seed           : split 해시 시드
+    granularity    : "word" / "char" (prepare_hf_dataset.py --granularity 와 같음)
+    label2id       : BIO 레이블 → id (기본: tag_maps/ 공통 어휘)
+    num_shards, shard_index : 전체 줄 번호 기준 라운드 로빈 샤딩 (DataLoader 워커 × rank)
+    normalize, collapse_space : raw corpus 소스에만 적용 (JSONL 은 변환 시 이미 적용)
+
+    레코드 포맷은 prepare_hf_dataset.py 출력과 같은 {"tokens", "ner_tags", "source"}.
+    어휘에 없는 레이블의 엔티티는 O 로 처리합니다.
+    """
+    if split is not None and split not in SPLITS:
+        raise ValueError(f"split 은 {SPLITS} 또는 None 이어야 합니다: {split!r}")
+    labels = list(load_vocab(tag_maps_dir).labels)
+    label_index = {label: i for i, label in enumerate(labels)}
+    if label2id is None:
+        label2id = {label: i for i, label in enumerate(load_vocab(tag_maps_dir).bio_labels())}
+    converter = BioConverter(label2id, labels, granularity, drop_space)
+    counter = _Counter(num_shards, shard_index)
+
+    for kind, path in _resolve_sources(sources, Path(input_dir)):
+        if kind == "raw":
+            source, records = _iter_raw_owned(path, counter, tag_maps_dir, normalize, collapse_space)
+        else:
+            source, records = _source_from_filename(path.name), _iter_jsonl_owned(path, counter)
+
+        for sid, text, entities in records:
+            if split is not None and split_of(sid or text, seed, train_ratio, dev_ratio) != split:
+                continue
+            entity_ids = [(s, e, label_index[label]) for s, e, label in entities if label in label_index]
+            tokens, tag_ids = converter(text, entity_ids)
+            if not tokens:
+                continue
+            yield {"tokens": tokens, "ner_tags": tag_ids, "source": source}
+
+
+def _shuffled(records: Iterator[dict], buffer_size: int, seed: int) -> Iterator[dict]:
+    """크기 buffer_size 버퍼에서 무작위로 하나씩 꺼내는 근사 셔플."""
+    rng = random.Random(seed)
+    buffer: list[dict] = []
+    for rec in records:
+        if len(buffer) < buffer_size:
+            buffer.append(rec)
+            continue
+        j = rng.randrange(buffer_size)
+        yield buffer[j]
+        buffer[j] = rec
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def _dist_info(rank: int | None, world_size: int | None) -> tuple[int, int]:
+    """(rank, world_size): 명시값 → torch.distributed → 환경 변수 RANK/WORLD_SIZE → (0, 1)."""
+    if rank is not None and world_size is not None:
+        return rank, world_size
+    try:
+        import torch.distributed as dist
+        if dist.is_available() and dist.is_initialized():
+            return dist.get_rank(), dist.get_world_size()
+    except ImportError:
+        pass
+    return int(os.environ.get("RANK", 0)), int(os.environ.get("WORLD_SIZE", 1))
+
+
+class NerStreamDataset(_IterableBase):
+    """iter_records 를 PyTorch IterableDataset 으로 감싼 것. (torch 가 없으면 일반 iterable)
+
+    DataLoader 워커 w (num_workers 개) · 분산 rank r (world_size 개) 마다
+    샤드 r × num_workers + w 만 읽으므로 같은 레코드를 두 번 보지 않습니다.
+    shuffle_buffer > 0 이면 샤드 안에서 버퍼 셔플 (시드 = seed + epoch + 샤드 번호).
+    샤드마다 레코드 수가 조금씩 다를 수 있으니 DDP 에서는 스텝 수를 고정해 쓰세요.
+    """
+
+    def __init__(self, sources: Iterable[str | Path] | None = None, split: str | None = "train",
+                 seed: int = 42, *, shuffle_buffer: int = 0, rank: int | None = None,
+                 world_size: int | None = None, **kwargs):
+        super().__init__()
+        self.sources = list(sources) if sources is not None else None
+        self.split = split
+        self.seed = seed
+        self.shuffle_buffer = shuffle_buffer
+        self.rank = rank
+        self.world_size = world_size
+        self.kwargs = kwargs
+        self.epoch = 0
+        tag_maps_dir = kwargs.get("tag_maps_dir", TAG_MAPS_DIR)
+        self.label2id: dict[str, int] = kwargs.get("label2id") or \
+            {label: i for i, label in enumerate(load_vocab(tag_maps_dir).bio_labels())}
+        self.id2label = {i: label for label, i in self.label2id.items()}
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def __iter__(self) -> Iterator[dict]:
+        worker = get_worker_info()
+        worker_id, num_workers = (worker.id, worker.num_workers) if worker is not None else (0, 1)
+        rank, world_size = _dist_info(self.rank, self.world_size)
+        shard = rank * num_workers + worker_id
+        kwargs = dict(self.kwargs, label2id=self.label2id)
+        records = iter_records(self.sources, self.split, self.seed,
+                               num_shards=world_size * num_workers, shard_index=shard, **kwargs)
+        if self.shuffle_buffer > 0:
+            records = _shuffled(records, self.shuffle_buffer, self.seed + self.epoch * 1_000_003 + shard)
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 데이터셋 미리보기 / 건수 확인")
+    parser.add_argument("--sources", nargs="+", default=None,
+                        help="소스 이름 / JSONL / raw corpus 디렉토리 (default: converted/*_ner_dataset.jsonl)")
+    parser.add_argument("--input-dir", type=Path, default=CONVERTED_DIR,
+                        help=f"소스 이름을 찾을 디렉토리 (default: {CONVERTED_DIR})")
+    parser.add_argument("--split", default="train", choices=[*SPLITS, "all"],
+                        help="split (default: train)")
+    parser.add_argument("--seed", type=int, default=42, help="split 해시 시드 (default: 42)")
+    parser.add_argument("--granularity", default="word", choices=["word", "char"],
+                        help="토큰 단위 (default: word)")
+    parser.add_argument("--limit", type=int, default=3, help="출력할 레코드 수 (default: 3)")
+    parser.add_argument("--count", action="store_true", help="split 전체를 훑어 source 별 건수 출력")
+    args = parser.parse_args()
+
+    records = iter_records(args.sources, None if args.split == "all" else args.split, args.seed,
+                           input_dir=args.input_dir, granularity=args.granularity)
+    if args.count:
+        counts: dict[str, int] = {}
+        for rec in records:
+            counts[rec["source"]] = counts.get(rec["source"], 0) + 1
+        for source, cnt in sorted(counts.items()):
+            print(f"  {source:<10} {cnt:>10,}")
+        print(f"  {'합계':<10} {sum(counts.values()):>10,}")
+        return
+    for _, rec in zip(range(args.limit), records):
+        print(dumps(rec))
+
+
+if __name__ == "__main__":
+    main()